@@ -0,0 +1,336 @@
+"""
+Headless HTTP service exposing the resume analysis pipeline.
+
+Run it with either of:
+
+    python -m app.api --port 8000 --workers 4
+    uvicorn app.api:app --port 8000
+
+The event loop only parses requests and moves bytes around. Every CPU-bound stage
+(extraction, preprocessing, keyword extraction, similarity, ATS scoring) runs in a
+process pool whose workers load the NLTK corpora and the optional corpus model once.
+When max_pending requests are already waiting on the pool, new work is rejected with
+503 and a Retry-After header instead of piling up in memory. If a worker process dies,
+the requests it took down get the same 503 and the pool is replaced.
+
+Spans recorded in the workers are shipped back with each result and merged into this
+process's metrics registry, served in Prometheus text format at GET /metrics. Adding
+?profile=cpu, ?profile=memory or both to /analyze returns a cProfile and tracemalloc
+capture of that request along with the result.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from functools import partial
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+# Add the project root to the Python path to import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import pipeline
+from src.extraction_cache import ExtractionCache, DEFAULT_CACHE_PATH, content_key
+from src.instrumentation import call_traced, registry
+from src.text_preprocessing import MissingNLTKDataError
+
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+SUPPORTED_SUFFIXES = ('.pdf', '.docx')
+
+class WorkerPool:
+    """
+    A process pool that rejects work once too much of it is waiting.
+    """
+
+    def __init__(self, workers=None, max_pending=None, corpus_model_path=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending if max_pending is not None else 4 * self.workers
+        # Only touched from the event loop thread, so a plain counter is enough
+        self.pending = 0
+        self._corpus_model_path = corpus_model_path
+        self._executor = self._new_executor()
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=pipeline.init_worker,
+            initargs=(self._corpus_model_path,),
+        )
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Runs fn in a worker process without blocking the event loop.
+
+        Raises:
+            HTTPException: 503 if max_pending calls are already in flight, or if the
+                worker process died.
+        """
+        result, _ = await self.run_traced(fn, args, kwargs)
+        return result
+
+    async def run_traced(self, fn, args=(), kwargs=None, cpu_profile=False, memory_profile=False):
+        """
+        Like run, but also returns the worker's trace record (spans and profiles).
+        The spans are merged into this process's metrics registry.
+        """
+        if self.pending >= self.max_pending:
+            raise HTTPException(503, "All workers are busy, please retry shortly.", headers={'Retry-After': '1'})
+        executor = self._executor
+        self.pending += 1
+        try:
+            result, trace = await asyncio.get_running_loop().run_in_executor(
+                executor, partial(call_traced, fn, args, kwargs, cpu_profile, memory_profile)
+            )
+        except BrokenProcessPool:
+            # Every call pending on the broken pool lands here; replace it only once
+            if self._executor is executor:
+                executor.shutdown(wait=False)
+                self._executor = self._new_executor()
+            raise HTTPException(503, "A worker process stopped unexpectedly, please retry.", headers={'Retry-After': '1'})
+        finally:
+            self.pending -= 1
+        for record in trace['spans']:
+            registry.record_span(record)
+        return result, trace
+
+    def stats(self):
+        return {'workers': self.workers, 'pending': self.pending, 'max_pending': self.max_pending}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+async def _json_body(request, *required):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(400, "The request body must be JSON.")
+    if not isinstance(body, dict):
+        raise HTTPException(400, "The request body must be a JSON object.")
+    missing = [field for field in required if field not in body]
+    if missing:
+        raise HTTPException(400, f"Missing fields: {', '.join(missing)}")
+    return body
+
+def _string(body, field):
+    value = body[field]
+    if not isinstance(value, str):
+        raise HTTPException(400, f"'{field}' must be a string.")
+    return value
+
+def _strings(body, field):
+    """
+    Returns a list of strings field, or None if it is absent or null.
+    """
+    value = body.get(field)
+    if value is not None and (not isinstance(value, list) or not all(isinstance(item, str) for item in value)):
+        raise HTTPException(400, f"'{field}' must be a list of strings.")
+    return value
+
+def _positive_int(body, field, default):
+    value = body.get(field)
+    if value is None:
+        return default
+    # bool is an int subclass, but true is not a count
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise HTTPException(400, f"'{field}' must be a positive integer.")
+    return value
+
+async def _read_upload(upload):
+    """
+    Returns (bytes, suffix) of an uploaded file, validating its type and size.
+    """
+    if upload is None or isinstance(upload, str):
+        return None, None
+    suffix = os.path.splitext(upload.filename or '')[1].lower()
+    if suffix not in SUPPORTED_SUFFIXES:
+        raise HTTPException(415, f"Unsupported file format: {suffix or upload.filename}")
+    # UploadFile.read hands the spooled file off to a thread, so the loop stays free
+    data = await upload.read(MAX_UPLOAD_BYTES + 1)
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise HTTPException(413, f"Uploads are limited to {MAX_UPLOAD_BYTES // (1024 * 1024)} MB.")
+    return data, suffix
+
+async def _extract(request, data, suffix):
+    """
+    Extracts an upload, serving repeat documents from the extraction cache.
+    """
+    state = request.app.state
+    key = content_key(data, state.extraction_limits)
+    text = await run_in_threadpool(state.extraction_cache.get, key)
+    if text is None:
+        try:
+            text = await state.pool.run(pipeline.extract, data, suffix, state.extraction_limits)
+        except pipeline.ExtractionError as e:
+            # The upload has a supported suffix but is not a readable document of that type
+            raise HTTPException(422, str(e))
+        except ValueError as e:
+            # Raised by the extractors for input they cannot handle, e.g. an unknown format
+            raise HTTPException(400, str(e))
+        await run_in_threadpool(state.extraction_cache.put, key, text)
+    return text
+
+async def health(request):
+    state = request.app.state
+    cache_stats = await run_in_threadpool(state.extraction_cache.stats)
+    return JSONResponse({'status': 'ok', 'pool': state.pool.stats(), 'extraction_cache': cache_stats})
+
+async def metrics(request):
+    return PlainTextResponse(registry.render_prometheus(), media_type='text/plain; version=0.0.4')
+
+async def extract(request):
+    async with request.form() as form:
+        data, suffix = await _read_upload(form.get('file'))
+    if data is None:
+        raise HTTPException(400, "Upload the document as the 'file' form field.")
+    return JSONResponse({'text': await _extract(request, data, suffix)})
+
+async def preprocess(request):
+    body = await _json_body(request, 'text')
+    return JSONResponse({'text': await request.app.state.pool.run(pipeline.preprocess, _string(body, 'text'))})
+
+async def keywords(request):
+    body = await _json_body(request, 'text')
+    result = await request.app.state.pool.run(pipeline.keywords, _string(body, 'text'), _positive_int(body, 'top_n', 20))
+    return JSONResponse({'keywords': result})
+
+async def similarity(request):
+    body = await _json_body(request, 'resume_text', 'jd_text')
+    score = await request.app.state.pool.run(pipeline.similarity, _string(body, 'resume_text'), _string(body, 'jd_text'))
+    return JSONResponse({'score': score})
+
+async def gaps(request):
+    # Set arithmetic on two keyword lists (and matching the few missing ones against the
+    # skill taxonomy) is cheaper than a round trip to the pool
+    body = await _json_body(request, 'resume_keywords', 'jd_keywords')
+    resume_keywords, jd_keywords = _strings(body, 'resume_keywords'), _strings(body, 'jd_keywords')
+    if resume_keywords is None or jd_keywords is None:
+        raise HTTPException(400, "'resume_keywords' and 'jd_keywords' must be lists of strings.")
+    return JSONResponse(pipeline.gaps(resume_keywords, jd_keywords, _strings(body, 'resume_skills'), _strings(body, 'jd_skills')))
+
+async def skills(request):
+    body = await _json_body(request, 'text')
+    return JSONResponse({'skills': await request.app.state.pool.run(pipeline.skills, _string(body, 'text'))})
+
+async def ats(request):
+    body = await _json_body(request, 'text')
+    return JSONResponse(await request.app.state.pool.run(pipeline.ats, _string(body, 'text')))
+
+async def analyze(request):
+    """
+    Runs the whole pipeline on a 'resume' upload and a 'jd' upload or 'jd_text' field.
+    """
+    async with request.form() as form:
+        resume_data, resume_suffix = await _read_upload(form.get('resume'))
+        jd_data, jd_suffix = await _read_upload(form.get('jd'))
+        jd_text = form.get('jd_text') or ''
+    if not isinstance(jd_text, str):
+        raise HTTPException(400, "'jd_text' must be a form field, not a file.")
+    if resume_data is None:
+        raise HTTPException(400, "Upload the resume as the 'resume' form field.")
+    if jd_data is None and not jd_text.strip():
+        raise HTTPException(400, "Provide a job description as a 'jd' upload or 'jd_text' field.")
+
+    if jd_data is not None:
+        resume_text, jd_text = await asyncio.gather(
+            _extract(request, resume_data, resume_suffix),
+            _extract(request, jd_data, jd_suffix),
+        )
+    else:
+        resume_text = await _extract(request, resume_data, resume_suffix)
+
+    profile = set(request.query_params.get('profile', '').split(','))
+    result, trace = await request.app.state.pool.run_traced(
+        pipeline.run_analysis, (resume_text, jd_text),
+        cpu_profile='cpu' in profile, memory_profile='memory' in profile,
+    )
+    result['resume_text'] = resume_text
+    if profile & {'cpu', 'memory'}:
+        result['profile'] = trace
+    return JSONResponse(result)
+
+async def _http_error(request, exc):
+    return JSONResponse({'detail': exc.detail}, status_code=exc.status_code, headers=exc.headers)
+
+async def _missing_nltk_data(request, exc):
+    return JSONResponse({'detail': str(exc)}, status_code=503)
+
+def _env_int(name):
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+def create_app(workers=None, max_pending=None, corpus_model_path=None,
+               extraction_cache_path=None, extraction_limits=None):
+    """
+    Builds the service. The pool and cache are created on startup and closed on shutdown.
+
+    Args:
+        workers (int, optional): Worker processes (default: CPU count).
+        max_pending (int, optional): Pool calls in flight before returning 503 (default: 4 per worker).
+        corpus_model_path (str, optional): A corpus model loaded by every worker.
+        extraction_cache_path (str, optional): SQLite file of the extraction cache.
+        extraction_limits (dict, optional): extract_text limits for uploaded PDFs.
+    """
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.pool = WorkerPool(workers, max_pending, corpus_model_path)
+        app.state.extraction_cache = ExtractionCache(extraction_cache_path or DEFAULT_CACHE_PATH)
+        app.state.extraction_limits = dict(pipeline.DEFAULT_EXTRACTION_LIMITS if extraction_limits is None else extraction_limits)
+        try:
+            yield
+        finally:
+            app.state.pool.shutdown()
+            app.state.extraction_cache.close()
+
+    routes = [
+        Route('/health', health, methods=['GET']),
+        Route('/metrics', metrics, methods=['GET']),
+        Route('/extract', extract, methods=['POST']),
+        Route('/preprocess', preprocess, methods=['POST']),
+        Route('/keywords', keywords, methods=['POST']),
+        Route('/similarity', similarity, methods=['POST']),
+        Route('/gaps', gaps, methods=['POST']),
+        Route('/skills', skills, methods=['POST']),
+        Route('/ats', ats, methods=['POST']),
+        Route('/analyze', analyze, methods=['POST']),
+    ]
+    exception_handlers = {
+        HTTPException: _http_error,
+        MissingNLTKDataError: _missing_nltk_data,
+    }
+    return Starlette(routes=routes, exception_handlers=exception_handlers, lifespan=lifespan)
+
+app = create_app(
+    workers=_env_int('RESUME_OPTIMIZER_API_WORKERS'),
+    max_pending=_env_int('RESUME_OPTIMIZER_API_MAX_PENDING'),
+    corpus_model_path=os.environ.get('RESUME_OPTIMIZER_CORPUS_MODEL'),
+    extraction_cache_path=os.environ.get('RESUME_OPTIMIZER_EXTRACTION_CACHE'),
+)
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the resume analysis pipeline over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind (default: 127.0.0.1).")
+    parser.add_argument('--port', type=int, default=8000, help="Port to listen on (default: 8000).")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument('--max-pending', type=int, default=None, help="Requests waiting on workers before 503 (default: 4 per worker).")
+    parser.add_argument('--corpus-model', default=os.environ.get('RESUME_OPTIMIZER_CORPUS_MODEL'), help="Corpus model file to load in every worker.")
+    args = parser.parse_args(argv)
+
+    uvicorn.run(
+        create_app(args.workers, args.max_pending, args.corpus_model,
+                   os.environ.get('RESUME_OPTIMIZER_EXTRACTION_CACHE')),
+        host=args.host,
+        port=args.port,
+    )
+
+if __name__ == '__main__':
+    main()
@@ -7,20 +7,15 @@ It uses Streamlit to create a web-based user interface for resume analysis and o
 import streamlit as st
 import sys
 import os
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the 'src' directory to the Python path to import our modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.text_extraction import extract_text
-from src.text_preprocessing import preprocess_text
-from src.keyword_extraction import extract_keywords
-from src.similarity_scoring import calculate_similarity
-from src.ats_scoring import calculate_ats_score
-from src.gap_analysis import analyze_gaps
-from src.explainability import generate_explanations
-from src.resume_updater import add_keywords_to_resume
-from src.document_generation import generate_pdf, generate_docx
+# Only lightweight modules are imported up front. The NLP and document stack
+# (NLTK, scikit-learn, reportlab) is imported where it is first used.
+from src.extraction_cache import ExtractionCache, DEFAULT_CACHE_PATH
+from src.pipeline import DEFAULT_EXTRACTION_LIMITS
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -29,103 +24,426 @@ st.set_page_config(
     layout="wide"
 )
 
+# --- Analysis Service ---
+# With RESUME_OPTIMIZER_API_URL set (see `python -m app.api`), the UI is a thin client:
+# extraction and the whole NLP pipeline run in the service's worker pool. Otherwise
+# the same pipeline runs in this process.
+api_url = os.environ.get("RESUME_OPTIMIZER_API_URL")
+
+@st.cache_resource
+def get_api_client(url):
+    from src.api_client import AnalysisClient
+    return AnalysisClient(url)
+
+# --- Background Warmup ---
+# Importing the NLP stack and loading the NLTK corpora takes seconds. It runs once per
+# process in a background thread, so the page renders immediately and the first
+# analysis only waits for whatever is left of it.
+def warmup_nlp_stack():
+    from src import keyword_extraction, similarity_scoring, rendering  # noqa: F401
+    from src.skill_taxonomy import get_taxonomy
+    from src.text_preprocessing import warmup
+    get_taxonomy()
+    warmup()
+
+@st.cache_resource
+def start_warmup():
+    return ThreadPoolExecutor(max_workers=1).submit(warmup_nlp_stack)
+
+warmup_future = None if api_url else start_warmup()
+
+# --- Corpus Model ---
+# An optional corpus IDF model fitted offline with `python -m src.corpus_model`.
+# It is memory-mapped once per process and shared by every session.
+@st.cache_resource
+def get_corpus_model(model_path):
+    from src.corpus_model import load_corpus_model
+    return load_corpus_model(model_path)
+
+corpus_model_path = os.environ.get("RESUME_OPTIMIZER_CORPUS_MODEL")
+corpus_model = get_corpus_model(corpus_model_path) if corpus_model_path and not api_url else None
+
+# --- Extraction Cache ---
+# Extracted text is cached on disk by file content, so re-analysing the same
+# document against a different job description skips PDF parsing.
+# PDFs are extracted page by page under DEFAULT_EXTRACTION_LIMITS, so an oversized
+# upload cannot exhaust memory or block the worker.
+@st.cache_resource
+def get_extraction_cache():
+    return ExtractionCache(
+        os.environ.get("RESUME_OPTIMIZER_EXTRACTION_CACHE", DEFAULT_CACHE_PATH),
+        extract_options=DEFAULT_EXTRACTION_LIMITS,
+    )
+
+extraction_cache = get_extraction_cache()
+
+# The pages of a long, slow PDF resume or job description are extracted by a shared pool
+# of worker processes; shorter or quick PDFs are extracted in this process (see
+# PARALLEL_MIN_PAGES and PARALLEL_MIN_SECONDS)
+PDF_EXTRACTION_WORKERS = os.cpu_count() or 1
+
+# --- Result Cache ---
+# Every pipeline stage's output is kept in memory, keyed by stage and by content hashes
+# of its inputs, and shared by all sessions. Re-analysing the same resume, or the same
+# resume against another job description, only runs the stages whose inputs changed.
+@st.cache_resource
+def get_result_cache():
+    from src.result_cache import ResultCache
+    return ResultCache()
+
+result_cache = get_result_cache()
+
+# --- Job Description Library ---
+# Job descriptions saved under an ID are stored on disk with their preprocessed text,
+# keywords, skills and term counts, so analyses against a saved requisition only
+# process the resume. Artifacts are recomputed when the text or the settings change.
+@st.cache_resource
+def get_jd_store():
+    from src.jd_store import JDStore, DEFAULT_STORE_PATH
+    return JDStore(os.environ.get("RESUME_OPTIMIZER_JD_STORE", DEFAULT_STORE_PATH))
+
+jd_store = get_jd_store()
+
+# The analysis pipeline of this process, created after the warmup has loaded the taxonomy
+@st.cache_resource
+def get_analysis_pipeline():
+    from src.analysis_pipeline import AnalysisPipeline
+    return AnalysisPipeline(model=corpus_model, cache=result_cache)
+
+# --- Instrumentation ---
+# Every stage records a timing span in src.instrumentation's registry. With
+# RESUME_OPTIMIZER_METRICS_FILE set, the metrics are written there in Prometheus text
+# format after each analysis, e.g. for node_exporter's textfile collector.
+metrics_file = os.environ.get("RESUME_OPTIMIZER_METRICS_FILE")
+
+# --- Resume Ranking ---
+# Ranking mode screens many resumes against one job description. Locally, resumes are
+# extracted and scored in worker processes that load the corpus model, taxonomy and NLTK
+# corpora once; with the analysis service, threads send one request per resume.
+SINGLE_MODE = "One resume"
+RANKING_MODE = "Rank many resumes"
+SCREENING_WORKERS = os.cpu_count() or 1
+SERVICE_SCREENING_THREADS = 8
+
+@st.cache_resource
+def get_screening_pool(remote):
+    if remote:
+        return ThreadPoolExecutor(max_workers=SERVICE_SCREENING_THREADS)
+    from concurrent.futures import ProcessPoolExecutor
+    from src.pipeline import init_worker
+    return ProcessPoolExecutor(max_workers=SCREENING_WORKERS, initializer=init_worker, initargs=(corpus_model_path,))
+
+def replace_screening_pool(broken, remote):
+    # A broken pool stays cached for every session until cleared; another session
+    # may already have replaced it
+    if get_screening_pool(remote) is broken:
+        get_screening_pool.clear()
+        broken.shutdown(wait=False, cancel_futures=True)
+    return get_screening_pool(remote)
+
+def ranking_table(rows):
+    from src.screening import rank_rows
+    from src.skill_taxonomy import get_taxonomy
+
+    taxonomy = get_taxonomy()
+    table = []
+    for row in rank_rows(rows):
+        if row['status'] != 'ok':
+            continue
+        skills = len(row['matched_skills']) + len(row['missing_skills'])
+        table.append({
+            "Rank": len(table) + 1,
+            "Resume": row['name'],
+            "Match %": round(row['similarity_score'], 2),
+            "ATS Score": row['ats_score'],
+            "Skills Matched": f"{len(row['matched_skills'])}/{skills}",
+            "Missing Skills": ", ".join(taxonomy.name(skill) if skill in taxonomy else skill for skill in row['missing_skills']),
+            "Time (s)": round(row['seconds'], 2),
+        })
+    return table
+
+# --- Keyword Optimizer ---
+# The number of keywords suggested as the best additions for the job description
+SUGGESTED_KEYWORDS = 5
+
 # --- Session State Initialization ---
 # This helps maintain state across user interactions
 if 'analysis_complete' not in st.session_state:
     st.session_state.analysis_complete = False
+if 'analysis' not in st.session_state:
+    st.session_state.analysis = None
 if 'missing_keywords' not in st.session_state:
     st.session_state.missing_keywords = []
+if 'optimizer' not in st.session_state:
+    st.session_state.optimizer = None
 if 'original_resume_text' not in st.session_state:
     st.session_state.original_resume_text = ""
+if 'incremental' not in st.session_state:
+    st.session_state.incremental = None
+if 'updated_scores' not in st.session_state:
+    st.session_state.updated_scores = None
 if 'file_generated' not in st.session_state:
     st.session_state.file_generated = False
-if 'generated_pdf_path' not in st.session_state:
-    st.session_state.generated_pdf_path = ""
-if 'generated_docx_path' not in st.session_state:
-    st.session_state.generated_docx_path = ""
+if 'generated_files' not in st.session_state:
+    st.session_state.generated_files = {}
+if 'screening_rows' not in st.session_state:
+    st.session_state.screening_rows = []
 
 # --- Sidebar for User Inputs ---
 with st.sidebar:
     st.title("📄 ATS Resume Optimizer")
     st.markdown("---")
     st.header("Upload Your Files")
-    uploaded_resume = st.file_uploader("Upload your Resume (PDF or DOCX)", type=["pdf", "docx"])
+    mode = st.radio("Mode", (SINGLE_MODE, RANKING_MODE), horizontal=True)
+    if mode == RANKING_MODE:
+        uploaded_resume = None
+        uploaded_resumes = st.file_uploader("Upload Resumes (PDF, DOCX or a ZIP of them)", type=["pdf", "docx", "zip"],
+                                            accept_multiple_files=True)
+    else:
+        uploaded_resume = st.file_uploader("Upload your Resume (PDF or DOCX)", type=["pdf", "docx"])
+        uploaded_resumes = []
     uploaded_jd = st.file_uploader("Upload Job Description (PDF or DOCX)", type=["pdf", "docx"])
     job_description_text = st.text_area("Or Paste the Job Description here", height=200)
+    saved_jd = st.selectbox("Or use a saved Job Description", [None] + jd_store.ids(),
+                            format_func=lambda jd_id: "—" if jd_id is None else jd_id)
+    save_jd_as = st.text_input("Save the Job Description to the library as (optional)").strip()
 
     st.markdown("---")
-    analyze_button = st.button("Analyze Resume", use_container_width=True)
+    if mode == RANKING_MODE:
+        analyze_button = st.button("Rank Resumes", use_container_width=True)
+        profile_analysis = False
+    else:
+        analyze_button = st.button("Analyze Resume", use_container_width=True)
+        profile_analysis = st.checkbox("Profile the analysis (CPU and memory)")
+
+    if api_url:
+        st.caption(f"Analysis service: {api_url}")
+    else:
+        cache_stats = extraction_cache.stats()
+        st.caption(f"Extraction cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} documents stored")
+    st.caption(f"Job description library: {len(jd_store)} saved")
+    result_stats = result_cache.stats()
+    st.caption(f"Result cache: {result_stats['hits']} hits, {result_stats['misses']} misses, {result_stats['entries']} stage results stored")
 
 # --- Main Panel for Displaying Results ---
 st.title("AI-Powered Resume Analysis")
 
+# --- Ranking Mode ---
+# Rows stream into the table as each resume finishes; the finished ranking is kept in
+# session state, so sorting the table or other interactions do not rerun the batch
+if mode == RANKING_MODE:
+    st.header("Candidate Ranking")
+    progress_placeholder = st.empty()
+    table_placeholder = st.empty()
+    if analyze_button:
+        if uploaded_resumes and (uploaded_jd or job_description_text or saved_jd):
+            from src.screening import count_upload_documents, iter_upload_documents, screen_resumes
+            from src.text_preprocessing import MissingNLTKDataError
+
+            # Zip members are read as workers free up, not all up front
+            documents = (document for uploaded in uploaded_resumes
+                         for document in iter_upload_documents(uploaded.name, uploaded.getvalue()))
+            rows = []
+
+            client = get_api_client(api_url) if api_url else None
+            if uploaded_jd:
+                jd_suffix = os.path.splitext(uploaded_jd.name)[1].lower()
+                jd_text = (client.extract(uploaded_jd.getvalue(), uploaded_jd.name) if client
+                           else extraction_cache.extract_bytes(uploaded_jd.getvalue(), jd_suffix))
+            elif job_description_text:
+                jd_text = job_description_text
+            else:
+                jd_text = jd_store.text(saved_jd)
+            if save_jd_as:
+                jd_store.put(save_jd_as, jd_text)
+            if not client:
+                # The job description is preprocessed here, so wait for the warmup
+                warmup_future.exception()
+
+            total = sum(count_upload_documents(uploaded.name, uploaded.getvalue()) for uploaded in uploaded_resumes)
+            progress = progress_placeholder.progress(0.0, text=f"Screening {total} resumes...")
+            try:
+                for row in screen_resumes(documents, jd_text, get_screening_pool(bool(client)),
+                                          extraction_cache=None if client else extraction_cache, client=client,
+                                          replace_executor=lambda broken: replace_screening_pool(broken, bool(client))):
+                    rows.append(row)
+                    progress.progress(len(rows) / total, text=f"Screened {len(rows)} of {total} resumes")
+                    table_placeholder.dataframe(ranking_table(rows), use_container_width=True, hide_index=True)
+            except MissingNLTKDataError as e:
+                st.error(str(e))
+                st.stop()
+            st.session_state.screening_rows = rows
+        else:
+            st.error("Please upload resumes and provide a job description.")
+
+    rows = st.session_state.screening_rows
+    if rows:
+        table_placeholder.dataframe(ranking_table(rows), use_container_width=True, hide_index=True)
+        errors = [row for row in rows if row['status'] != 'ok']
+        st.caption(f"{len(rows) - len(errors)} resumes ranked, {len(errors)} failed. Click a column header to sort.")
+        if errors:
+            with st.expander(f"Files that could not be screened ({len(errors)})"):
+                for row in errors:
+                    st.error(f"**{row['name']}:** {row['error']}")
+    st.stop()
+
 # This block executes when the user clicks the "Analyze Resume" button
 if analyze_button:
-    if uploaded_resume and (uploaded_jd or job_description_text):
+    if uploaded_resume and (uploaded_jd or job_description_text or saved_jd):
         with st.spinner("Analyzing your resume..."):
-            temp_dir = tempfile.gettempdir()
+            from src.instrumentation import registry, trace_request
+            from src.pipeline import run_stage
+            from src.result_cache import content_hash, stage_key
 
-            # Process uploaded resume
-            temp_resume_path = os.path.join(temp_dir, uploaded_resume.name)
-            with open(temp_resume_path, "wb") as f:
-                f.write(uploaded_resume.getbuffer())
-            resume_text = extract_text(temp_resume_path)
-            st.session_state.original_resume_text = resume_text
+            resume_data = uploaded_resume.getvalue()
+            jd_data = uploaded_jd.getvalue() if uploaded_jd else None
+            stages = []
 
-            # Process job description from file or text area
-            jd_text = ""
-            temp_jd_path = None
-            if uploaded_jd:
-                temp_jd_path = os.path.join(temp_dir, uploaded_jd.name)
-                with open(temp_jd_path, "wb") as f:
-                    f.write(uploaded_jd.getbuffer())
-                jd_text = extract_text(temp_jd_path)
-            else:
+            if api_url:
+                from src.api_client import ServiceError
+
+                client = get_api_client(api_url)
                 jd_text = job_description_text
+                try:
+                    if not uploaded_jd and not job_description_text:
+                        jd_text = jd_store.text(saved_jd)
+                    if save_jd_as:
+                        if uploaded_jd:
+                            # Saved JDs are kept as text, so extract the upload first
+                            jd_text = client.extract(jd_data, uploaded_jd.name)
+                            jd_data = None
+                        # Only the text is stored; a local analysis computes the artifacts on first use
+                        jd_store.put(save_jd_as, jd_text)
+                    jd_hash = content_hash(jd_data if jd_data is not None else jd_text)
+                    # A profile describes one run, so profiled requests neither read nor fill the cache
+                    result = run_stage(
+                        stages, None if profile_analysis else result_cache, 'service',
+                        stage_key('service', content_hash(resume_data), jd_hash),
+                        lambda: client.analyze(
+                            resume_data, uploaded_resume.name,
+                            jd_data=jd_data,
+                            jd_filename=uploaded_jd.name if jd_data is not None else None,
+                            jd_text=jd_text,
+                            profile="cpu,memory" if profile_analysis else None,
+                        ),
+                    )
+                except ServiceError as e:
+                    st.error(str(e))
+                    st.stop()
+                resume_text = result['resume_text']
+                profile = result.get('profile')
+                if not stages[-1]['cached']:
+                    # The service's own stage timings, followed by the round trip
+                    stages = result['stages'] + stages
+            else:
+                # Wait for the background warmup; a failure there resurfaces below with a clear message
+                warmup_future.exception()
+                from src.text_preprocessing import MissingNLTKDataError
 
-            # --- NLP Pipeline Execution ---
-            # The following steps perform the core analysis of the resume and job description
-            ats_score, ats_feedback = calculate_ats_score(resume_text)
-            preprocessed_resume = preprocess_text(resume_text)
-            preprocessed_jd = preprocess_text(jd_text)
-            resume_keywords = extract_keywords(preprocessed_resume)
-            jd_keywords = extract_keywords(preprocessed_jd)
-            similarity_score = calculate_similarity(preprocessed_resume, preprocessed_jd)
-            gaps = analyze_gaps(resume_keywords, jd_keywords)
-            explanations = generate_explanations(gaps)
-            st.session_state.missing_keywords = gaps['missing_keywords']
-            st.session_state.analysis_complete = True
+                with trace_request(cpu_profile=profile_analysis, memory_profile=profile_analysis) as trace:
+                    # Process uploaded resume; repeat uploads of the same file are served from the caches
+                    resume_text = run_stage(
+                        stages, result_cache, 'extract_resume', stage_key('extract', content_hash(resume_data)),
+                        lambda: extraction_cache.extract_bytes(resume_data, os.path.splitext(uploaded_resume.name)[1].lower(),
+                                                               workers=PDF_EXTRACTION_WORKERS),
+                    )
 
-            # --- Display Results ---
-            # The results are displayed in two columns for a clean layout
-            col1, col2 = st.columns(2)
-            with col1:
-                st.header("ATS Score")
-                st.metric(label="Your Resume's ATS Score", value=f"{ats_score}%")
-                with st.expander("See detailed feedback"):
-                    for feedback_item in ats_feedback:
-                        st.warning(feedback_item)
-
-            with col2:
-                st.header("Job Description Match")
-                st.metric(label="Resume Match Score", value=f"{similarity_score:.2f}%")
-
-            st.markdown("---")
-            st.header("Missing Keywords & Suggestions")
-            if not gaps['missing_keywords']:
-                st.success("Excellent! Your resume aligns well with the key requirements.")
-            else:
-                for i, keyword in enumerate(gaps['missing_keywords']):
-                    st.warning(f"**Missing Keyword:** {keyword}")
-                    st.info(f"**Suggestion:** {explanations['missing'][i]}")
-
-            # Clean up temporary files to save space
-            os.remove(temp_resume_path)
-            if temp_jd_path:
-                os.remove(temp_jd_path)
+                    # Process job description from file, text area or library
+                    jd_text = ""
+                    jd_artifacts = None
+                    if uploaded_jd:
+                        jd_text = run_stage(
+                            stages, result_cache, 'extract_jd', stage_key('extract', content_hash(jd_data)),
+                            lambda: extraction_cache.extract_bytes(jd_data, os.path.splitext(uploaded_jd.name)[1].lower(),
+                                                                   workers=PDF_EXTRACTION_WORKERS),
+                        )
+                    elif job_description_text:
+                        jd_text = job_description_text
+
+                    # --- NLP Pipeline Execution ---
+                    # The following steps perform the core analysis of the resume and job description
+                    try:
+                        analysis_pipeline = get_analysis_pipeline()
+                        if not uploaded_jd and not job_description_text:
+                            jd_text, jd_artifacts = jd_store.get(saved_jd, analysis_pipeline)
+                        if save_jd_as:
+                            jd_artifacts = jd_store.put(save_jd_as, jd_text, analysis_pipeline)
+                        result = analysis_pipeline.analyze(resume_text, jd_text, jd_artifacts).to_dict()
+                    except MissingNLTKDataError as e:
+                        st.error(str(e))
+                        st.stop()
+                stages = stages + result['stages']
+                profile = trace.to_record() if profile_analysis else None
+                # Updating the resume re-analyzes it from the edits, against the same JD
+                st.session_state.jd_text = jd_text
+                st.session_state.jd_artifacts = jd_artifacts
+
+            st.session_state.original_resume_text = resume_text
+            st.session_state.analysis = dict(result, stages=stages, profile=profile)
+            if metrics_file:
+                registry.write_prometheus(metrics_file)
+            # Missing taxonomy skills are offered under their canonical names, ahead of other keywords
+            gap_result = result['gaps']
+            missing_skill_names = [gap_result['skill_names'][skill_id] for skill_id in gap_result.get('missing_skills', [])]
+            st.session_state.missing_keywords = missing_skill_names + gap_result['missing_keywords']
+            st.session_state.optimizer = None
+            st.session_state.incremental = None
+            st.session_state.updated_scores = None
+            st.session_state.analysis_complete = True
     else:
         st.error("Please upload a resume and provide a job description.")
 
+# --- Display Results ---
+# Results are rendered from session state, so later interactions rerun the script
+# without recomputing or losing the analysis
+if st.session_state.analysis_complete:
+    analysis = st.session_state.analysis
+    gaps = analysis['gaps']
+    explanations = gaps['explanations']
+
+    # The results are displayed in two columns for a clean layout
+    col1, col2 = st.columns(2)
+    with col1:
+        st.header("ATS Score")
+        st.metric(label="Your Resume's ATS Score", value=f"{analysis['ats_score']}%")
+        with st.expander("See detailed feedback"):
+            for feedback_item in analysis['ats_feedback']:
+                st.warning(feedback_item)
+
+    with col2:
+        st.header("Job Description Match")
+        st.metric(label="Resume Match Score", value=f"{analysis['similarity_score']:.2f}%")
+
+    with st.expander("Pipeline stages"):
+        st.table([
+            {
+                "Stage": stage['stage'],
+                "Time (ms)": f"{stage['seconds'] * 1000:.1f}",
+                "Source": "cache" if stage['cached'] else "computed",
+            }
+            for stage in analysis['stages']
+        ])
+
+    if analysis['profile']:
+        with st.expander("Profile"):
+            if analysis['profile']['memory_peak_bytes'] is not None:
+                st.caption(f"Peak traced memory: {analysis['profile']['memory_peak_bytes'] / (1024 * 1024):.1f} MB")
+                st.code("\n".join(analysis['profile']['memory_top']))
+            if analysis['profile']['cpu_profile']:
+                st.code(analysis['profile']['cpu_profile'])
+
+    st.markdown("---")
+    st.header("Missing Keywords & Suggestions")
+    if not gaps['missing_keywords'] and not gaps.get('missing_skills'):
+        st.success("Excellent! Your resume aligns well with the key requirements.")
+    else:
+        for skill_id, explanation in zip(gaps.get('missing_skills', []), explanations.get('missing_skills', [])):
+            st.warning(f"**Missing Skill:** {gaps['skill_names'][skill_id]}")
+            st.info(f"**Suggestion:** {explanation}")
+        for i, keyword in enumerate(gaps['missing_keywords']):
+            st.warning(f"**Missing Keyword:** {keyword}")
+            st.info(f"**Suggestion:** {explanations['missing'][i]}")
+
 # This block executes after the analysis is complete
 if st.session_state.analysis_complete:
     st.markdown("---")
@@ -136,19 +454,60 @@ if st.session_state.analysis_complete:
         options=st.session_state.missing_keywords
     )
 
+    # Live what-if scores: the optimizer updates the similarity and ATS score from the
+    # selected keywords' terms alone, so toggling a keyword never reruns the pipeline
+    if st.session_state.missing_keywords:
+        if st.session_state.optimizer is None:
+            from src.keyword_optimizer import KeywordOptimizer
+
+            analysis = st.session_state.analysis
+            optimizer = KeywordOptimizer(st.session_state.original_resume_text, analysis['preprocessed_resume'], model=corpus_model)
+            optimizer.add_job('jd', analysis['preprocessed_jd'], st.session_state.missing_keywords)
+            st.session_state.optimizer = optimizer
+        optimizer = st.session_state.optimizer
+
+        selection = optimizer.evaluate('jd', keywords_to_add)
+        col1, col2 = st.columns(2)
+        col1.metric("Match Score with these keywords", f"{selection.similarity:.2f}%", delta=f"{selection.similarity_delta:+.2f}")
+        col2.metric("ATS Score with these keywords", f"{selection.ats_score}%", delta=selection.ats_delta)
+
+        best = optimizer.best_keywords('jd', SUGGESTED_KEYWORDS)
+        if best.keywords:
+            st.caption(f"Best {len(best.keywords)} keywords for this job: {', '.join(best.keywords)} "
+                       f"({best.similarity_delta:+.2f} match, {best.ats_delta:+d} ATS)")
+        with st.expander("Gain of each remaining keyword"):
+            st.table([
+                {"Keyword": gain.keyword, "Match gain": f"{gain.similarity_gain:+.2f}", "ATS gain": f"{gain.ats_gain:+d}"}
+                for gain in optimizer.marginal_gains('jd', keywords_to_add)
+            ])
+
     if st.button("Update Resume & Generate Files", use_container_width=True):
         if keywords_to_add:
             with st.spinner("Generating your optimized resume..."):
-                updated_text = add_keywords_to_resume(st.session_state.original_resume_text, keywords_to_add)
+                from src.resume_updater import apply_edits, keyword_edits
+                from src.rendering import render
+
+                original_text = st.session_state.original_resume_text
+                edits = keyword_edits(original_text, keywords_to_add)
+                updated_text = apply_edits(original_text, edits)
 
-                # Generate both PDF and DOCX files for download
-                output_pdf_path = os.path.join(tempfile.gettempdir(), "Optimized_Resume.pdf")
-                generate_pdf(updated_text, output_pdf_path)
-                st.session_state.generated_pdf_path = output_pdf_path
+                # Scores of the updated resume, from the added lines alone
+                if api_url:
+                    # Without a local pipeline, the what-if optimizer scores the same edit
+                    selection = st.session_state.optimizer.evaluate('jd', keywords_to_add)
+                    st.session_state.updated_scores = {'ats_score': selection.ats_score, 'similarity_score': selection.similarity}
+                else:
+                    if st.session_state.incremental is None:
+                        from src.incremental_analysis import IncrementalAnalysis
 
-                output_docx_path = os.path.join(tempfile.gettempdir(), "Optimized_Resume.docx")
-                generate_docx(updated_text, output_docx_path)
-                st.session_state.generated_docx_path = output_docx_path
+                        st.session_state.incremental = IncrementalAnalysis(
+                            get_analysis_pipeline(), original_text, st.session_state.jd_text, st.session_state.jd_artifacts)
+                    updated = st.session_state.incremental.update(edits)
+                    st.session_state.updated_scores = {'ats_score': updated.ats_score, 'similarity_score': updated.similarity_score}
+
+                # Render both PDF and DOCX in memory from one template layout; the bytes
+                # live in this session's state, so concurrent users never share a file
+                st.session_state.generated_files = render(updated_text, ('pdf', 'docx'))
 
                 st.session_state.file_generated = True
         else:
@@ -159,6 +518,15 @@ if st.session_state.file_generated:
     st.markdown("---")
     st.header("Download Your Optimized Resume")
 
+    if st.session_state.updated_scores:
+        analysis = st.session_state.analysis
+        updated_scores = st.session_state.updated_scores
+        col1, col2 = st.columns(2)
+        col1.metric("Updated ATS Score", f"{updated_scores['ats_score']}%",
+                    delta=updated_scores['ats_score'] - analysis['ats_score'])
+        col2.metric("Updated Match Score", f"{updated_scores['similarity_score']:.2f}%",
+                    delta=f"{updated_scores['similarity_score'] - analysis['similarity_score']:+.2f}")
+
     download_format = st.radio(
         "Choose your preferred download format:",
         ('PDF', 'DOCX'),
@@ -166,21 +534,13 @@ if st.session_state.file_generated:
     )
 
     # Provide download buttons for both PDF and DOCX formats
-    if download_format == 'PDF':
-        with open(st.session_state.generated_pdf_path, "rb") as file:
-            st.download_button(
-                label="Download Optimized Resume (PDF)",
-                data=file,
-                file_name="Optimized_Resume.pdf",
-                mime="application/pdf",
-                use_container_width=True
-            )
-    elif download_format == 'DOCX':
-        with open(st.session_state.generated_docx_path, "rb") as file:
-            st.download_button(
-                label="Download Optimized Resume (DOCX)",
-                data=file,
-                file_name="Optimized_Resume.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                use_container_width=True
-            )
+    from src.rendering import MIME_TYPES
+
+    file_format = download_format.lower()
+    st.download_button(
+        label=f"Download Optimized Resume ({download_format})",
+        data=st.session_state.generated_files[file_format],
+        file_name=f"Optimized_Resume.{file_format}",
+        mime=MIME_TYPES[file_format],
+        use_container_width=True
+    )
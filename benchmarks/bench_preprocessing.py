@@ -0,0 +1,66 @@
+"""
+Benchmarks the Preprocessor against the original per-call preprocessing.
+
+    python benchmarks/bench_preprocessing.py
+"""
+
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+from nltk.tokenize import word_tokenize
+
+from src.text_preprocessing import Preprocessor
+
+VOCABULARY = (
+    "managed developed implemented python java kubernetes teams engineers pipelines "
+    "data analysis reporting stakeholders requirements experience education skills "
+    "increased revenue by 20% reduced costs delivered projects on time, led a team of 5. "
+    "designed scalable services; mentored junior developers and reviewed code daily"
+).split()
+
+def legacy_preprocess(text):
+    """
+    The original implementation, rebuilt on every call.
+    """
+    text = text.lower()
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    tokens = word_tokenize(text)
+    stop_words = set(stopwords.words('english'))
+    filtered_tokens = [word for word in tokens if word not in stop_words]
+    lemmatizer = WordNetLemmatizer()
+    lemmatized_tokens = [lemmatizer.lemmatize(word) for word in filtered_tokens]
+    return " ".join(lemmatized_tokens)
+
+def make_document(n_words, seed):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(VOCABULARY) for _ in range(n_words))
+
+def main():
+    preprocessor = Preprocessor()
+    documents = {
+        'jd (300 words)': make_document(300, seed=1),
+        'resume (900 words)': make_document(900, seed=2),
+    }
+
+    for name, document in documents.items():
+        assert preprocessor.preprocess(document) == legacy_preprocess(document)
+
+        runs = 50
+        legacy = timeit.timeit(lambda: legacy_preprocess(document), number=runs) / runs
+        fast = timeit.timeit(lambda: preprocessor.preprocess(document), number=runs) / runs
+        print(f"{name:>20}: legacy {legacy * 1000:7.2f} ms  preprocessor {fast * 1000:7.2f} ms  speedup {legacy / fast:5.1f}x")
+
+    batch = [make_document(900, seed=i) for i in range(100)]
+    legacy = timeit.timeit(lambda: [legacy_preprocess(d) for d in batch], number=1)
+    fast = timeit.timeit(lambda: preprocessor.preprocess_many(batch), number=1)
+    print(f"{'batch of 100 resumes':>20}: legacy {legacy * 1000:7.1f} ms  preprocessor {fast * 1000:7.1f} ms  speedup {legacy / fast:5.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Measures cold-start time of the Streamlit app script and of the NLP warmup.
+
+Each measurement runs in a fresh interpreter, so nothing is already imported.
+The app script is executed in Streamlit's bare mode (no server), which runs it
+top to bottom exactly as the first page load does.
+
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --max-seconds 2.0   # fail if startup regresses
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SCENARIOS = {
+    # Time for the app script's first run, i.e. until the page is rendered
+    'app_first_run': (
+        "import runpy, time\n"
+        "start = time.perf_counter()\n"
+        "runpy.run_path('app/main.py', run_name='__main__')\n"
+        "print(time.perf_counter() - start)\n"
+        "import os; os._exit(0)\n"
+    ),
+    # Time to import the analysis modules and load the NLTK corpora
+    'nlp_warmup': (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "from src import keyword_extraction, similarity_scoring, rendering\n"
+        "from src.text_preprocessing import warmup\n"
+        "try:\n"
+        "    warmup()\n"
+        "except LookupError:\n"
+        "    pass\n"
+        "print(time.perf_counter() - start)\n"
+    ),
+}
+
+def measure(code):
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+def run(runs):
+    results = {}
+    for name, code in SCENARIOS.items():
+        timings = [measure(code) for _ in range(runs)]
+        results[name] = {
+            'median_seconds': statistics.median(timings),
+            'min_seconds': min(timings),
+            'runs': runs,
+        }
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark application cold-start time.")
+    parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters per scenario (default: 5).")
+    parser.add_argument('--json', help="Also write the results to this JSON file.")
+    parser.add_argument('--max-seconds', type=float, help="Exit non-zero if the app's median first run is slower.")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs)
+    for name, result in results.items():
+        print(f"{name:>14}: median {result['median_seconds'] * 1000:7.0f} ms  min {result['min_seconds'] * 1000:7.0f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.max_seconds is not None and results['app_first_run']['median_seconds'] > args.max_seconds:
+        print(f"App startup exceeded {args.max_seconds:.2f}s", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
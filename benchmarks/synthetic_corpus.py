@@ -0,0 +1,236 @@
+"""
+Generates a reproducible synthetic corpus of resumes and job descriptions.
+
+Documents vary in length (1 to 50 pages), format (PDF and DOCX), section headings,
+section order and bullet style, so extraction, section detection and scoring see the
+same kind of variety as real uploads. The same seed always produces the same text.
+
+    python benchmarks/synthetic_corpus.py corpus/ --resumes 40 --jds 20 --seed 7
+
+A manifest.json next to the documents lists each file with its kind, format, page
+count and word count.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+
+from docx import Document
+from docx.enum.text import WD_BREAK
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+MANIFEST_NAME = 'manifest.json'
+FIXED_TIMESTAMP = datetime.datetime(2024, 1, 1)
+LINES_PER_PAGE = 40
+LINE_HEIGHT = 12.5
+WORDS_PER_LINE = 12
+
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Avery", "Jamie", "Quinn")
+LAST_NAMES = ("Smith", "Garcia", "Chen", "Patel", "Okafor", "Novak", "Silva", "Kim", "Müller", "Haddad")
+SKILLS = (
+    "python", "java", "sql", "kubernetes", "docker", "aws", "azure", "terraform", "react",
+    "typescript", "machine learning", "data analysis", "spark", "airflow", "tableau", "excel",
+    "project management", "stakeholder management", "agile", "scrum", "ci/cd", "linux",
+    "pandas", "tensorflow", "pytorch", "rest apis", "graphql", "postgresql", "mongodb", "git",
+)
+ACTION_VERBS = (
+    "managed", "developed", "led", "created", "implemented", "designed", "built", "delivered",
+    "optimized", "automated", "mentored", "launched", "reduced", "increased", "migrated",
+)
+OBJECTS = (
+    "the data platform", "customer onboarding", "a reporting pipeline", "the billing service",
+    "cloud infrastructure", "the analytics team", "internal tooling", "a recommendation engine",
+    "release processes", "the mobile app", "vendor integrations", "monitoring and alerting",
+)
+FILLER = (
+    "working closely with product and engineering partners across several time zones",
+    "in a fast paced environment with changing priorities and tight deadlines",
+    "while maintaining high code quality through reviews and automated tests",
+    "and documented the design for future maintainers and new hires",
+)
+# Alternative headings per section, including the capitalizations seen in practice
+SECTION_HEADINGS = {
+    'summary': ("Summary", "SUMMARY", "Professional Summary", "Profile"),
+    'experience': ("Experience", "EXPERIENCE", "Work Experience", "Professional Experience"),
+    'education': ("Education", "EDUCATION", "Education and Training"),
+    'skills': ("Skills", "SKILLS", "Technical Skills", "Core Competencies"),
+    'projects': ("Projects", "PROJECTS", "Selected Projects"),
+    'certifications': ("Certifications", "CERTIFICATIONS", "Licenses & Certifications"),
+}
+BULLETS = ("- ", "* ", "• ", "")
+
+def _page_count(rng, max_pages):
+    """
+    Most resumes are one or two pages; a tail of long CVs and portfolios reaches max_pages.
+    """
+    roll = rng.random()
+    if roll < 0.7:
+        pages = rng.randint(1, 2)
+    elif roll < 0.95:
+        pages = rng.randint(3, 10)
+    else:
+        pages = rng.randint(11, 50)
+    return max(1, min(pages, max_pages))
+
+def _sentence(rng):
+    words = [rng.choice(ACTION_VERBS).capitalize(), rng.choice(OBJECTS)]
+    if rng.random() < 0.5:
+        words.append(f"using {rng.choice(SKILLS)} and {rng.choice(SKILLS)}")
+    if rng.random() < 0.4:
+        words.append(f"which increased throughput by {rng.randint(5, 90)}%")
+    words.append(rng.choice(FILLER))
+    return ' '.join(words) + '.'
+
+def _wrap(text, width=WORDS_PER_LINE):
+    words = text.split()
+    return [' '.join(words[i:i + width]) for i in range(0, len(words), width)] or ['']
+
+def make_resume_lines(rng, pages):
+    """
+    Returns the lines of a resume filling roughly the given number of pages.
+    """
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [name]
+    if rng.random() < 0.9:
+        lines.append(f"{name.split()[0].lower()}.{rng.randint(1, 999)}@example.com")
+    if rng.random() < 0.85:
+        lines.append(f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}")
+
+    sections = ['experience', 'education', 'skills']
+    sections += [s for s in ('summary', 'projects', 'certifications') if rng.random() < 0.5]
+    # Experience is required, but any other section may be missing
+    sections = [s for s in sections if s == 'experience' or rng.random() < 0.9]
+    rng.shuffle(sections)
+    bullet = rng.choice(BULLETS)
+    target_lines = pages * LINES_PER_PAGE
+
+    for position, section in enumerate(sections):
+        lines.append('')
+        lines.append(rng.choice(SECTION_HEADINGS[section]))
+        if section == 'skills':
+            skills = rng.sample(SKILLS, rng.randint(5, 15))
+            lines.extend(_wrap(', '.join(skills)))
+        elif section == 'education':
+            lines.append(f"BSc Computer Science, State University, {rng.randint(1995, 2022)}")
+        elif section == 'experience':
+            # Experience absorbs whatever is left of the page budget
+            remaining_sections = len(sections) - position - 1
+            while len(lines) < target_lines - 4 * remaining_sections:
+                lines.append(f"{rng.choice(('Senior ', 'Lead ', ''))}Engineer, Company {rng.randint(1, 500)}, {rng.randint(2005, 2024)}")
+                for _ in range(rng.randint(2, 6)):
+                    lines.extend(bullet + line for line in _wrap(_sentence(rng)))
+        else:
+            for _ in range(rng.randint(1, 3)):
+                lines.extend(bullet + line for line in _wrap(_sentence(rng)))
+    return lines
+
+def make_jd_lines(rng, pages):
+    """
+    Returns the lines of a job description filling roughly the given number of pages.
+    """
+    lines = [f"{rng.choice(('Senior ', 'Staff ', ''))}{rng.choice(('Data', 'Software', 'Platform', 'ML'))} Engineer", '']
+    lines.append("Responsibilities")
+    target_lines = pages * LINES_PER_PAGE
+    while len(lines) < target_lines - 8:
+        lines.extend("- " + line for line in _wrap(_sentence(rng)))
+    lines += ['', "Requirements"]
+    for skill in rng.sample(SKILLS, rng.randint(6, 14)):
+        lines.append(f"- {rng.randint(1, 8)}+ years of experience with {skill}")
+    return lines
+
+def _paginate(lines):
+    return [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+def write_pdf(lines, path):
+    """
+    Writes the lines as a PDF and returns its page count.
+    """
+    # invariant=1 drops the creation date and random document ID, so output is reproducible
+    c = canvas.Canvas(path, pagesize=letter, invariant=1)
+    width, height = letter
+    pages = _paginate(lines)
+    for page in pages:
+        y = height - 72
+        for line in page:
+            c.drawString(72, y, line)
+            y -= LINE_HEIGHT
+        c.showPage()
+    c.save()
+    return len(pages)
+
+def write_docx(lines, path):
+    """
+    Writes the lines as a DOCX with explicit page breaks and returns its page count.
+    """
+    document = Document()
+    # Fixed timestamps keep the output reproducible
+    document.core_properties.created = document.core_properties.modified = FIXED_TIMESTAMP
+    pages = _paginate(lines)
+    for number, page in enumerate(pages):
+        for line in page:
+            paragraph = document.add_paragraph(line)
+        if number < len(pages) - 1:
+            paragraph.add_run().add_break(WD_BREAK.PAGE)
+    document.save(path)
+    return len(pages)
+
+def generate_corpus(output_dir, resumes=40, jds=20, seed=0, max_pages=50, pdf_ratio=0.7):
+    """
+    Writes a synthetic corpus and its manifest.
+
+    Args:
+        output_dir (str): Directory for the documents; created if needed.
+        resumes (int): Number of resumes.
+        jds (int): Number of job descriptions.
+        seed (int): Random seed; the same seed yields the same documents.
+        max_pages (int): Upper bound on document length.
+        pdf_ratio (float): Fraction of documents written as PDF (the rest are DOCX).
+
+    Returns:
+        list: The manifest entries, one dict per document.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    manifest = []
+    for kind, count in (('resume', resumes), ('jd', jds)):
+        for i in range(count):
+            pages = _page_count(rng, max_pages) if kind == 'resume' else min(rng.randint(1, 2), max_pages)
+            lines = make_resume_lines(rng, pages) if kind == 'resume' else make_jd_lines(rng, pages)
+            file_format = 'pdf' if rng.random() < pdf_ratio else 'docx'
+            name = f"{kind}_{i:04d}.{file_format}"
+            path = os.path.join(output_dir, name)
+            pages = (write_pdf if file_format == 'pdf' else write_docx)(lines, path)
+            manifest.append({
+                'file': name,
+                'kind': kind,
+                'format': file_format,
+                'pages': pages,
+                'words': sum(len(line.split()) for line in lines),
+            })
+
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({'seed': seed, 'max_pages': max_pages, 'documents': manifest}, f, indent=2)
+    return manifest
+
+def load_manifest(corpus_dir):
+    with open(os.path.join(corpus_dir, MANIFEST_NAME), encoding='utf-8') as f:
+        return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume and job description corpus.")
+    parser.add_argument('output_dir', help="Directory to write the documents to.")
+    parser.add_argument('--resumes', type=int, default=40, help="Number of resumes (default: 40).")
+    parser.add_argument('--jds', type=int, default=20, help="Number of job descriptions (default: 20).")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0).")
+    parser.add_argument('--max-pages', type=int, default=50, help="Maximum pages per document (default: 50).")
+    args = parser.parse_args(argv)
+
+    manifest = generate_corpus(args.output_dir, args.resumes, args.jds, args.seed, args.max_pages)
+    pages = sum(entry['pages'] for entry in manifest)
+    print(f"Wrote {len(manifest)} documents ({pages} pages) to {args.output_dir}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+"""
+The resume analysis with one tokenization per document.
+
+Chaining the stage functions hands each stage a string, so every preprocessed
+document is tokenized again by the keyword vectorizer and once more by the similarity
+vectorizer. AnalysisPipeline tokenizes each document once, counts its terms and
+n-grams once, and derives everything else from those counts:
+
+- keywords: a TF-IDF corpus of one document ranks n-grams by their counts, so the top
+  (1, 3)-grams after English stop words are extract_keywords' keywords. With a corpus
+  model, the counts of its vocabulary terms are weighted by its IDF.
+- similarity: the two-document TF-IDF cosine of calculate_similarity over the unigram
+  counts, or the model's TF-IDF cosine, via similarity_from_counts.
+- gaps: the keyword lists and the taxonomy skills of both documents.
+
+The results equal those of the chained stage functions, up to floating point rounding
+of the similarity. ATS rules and skill aliases match punctuation ("c++", "B.Sc."), so
+they still scan the extracted text rather than the tokens.
+"""
+
+import heapq
+from collections import Counter
+from dataclasses import dataclass, fields
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, CountVectorizer
+
+from .instrumentation import span
+from .pipeline import _model_key, ats, run_stage, semantic
+from .result_cache import content_hash, stage_key
+from .similarity_scoring import similarity_from_counts
+
+# The n-grams extract_keywords ranks when there is no corpus model
+KEYWORD_NGRAM_RANGE = (1, 3)
+
+@dataclass(frozen=True)
+class AnalysisResult:
+    ats_score: int
+    ats_feedback: list
+    similarity_score: float
+    resume_keywords: list
+    jd_keywords: list
+    # Canonical skill IDs, in order of first mention
+    resume_skills: list
+    jd_skills: list
+    # analyze_gaps output plus 'explanations'
+    gaps: dict
+    preprocessed_resume: str
+    preprocessed_jd: str
+    # One {'stage', 'seconds', 'cached'} record per stage, in execution order
+    stages: list
+    semantic_score: float = None
+
+    def to_dict(self):
+        """
+        Returns the result as the dict run_analysis returns (no 'semantic_score'
+        without an embedder).
+        """
+        result = {field.name: getattr(self, field.name) for field in fields(self)}
+        if self.semantic_score is None:
+            del result['semantic_score']
+        return result
+
+def word_ngrams(tokens, ngram_range):
+    """
+    Returns the n-grams of a token list in CountVectorizer's analyzer order.
+    """
+    min_n, max_n = ngram_range
+    ngrams = list(tokens) if min_n == 1 else []
+    for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+        ngrams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return ngrams
+
+class AnalysisPipeline:
+    """
+    Runs the analysis of resume/job description pairs, tokenizing each document once.
+
+    Args:
+        top_n (int): The number of keywords to extract from each document.
+        model (CorpusModel, optional): A corpus model supplying vocabulary and IDF.
+        taxonomy (SkillTaxonomy, optional): Default: skill_taxonomy.get_taxonomy().
+        preprocessor (optional): Anything with a tokens(text) method returning
+            preprocessed tokens (default: text_preprocessing.get_preprocessor()).
+        cache (ResultCache, optional): Serves documents and stages already computed,
+            e.g. the same resume against another job description.
+        embedder (optional): An embedder from semantic_similarity. When given, results
+            also have a semantic_score computed on the extracted texts.
+    """
+
+    def __init__(self, top_n=20, model=None, taxonomy=None, preprocessor=None, cache=None, embedder=None):
+        if taxonomy is None:
+            from .skill_taxonomy import get_taxonomy
+            taxonomy = get_taxonomy()
+        self.top_n = top_n
+        self.model = model
+        self.taxonomy = taxonomy
+        self.cache = cache
+        self.embedder = embedder
+        self._preprocessor = preprocessor
+        if model is not None:
+            self._model_stop_words = CountVectorizer(stop_words=model.stop_words).get_stop_words() or frozenset()
+
+    @property
+    def fingerprint(self):
+        """
+        Identifies the settings document() output depends on: keyword count, corpus
+        model and skill taxonomy.
+        """
+        return f"{self.top_n}:{_model_key(self.model)}:{self.taxonomy.fingerprint}"
+
+    @property
+    def preprocessor(self):
+        if self._preprocessor is None:
+            from .text_preprocessing import get_preprocessor
+            self._preprocessor = get_preprocessor()
+        return self._preprocessor
+
+    @property
+    def ngram_range(self):
+        """
+        The n-grams of content terms that term_counts takes: the corpus model's, or the
+        phrases of extract_keywords (single terms are counted separately without a model).
+        """
+        return self.model.ngram_range if self.model is not None else (2, KEYWORD_NGRAM_RANGE[1])
+
+    @staticmethod
+    def terms(tokens):
+        # Preprocessed tokens are alphabetic, so the vectorizers' default
+        # token pattern reduces to dropping single characters
+        return [token for token in tokens if len(token) > 1]
+
+    def content_terms(self, terms):
+        """
+        Drops the stop words of keyword extraction: the model's, or English ones.
+        """
+        stop_words = self._model_stop_words if self.model is not None else ENGLISH_STOP_WORDS
+        return [term for term in terms if term not in stop_words]
+
+    def term_counts(self, term_counts, ngram_counts):
+        """
+        Maps counts of terms and of n-grams of content terms (over ngram_range) to the
+        counts similarity() compares and the counts keywords are ranked by. The mapping
+        is linear, so it also maps differences of counts.
+
+        Returns:
+            tuple: (counts, keyword_counts)
+        """
+        if self.model is None:
+            keyword_counts = {term: count for term, count in term_counts.items() if term not in ENGLISH_STOP_WORDS}
+            keyword_counts.update(ngram_counts)
+            return dict(term_counts), keyword_counts
+        counts = {}
+        for ngram, count in ngram_counts.items():
+            index = self.model.lookup(ngram)
+            if index >= 0:
+                counts[index] = count
+        return counts, counts
+
+    def keyword_rank(self, item):
+        """
+        The sort key of a (key, count) item of keyword_counts; the top_n smallest are the keywords.
+        """
+        key, count = item
+        if self.model is None:
+            # Ties are broken alphabetically, as extract_keywords does
+            return -count, key
+        return -count * float(self.model.idf[key]), key
+
+    def keyword(self, key):
+        return self.model.term(key) if self.model is not None else key
+
+    def document(self, text, preprocessed=None):
+        """
+        Tokenizes one document and derives its keywords, term counts and skills.
+
+        Args:
+            text (str): The extracted text.
+            preprocessed (str, optional): Its preprocess_text output, if already known;
+                it is split on spaces instead of tokenizing the text again.
+
+        Returns:
+            dict: 'preprocessed' (str), 'keywords' (list), 'skills' (list of canonical
+            IDs) and 'counts', the term counts similarity() compares: unigram counts
+            without a model, feature index counts with one.
+        """
+        with span('preprocessing', chars=len(text)) as current:
+            if preprocessed is None:
+                tokens = self.preprocessor.tokens(text)
+                preprocessed = " ".join(tokens)
+            else:
+                tokens = preprocessed.split()
+            current.set(tokens=len(tokens))
+
+        with span('keyword_extraction', chars=len(preprocessed)) as current:
+            terms = self.terms(tokens)
+            counts, keyword_counts = self.term_counts(Counter(terms), Counter(word_ngrams(self.content_terms(terms), self.ngram_range)))
+            best = heapq.nsmallest(self.top_n, keyword_counts.items(), key=self.keyword_rank)
+            keywords = [self.keyword(key) for key, _ in best]
+            current.set(keywords=len(keywords))
+
+        return {
+            'preprocessed': preprocessed,
+            'keywords': keywords,
+            'skills': self.taxonomy.find_skills(text),
+            'counts': counts,
+        }
+
+    def similarity(self, resume, jd):
+        """
+        Returns the similarity (0 to 100) of two document() outputs.
+        """
+        with span('similarity', terms=len(resume['counts']) + len(jd['counts'])):
+            return similarity_from_counts(resume['counts'], jd['counts'],
+                                          self.model.idf if self.model is not None else None)
+
+    def gaps(self, resume, jd):
+        """
+        Returns analyze_gaps output for two document() outputs, plus 'explanations'.
+        """
+        from .explainability import generate_explanations
+        from .gap_analysis import analyze_gaps
+
+        result = analyze_gaps(resume['keywords'], jd['keywords'], resume['skills'], jd['skills'], self.taxonomy)
+        result['explanations'] = generate_explanations(result)
+        return result
+
+    def analyze(self, resume_text, jd_text, jd=None):
+        """
+        Runs the whole analysis on extracted resume and job description text.
+
+        Args:
+            resume_text (str): The extracted resume text.
+            jd_text (str): The extracted job description text.
+            jd (dict, optional): The job description's document() output under these
+                settings, e.g. from a JDStore; only the resume is then processed.
+
+        Returns:
+            AnalysisResult
+        """
+        cache = self.cache
+        model_key = _model_key(self.model)
+        resume_hash = content_hash(resume_text)
+        jd_hash = content_hash(jd_text)
+        stages = []
+
+        ats_result = run_stage(stages, cache, 'ats', stage_key('ats', resume_hash),
+                               lambda: ats(resume_text))
+        resume = run_stage(stages, cache, 'document_resume', stage_key('document', resume_hash, self.fingerprint),
+                           lambda: self.document(resume_text))
+        if jd is None:
+            jd = run_stage(stages, cache, 'document_jd', stage_key('document', jd_hash, self.fingerprint),
+                           lambda: self.document(jd_text))
+        else:
+            stages.append({'stage': 'document_jd', 'seconds': 0.0, 'cached': True})
+        similarity_score = run_stage(stages, cache, 'similarity', stage_key('similarity', resume_hash, jd_hash, model_key),
+                                     lambda: self.similarity(resume, jd))
+        gap_result = run_stage(stages, cache, 'gaps', stage_key('gaps', resume_hash, jd_hash, self.fingerprint),
+                               lambda: self.gaps(resume, jd))
+        semantic_score = None
+        if self.embedder is not None:
+            semantic_score = run_stage(stages, cache, 'semantic_similarity',
+                                       stage_key('semantic', resume_hash, jd_hash, self.embedder.fingerprint),
+                                       lambda: semantic(resume_text, jd_text, self.embedder))
+        return AnalysisResult(
+            ats_score=ats_result['score'],
+            ats_feedback=ats_result['feedback'],
+            similarity_score=similarity_score,
+            resume_keywords=resume['keywords'],
+            jd_keywords=jd['keywords'],
+            resume_skills=resume['skills'],
+            jd_skills=jd['skills'],
+            gaps=gap_result,
+            preprocessed_resume=resume['preprocessed'],
+            preprocessed_jd=jd['preprocessed'],
+            stages=stages,
+            semantic_score=semantic_score,
+        )
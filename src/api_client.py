@@ -0,0 +1,103 @@
+"""
+Client for the HTTP service in app/api.py.
+"""
+
+import requests
+
+class ServiceError(Exception):
+    """
+    Raised when the analysis service rejects a request or cannot be reached.
+    """
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class AnalysisClient:
+    """
+    Calls the analysis service over HTTP, reusing one connection pool.
+
+    Args:
+        base_url (str): The service URL, e.g. 'http://127.0.0.1:8000'.
+        timeout (float): Seconds to wait for each response.
+    """
+
+    def __init__(self, base_url, timeout=120):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def _request(self, method, path, **kwargs):
+        try:
+            response = self._session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise ServiceError(f"The analysis service at {self.base_url} is unreachable: {e}") from e
+        if response.status_code != 200:
+            try:
+                detail = response.json()['detail']
+            except (ValueError, KeyError, TypeError):
+                detail = response.text
+            raise ServiceError(detail, response.status_code)
+        return response.json()
+
+    def health(self):
+        return self._request('GET', '/health')
+
+    def extract(self, data, filename):
+        return self._request('POST', '/extract', files={'file': (filename, data)})['text']
+
+    def preprocess(self, text):
+        return self._request('POST', '/preprocess', json={'text': text})['text']
+
+    def keywords(self, preprocessed_text, top_n=20):
+        return self._request('POST', '/keywords', json={'text': preprocessed_text, 'top_n': top_n})['keywords']
+
+    def similarity(self, preprocessed_resume, preprocessed_jd):
+        return self._request('POST', '/similarity', json={'resume_text': preprocessed_resume, 'jd_text': preprocessed_jd})['score']
+
+    def skills(self, text):
+        return self._request('POST', '/skills', json={'text': text})['skills']
+
+    def gaps(self, resume_keywords, jd_keywords, resume_skills=None, jd_skills=None):
+        body = {'resume_keywords': resume_keywords, 'jd_keywords': jd_keywords}
+        if resume_skills is not None and jd_skills is not None:
+            body.update(resume_skills=resume_skills, jd_skills=jd_skills)
+        return self._request('POST', '/gaps', json=body)
+
+    def ats(self, resume_text):
+        return self._request('POST', '/ats', json={'text': resume_text})
+
+    def metrics(self):
+        """
+        Returns the service's metrics in Prometheus text format.
+        """
+        try:
+            response = self._session.get(self.base_url + '/metrics', timeout=self.timeout)
+        except requests.RequestException as e:
+            raise ServiceError(f"The analysis service at {self.base_url} is unreachable: {e}") from e
+        if response.status_code != 200:
+            raise ServiceError(response.text, response.status_code)
+        return response.text
+
+    def analyze(self, resume_data, resume_filename, jd_data=None, jd_filename=None, jd_text=None, profile=None):
+        """
+        Runs the whole pipeline on an uploaded resume and job description.
+
+        Args:
+            profile (str, optional): 'cpu', 'memory' or 'cpu,memory' to include a
+                profile of the request under 'profile' in the result.
+
+        Returns:
+            dict: pipeline.run_analysis output plus the extracted 'resume_text'.
+        """
+        files = {'resume': (resume_filename, resume_data)}
+        data = {}
+        if jd_data is not None:
+            files['jd'] = (jd_filename, jd_data)
+        else:
+            data['jd_text'] = jd_text or ''
+        params = {'profile': profile} if profile else None
+        return self._request('POST', '/analyze', files=files, data=data, params=params)
+
+    def close(self):
+        self._session.close()
@@ -0,0 +1,226 @@
+"""
+Declarative ATS rule engine.
+
+Rules are loaded from a JSON config (see data/ats_rules.json) and compiled into two
+regular expressions, one for terms and one for patterns, each finding all of its hits
+in a single pass over the resume. All term lists (sections, action verbs, skills)
+share one trie-shaped alternation, which keeps the scan cost close to flat as the
+number of terms grows into the thousands.
+
+Rule types:
+    pattern    -- awards 'points' if the regex 'pattern' matches anywhere.
+    each_term  -- awards 'points' per term found; '{term}' in the feedback is
+                  replaced by each missing term, capitalized.
+    term_count -- counts distinct terms found and awards the points of the first
+                  [min_count, points] entry in 'tiers' that is met.
+
+Terms match case-insensitively between word boundaries, like r'\\b' + term + r'\\b'.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .regex_trie import build_trie, trie_pattern
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), 'data', 'ats_rules.json')
+
+# Characters of each chunk re-scanned with the next one when scanning a stream
+STREAM_OVERLAP = 128
+
+@dataclass(frozen=True)
+class RuleResult:
+    name: str
+    group: str
+    points: int
+    feedback: list
+
+@dataclass(frozen=True)
+class ScanResult:
+    terms: frozenset
+    patterns: frozenset
+
+def _boundary_prefixes(term, terms):
+    """
+    Returns the other terms that are prefixes of `term` ending on a word boundary.
+    They match wherever `term` does, but the scan only captures the longest term.
+    """
+    prefixes = set()
+    for end in range(1, len(term)):
+        if (term[end - 1].isalnum() or term[end - 1] == '_') != (term[end].isalnum() or term[end] == '_'):
+            if term[:end] in terms:
+                prefixes.add(term[:end])
+    return prefixes
+
+class ATSRuleEngine:
+    """
+    Compiles a rule config once and scores resumes against it in a single pass.
+    """
+
+    def __init__(self, config):
+        self.max_score = config.get('max_score', 100)
+        self.rules = [dict(rule) for rule in config['rules']]
+
+        terms = set()
+        self._patterns = {}
+        for rule in self.rules:
+            if rule['type'] == 'pattern':
+                flags = re.IGNORECASE if rule.get('ignore_case') else 0
+                self._patterns[rule['name']] = re.compile(rule['pattern'], flags)
+            elif rule['type'] in ('each_term', 'term_count'):
+                rule['terms'] = [term.lower() for term in rule['terms']]
+                terms.update(rule['terms'])
+            else:
+                raise ValueError(f"Unknown ATS rule type: {rule['type']}")
+
+        self._implied_terms = {term: _boundary_prefixes(term, terms) for term in terms}
+        # Case-insensitive matching also accepts characters such as the Kelvin sign
+        # whose lower() differs from the term; casefold() maps them back
+        self._casefolded_terms = {term.casefold(): term for term in terms}
+
+        # Terms and patterns get separate scans, so a term can never hide a pattern hit
+        # starting at the same character (e.g. an email address that begins with a skill).
+        # Both are zero-width lookaheads, so overlapping hits are seen while the scan
+        # advances one position at a time.
+        self._term_scan = re.compile(
+            r'(?=(?P<term>\b(?i:' + trie_pattern(build_trie(terms)) + r')\b))'
+        ) if terms else None
+        branches = []
+        self._pattern_groups = {}
+        for i, (name, pattern) in enumerate(self._patterns.items()):
+            group = f'p{i}'
+            self._pattern_groups[group] = name
+            inline_flags = '(?i:' if pattern.flags & re.IGNORECASE else '(?:'
+            branches.append(f'(?=(?P<{group}>{inline_flags}{pattern.pattern})))')
+        self._pattern_scan = re.compile('|'.join(branches)) if branches else None
+
+    def scan(self, text):
+        """
+        Finds every term and pattern rule hit in one pass over the text.
+
+        Returns:
+            ScanResult: The distinct terms and pattern rule names that were found.
+        """
+        terms = set()
+        patterns = set()
+        self._scan_into(text, terms, patterns)
+        return ScanResult(frozenset(terms), frozenset(patterns))
+
+    def scan_stream(self, chunks, overlap=STREAM_OVERLAP):
+        """
+        Scans text that arrives in chunks (e.g. PDF pages), keeping only the hits.
+
+        Chunks are treated as separated by a space. The tail of each chunk is carried
+        into the next scan, so hits spanning a chunk boundary are still found as long
+        as they are shorter than `overlap` characters.
+
+        Returns:
+            ScanResult: The distinct terms and pattern rule names that were found.
+        """
+        terms = set()
+        patterns = set()
+        carry = ''
+        for chunk in chunks:
+            window = carry + ' ' + chunk if carry else chunk
+            self._scan_into(window, terms, patterns)
+            carry = window[-overlap:]
+        return ScanResult(frozenset(terms), frozenset(patterns))
+
+    def _scan_into(self, text, terms, patterns):
+        if self._term_scan is not None:
+            for match in self._term_scan.finditer(text):
+                term_text = match.group('term')
+                term = term_text.lower()
+                if term not in self._implied_terms:
+                    term = self._casefolded_terms.get(term_text.casefold(), term)
+                terms.add(term)
+                terms.update(self._implied_terms.get(term, ()))
+
+        if self._pattern_scan is not None:
+            starts = []
+            for match in self._pattern_scan.finditer(text):
+                for group, name in self._pattern_groups.items():
+                    if match.group(group) is not None:
+                        patterns.add(name)
+                        starts.append(match.start())
+                        break
+
+            # Only one pattern is captured per offset, so another pattern starting at the
+            # same character can be hidden; only offsets where a pattern matched need a check.
+            for name, pattern in self._patterns.items():
+                if name not in patterns and any(pattern.match(text, start) for start in starts):
+                    patterns.add(name)
+
+    def evaluate_scan(self, scan):
+        """
+        Applies every rule to a scan result.
+
+        Returns:
+            list: One RuleResult per rule, in config order.
+        """
+        results = []
+        for rule in self.rules:
+            points = 0
+            feedback = []
+            if rule['type'] == 'pattern':
+                if rule['name'] in scan.patterns:
+                    points = rule['points']
+                else:
+                    feedback.append(rule['feedback'])
+            elif rule['type'] == 'each_term':
+                for term in rule['terms']:
+                    if term in scan.terms:
+                        points += rule['points']
+                    else:
+                        feedback.append(rule['feedback'].format(term=term.capitalize()))
+            else:
+                found = sum(1 for term in rule['terms'] if term in scan.terms)
+                for min_count, tier_points in rule['tiers']:
+                    if found >= min_count:
+                        points = tier_points
+                        break
+                else:
+                    feedback.append(rule['feedback'])
+            results.append(RuleResult(rule['name'], rule.get('group', rule['name']), points, feedback))
+        return results
+
+    def evaluate(self, text):
+        return self.evaluate_scan(self.scan(text))
+
+    def score(self, text):
+        """
+        Scores a resume.
+
+        Returns:
+            tuple: (score capped at max_score, list of feedback strings)
+        """
+        return self.score_results(self.evaluate(text))
+
+    def score_results(self, results):
+        score = sum(result.points for result in results)
+        feedback = [item for result in results for item in result.feedback]
+        return min(score, self.max_score), feedback
+
+    def score_group(self, text, group):
+        """
+        Scores only the rules of one group, e.g. 'contact' or 'sections'.
+        """
+        results = [result for result in self.evaluate(text) if result.group == group]
+        score = sum(result.points for result in results)
+        return score, [item for result in results for item in result.feedback]
+
+def load_rules(path=DEFAULT_RULES_PATH):
+    """
+    Loads an ATS rule config from a JSON file.
+    """
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+@lru_cache(maxsize=None)
+def get_rule_engine(path=DEFAULT_RULES_PATH):
+    """
+    Returns the compiled engine for a rule file, compiling it once per process.
+    """
+    return ATSRuleEngine(load_rules(path))
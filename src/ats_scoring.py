@@ -1,110 +1,59 @@
+from .ats_rules import get_rule_engine
+from .instrumentation import instrumented
 
-import re
-
-def calculate_ats_score(resume_text):
+@instrumented('ats', sizes=lambda result, resume_text, *args, **kwargs: {'chars': len(resume_text)})
+def calculate_ats_score(resume_text, engine=None):
     """
     Calculates an ATS score for a resume based on predefined criteria.
-    """
-    score = 0
-    feedback = []
 
-    # Criterion 1: Contact Information
-    contact_info_score, contact_feedback = check_contact_information(resume_text)
-    score += contact_info_score
-    feedback.extend(contact_feedback)
+    The criteria (contact information, key sections, action verbs and quantifiable
+    achievements) are defined in data/ats_rules.json and evaluated in a single pass.
 
-    # Criterion 2: Key Sections
-    sections_score, sections_feedback = check_key_sections(resume_text)
-    score += sections_score
-    feedback.extend(sections_feedback)
+    Args:
+        resume_text (str): The raw resume text.
+        engine (ATSRuleEngine, optional): An engine compiled from a custom rule config.
 
-    # Criterion 3: Action Verbs
-    action_verbs_score, action_verbs_feedback = check_action_verbs(resume_text)
-    score += action_verbs_score
-    feedback.extend(action_verbs_feedback)
+    Returns:
+        tuple: The score (0 to 100) and a list of feedback strings.
+    """
+    engine = engine or get_rule_engine()
+    return engine.score(resume_text)
+
+def calculate_ats_score_from_pages(pages, engine=None):
+    """
+    Calculates the ATS score from text that arrives page by page, e.g. from
+    text_extraction.iter_pdf_pages, without holding the whole document in memory.
 
-    # Criterion 4: Quantifiable Achievements
-    quantifiable_achievements_score, quantifiable_achievements_feedback = check_quantifiable_achievements(resume_text)
-    score += quantifiable_achievements_score
-    feedback.extend(quantifiable_achievements_feedback)
+    Args:
+        pages (iterable): The pages' text, in order.
+        engine (ATSRuleEngine, optional): An engine compiled from a custom rule config.
 
-    return min(score, 100), feedback
+    Returns:
+        tuple: The score (0 to 100) and a list of feedback strings.
+    """
+    engine = engine or get_rule_engine()
+    return engine.score_results(engine.evaluate_scan(engine.scan_stream(pages)))
 
 def check_contact_information(text):
     """
     Checks for the presence of contact information like email and phone number.
     """
-    score = 0
-    feedback = []
-
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-
-    if re.search(email_pattern, text):
-        score += 10
-    else:
-        feedback.append("Missing email address.")
-
-    if re.search(phone_pattern, text):
-        score += 10
-    else:
-        feedback.append("Missing phone number.")
-
-    return score, feedback
+    return get_rule_engine().score_group(text, 'contact')
 
 def check_key_sections(text):
     """
     Checks for the presence of key resume sections.
     """
-    score = 0
-    feedback = []
-
-    required_sections = ["experience", "education", "skills"]
-
-    for section in required_sections:
-        if re.search(r'\b' + section + r'\b', text, re.IGNORECASE):
-            score += 10
-        else:
-            feedback.append(f"Missing '{section.capitalize()}' section.")
-
-    return score, feedback
+    return get_rule_engine().score_group(text, 'sections')
 
 def check_action_verbs(text):
     """
     Checks for the use of action verbs.
     """
-    score = 0
-    feedback = []
-
-    action_verbs = ["managed", "led", "developed", "created", "implemented", "achieved", "increased", "reduced"]
-
-    found_verbs = 0
-    for verb in action_verbs:
-        if re.search(r'\b' + verb + r'\b', text, re.IGNORECASE):
-            found_verbs += 1
-
-    if found_verbs >= 3:
-        score += 20
-    elif found_verbs >= 1:
-        score += 10
-    else:
-        feedback.append("Include more action verbs to describe your accomplishments.")
-
-    return score, feedback
+    return get_rule_engine().score_group(text, 'action_verbs')
 
 def check_quantifiable_achievements(text):
     """
     Checks for quantifiable achievements (e.g., numbers, percentages).
     """
-    score = 0
-    feedback = []
-
-    # Looks for numbers, percentages, and currency symbols
-    quantifiable_pattern = r'(\d+%|\$\d+|\d+\s?(million|billion|thousand)|\d{3,})'
-
-    if re.search(quantifiable_pattern, text):
-        score += 20
-    else:
-        feedback.append("Add quantifiable achievements to demonstrate your impact (e.g., 'Increased sales by 20%').")
-
-    return score, feedback
+    return get_rule_engine().score_group(text, 'quantifiable_achievements')
@@ -0,0 +1,345 @@
+"""
+Corpus-level vocabulary and IDF model.
+
+The model is fitted offline over a directory of past resumes and job descriptions,
+saved to a compact binary file and memory-mapped at startup, so every worker process
+shares the same read-only pages instead of refitting its own vectorizer.
+
+File layout (all integers little-endian, arrays 8-byte aligned):
+
+    magic 'RSCM' | format version (uint32) | header length (uint32) | JSON header
+    table_hashes  uint64[table_size]   open-addressing hash table (0 marks an empty slot)
+    table_slots   int32[table_size]    term index stored in each occupied slot
+    idf           float32[n_terms]     IDF weight per term
+    term_offsets  uint64[n_terms + 1]  byte offsets of each term in the blob
+    term_blob     bytes                UTF-8 encoded terms, concatenated
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+MAGIC = b'RSCM'
+FORMAT_VERSION = 1
+LOOKUP_CACHE_SIZE = 100000
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+def _term_hash(term):
+    """
+    Stable 64-bit hash of a term. Python's built-in hash() is salted per process,
+    so it cannot be stored on disk. Zero is reserved for empty table slots.
+    """
+    digest = hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') | 1
+
+def _aligned(offset):
+    return (offset + 7) & ~7
+
+class CorpusModel:
+    """
+    A read-only vocabulary and IDF table that can transform documents into
+    L2-normalized TF-IDF vectors, matching sklearn's TfidfVectorizer defaults.
+    """
+
+    def __init__(self, table_hashes, table_slots, idf, term_offsets, term_blob, ngram_range, stop_words, buffer=None):
+        self._table_hashes = table_hashes
+        self._table_slots = table_slots
+        self.idf = idf
+        self._term_offsets = term_offsets
+        self._term_blob = term_blob
+        self.ngram_range = tuple(ngram_range)
+        self.stop_words = stop_words
+        self._buffer = buffer
+        self._mask = len(table_hashes) - 1
+        self._lookup_cache = {}
+        self._fingerprint = None
+        self._analyzer = CountVectorizer(ngram_range=self.ngram_range, stop_words=stop_words).build_analyzer()
+
+    @property
+    def n_terms(self):
+        return len(self.idf)
+
+    @property
+    def fingerprint(self):
+        """
+        A digest of the vocabulary and IDF weights, e.g. to key cached scores by model.
+        """
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(json.dumps([list(self.ngram_range), self.stop_words]).encode('utf-8'))
+            digest.update(np.asarray(self.idf, dtype='<f4').tobytes())
+            digest.update(bytes(self._term_blob))
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def term(self, index):
+        """
+        Returns the term stored at the given feature index.
+        """
+        start, end = self._term_offsets[index], self._term_offsets[index + 1]
+        return bytes(self._term_blob[start:end]).decode('utf-8')
+
+    def get_feature_names(self):
+        """
+        Returns every term in feature-index order.
+        """
+        return [self.term(i) for i in range(self.n_terms)]
+
+    def lookup(self, term):
+        """
+        Returns the feature index of a term, or -1 if it is not in the vocabulary.
+        """
+        index = self._lookup_cache.get(term)
+        if index is not None:
+            return index
+
+        term_hash = _term_hash(term)
+        slot = term_hash & self._mask
+        index = -1
+        while True:
+            stored_hash = int(self._table_hashes[slot])
+            if stored_hash == 0:
+                break
+            if stored_hash == term_hash:
+                candidate = int(self._table_slots[slot])
+                # Verify the string itself so hash collisions cannot alias terms
+                if self.term(candidate) == term:
+                    index = candidate
+                    break
+            slot = (slot + 1) & self._mask
+
+        if len(self._lookup_cache) >= LOOKUP_CACHE_SIZE:
+            self._lookup_cache.clear()
+        self._lookup_cache[term] = index
+        return index
+
+    def term_counts(self, document):
+        """
+        Counts the vocabulary terms of a preprocessed document.
+
+        Returns:
+            dict: Feature index to count; terms outside the vocabulary are dropped.
+        """
+        row = {}
+        for term, count in Counter(self._analyzer(document)).items():
+            index = self.lookup(term)
+            if index >= 0:
+                row[index] = count
+        return row
+
+    def transform(self, documents):
+        """
+        Transforms preprocessed documents into L2-normalized TF-IDF vectors.
+
+        Args:
+            documents (list): Preprocessed texts.
+
+        Returns:
+            scipy.sparse.csr_matrix: One row per document, one column per vocabulary term.
+        """
+        indptr = [0]
+        indices = []
+        counts = []
+        for document in documents:
+            row = self.term_counts(document)
+            for index in sorted(row):
+                indices.append(index)
+                counts.append(row[index])
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.int64)
+        data = np.asarray(counts, dtype=np.float64) * self.idf[indices]
+        matrix = csr_matrix((data, indices, np.asarray(indptr)), shape=(len(indptr) - 1, self.n_terms))
+        return normalize(matrix)
+
+    def save(self, path):
+        """
+        Writes the model to disk in the memory-mappable format described above.
+        """
+        header = json.dumps({
+            'n_terms': int(self.n_terms),
+            'table_size': int(len(self._table_hashes)),
+            'blob_size': int(len(self._term_blob)),
+            'ngram_range': list(self.ngram_range),
+            'stop_words': self.stop_words,
+        }).encode('utf-8')
+
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<II', FORMAT_VERSION, len(header)))
+            f.write(header)
+            for array in (
+                np.asarray(self._table_hashes, dtype='<u8'),
+                np.asarray(self._table_slots, dtype='<i4'),
+                np.asarray(self.idf, dtype='<f4'),
+                np.asarray(self._term_offsets, dtype='<u8'),
+            ):
+                f.write(b'\0' * (_aligned(f.tell()) - f.tell()))
+                f.write(array.tobytes())
+            f.write(bytes(self._term_blob))
+
+    def close(self):
+        """
+        Releases the memory map, if the model was loaded from disk.
+
+        Arrays taken from the model (e.g. `model.idf`) are views of the map and
+        stay valid; while any of them is alive the map is left open and is
+        released by the garbage collector once the last view is dropped.
+        """
+        if self._buffer is not None:
+            self._table_hashes = self._table_slots = self.idf = self._term_offsets = self._term_blob = None
+            try:
+                self._buffer.close()
+            except BufferError:
+                pass
+            self._buffer = None
+
+def build_corpus_model(vocabulary, idf, ngram_range=(1, 1), stop_words=None):
+    """
+    Builds an in-memory model from a term-to-index vocabulary and IDF weights.
+    """
+    terms = [None] * len(vocabulary)
+    for term, index in vocabulary.items():
+        terms[index] = term
+
+    # Power-of-two table at most half full keeps linear probing short
+    table_size = 1
+    while table_size < 2 * max(len(terms), 1):
+        table_size *= 2
+    mask = table_size - 1
+
+    table_hashes = np.zeros(table_size, dtype=np.uint64)
+    table_slots = np.full(table_size, -1, dtype=np.int32)
+    for index, term in enumerate(terms):
+        term_hash = _term_hash(term)
+        slot = term_hash & mask
+        while table_hashes[slot] != 0:
+            slot = (slot + 1) & mask
+        table_hashes[slot] = term_hash
+        table_slots[slot] = index
+
+    encoded = [term.encode('utf-8') for term in terms]
+    term_offsets = np.zeros(len(terms) + 1, dtype=np.uint64)
+    term_offsets[1:] = np.cumsum([len(term) for term in encoded])
+    term_blob = b''.join(encoded)
+
+    return CorpusModel(
+        table_hashes, table_slots, np.asarray(idf, dtype=np.float32), term_offsets, term_blob,
+        ngram_range, stop_words,
+    )
+
+def fit_corpus_model(documents, ngram_range=(1, 1), stop_words=None, min_df=1):
+    """
+    Fits the vocabulary and IDF weights over a corpus of preprocessed documents.
+
+    Args:
+        documents (iterable): Preprocessed resume and job description texts.
+        ngram_range (tuple): The n-gram range, as for TfidfVectorizer.
+        stop_words (str, optional): 'english' or None, as for TfidfVectorizer.
+        min_df (int or float): Ignore terms with a lower document frequency.
+
+    Returns:
+        CorpusModel: The fitted model.
+    """
+    tfidf_vectorizer = TfidfVectorizer(ngram_range=ngram_range, stop_words=stop_words, min_df=min_df)
+    tfidf_vectorizer.fit(documents)
+    return build_corpus_model(tfidf_vectorizer.vocabulary_, tfidf_vectorizer.idf_, ngram_range, stop_words)
+
+def iter_corpus_documents(directory):
+    """
+    Yields the preprocessed text of every supported file under a directory.
+    """
+    from .text_extraction import extract_text
+    from .text_preprocessing import preprocess_text
+
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            extension = os.path.splitext(name)[1].lower()
+            if extension not in SUPPORTED_EXTENSIONS:
+                continue
+            if extension == '.txt':
+                with open(path, encoding='utf-8', errors='ignore') as f:
+                    text = f.read()
+            else:
+                text = extract_text(path)
+            yield preprocess_text(text)
+
+def fit_corpus_model_from_directory(directory, **kwargs):
+    """
+    Fits a model over every PDF, DOCX and TXT file under a directory.
+    Keyword arguments are passed on to fit_corpus_model.
+    """
+    return fit_corpus_model(iter_corpus_documents(directory), **kwargs)
+
+def load_corpus_model(path):
+    """
+    Memory-maps a saved model. The arrays are views into the shared read-only
+    mapping, so nothing is copied into the process until it is touched.
+
+    Args:
+        path (str): The path to a file written by CorpusModel.save.
+
+    Returns:
+        CorpusModel: The loaded model.
+    """
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if buffer[:4] != MAGIC:
+        buffer.close()
+        raise ValueError(f"Not a corpus model file: {path}")
+    version, header_length = struct.unpack_from('<II', buffer, 4)
+    if version != FORMAT_VERSION:
+        buffer.close()
+        raise ValueError(f"Unsupported corpus model version {version} in: {path}")
+
+    offset = 12
+    header = json.loads(buffer[offset:offset + header_length].decode('utf-8'))
+    offset += header_length
+
+    arrays = []
+    for dtype, count in (
+        ('<u8', header['table_size']),
+        ('<i4', header['table_size']),
+        ('<f4', header['n_terms']),
+        ('<u8', header['n_terms'] + 1),
+    ):
+        offset = _aligned(offset)
+        arrays.append(np.frombuffer(buffer, dtype=dtype, count=count, offset=offset))
+        offset += np.dtype(dtype).itemsize * count
+    term_blob = memoryview(buffer)[offset:offset + header['blob_size']]
+
+    return CorpusModel(
+        *arrays, term_blob, header['ngram_range'], header['stop_words'], buffer=buffer,
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit a corpus IDF model over a directory of resumes and job descriptions.")
+    parser.add_argument('directory', help="Directory of PDF, DOCX and TXT files.")
+    parser.add_argument('output', help="Path of the model file to write.")
+    parser.add_argument('--ngram-max', type=int, default=3, help="Largest n-gram size (default: 3).")
+    parser.add_argument('--min-df', type=int, default=2, help="Minimum document frequency (default: 2).")
+    parser.add_argument('--no-stop-words', action='store_true', help="Keep English stop words.")
+    args = parser.parse_args(argv)
+
+    model = fit_corpus_model_from_directory(
+        args.directory,
+        ngram_range=(1, args.ngram_max),
+        stop_words=None if args.no_stop_words else 'english',
+        min_df=args.min_df,
+    )
+    model.save(args.output)
+    print(f"Wrote {model.n_terms} terms to {args.output}")
+
+if __name__ == '__main__':
+    main()
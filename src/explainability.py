@@ -1,4 +1,7 @@
 
+from .instrumentation import instrumented
+
+@instrumented('explanations')
 def generate_explanations(gap_analysis_result):
     """
     Generates human-readable explanations for the gap analysis.
@@ -7,7 +10,9 @@ def generate_explanations(gap_analysis_result):
         gap_analysis_result (dict): The result from the analyze_gaps function.
 
     Returns:
-        dict: A dictionary with explanations for missing and matched keywords.
+        dict: A dictionary with explanations for missing and matched keywords. If the
+        analysis compared skills, also 'missing_skills' and 'matched_skills', one
+        explanation per canonical skill, named by its display name.
     """
     explanations = {
         'missing': [],
@@ -29,4 +34,17 @@ def generate_explanations(gap_analysis_result):
         )
         explanations['matches'].append(explanation)
 
+    # Explanations for canonical skills, whatever alias each document used
+    if 'missing_skills' in gap_analysis_result:
+        names = gap_analysis_result.get('skill_names', {})
+        explanations['missing_skills'] = [
+            f"The job description asks for {names.get(skill_id, skill_id)}, which your resume does not mention "
+            "under any common name. If you have this skill, list it in your skills section."
+            for skill_id in gap_analysis_result['missing_skills']
+        ]
+        explanations['matched_skills'] = [
+            f"Your resume covers {names.get(skill_id, skill_id)}, which this role asks for."
+            for skill_id in gap_analysis_result.get('matched_skills', [])
+        ]
+
     return explanations
@@ -0,0 +1,147 @@
+"""
+Content-addressed cache in front of text extraction.
+
+Extracted text is stored in a local SQLite database keyed by the SHA-256 of the file
+bytes and the extractor version, so re-analysing a document that was already seen
+skips PDF parsing entirely, regardless of its file name. Least recently used entries
+are evicted once the stored text exceeds a size budget.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from .text_extraction import EXTRACTOR_VERSION, extract_text_from_bytes
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'resume_optimizer', 'extraction.sqlite3')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+def content_key(data, extract_options=None):
+    """
+    Returns the cache key for a document: extractor version plus SHA-256 of its bytes.
+    Extraction limits change the extracted text, so they are part of the key too.
+    """
+    key = f"{EXTRACTOR_VERSION}:{hashlib.sha256(data).hexdigest()}"
+    if extract_options:
+        key += ':' + ','.join(f"{name}={value}" for name, value in sorted(extract_options.items()))
+    return key
+
+class ExtractionCache:
+    """
+    A size-bounded LRU cache of extracted text, persisted in SQLite.
+    Safe to share between threads, e.g. across Streamlit sessions.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES, extract_options=None):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        # Keyword arguments for extract_text on a miss, e.g. page and character limits
+        self.extract_options = dict(extract_options or {})
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS extractions ('
+                ' key TEXT PRIMARY KEY, text TEXT NOT NULL,'
+                ' size INTEGER NOT NULL, last_access REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS extractions_lru ON extractions (last_access)')
+
+    def get(self, key):
+        """
+        Returns the cached text for a key, or None, and marks the entry as recently used.
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT text FROM extractions WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._conn:
+                self._conn.execute('UPDATE extractions SET last_access = ? WHERE key = ?', (time.time(), key))
+            return row[0]
+
+    def put(self, key, text):
+        """
+        Stores extracted text, then evicts least recently used entries over the budget.
+        """
+        size = len(text.encode('utf-8'))
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO extractions (key, text, size, last_access) VALUES (?, ?, ?, ?)',
+                (key, text, size, time.time()),
+            )
+            total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM extractions').fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(total - self.max_bytes)
+
+    def _evict(self, excess):
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute('SELECT key, size FROM extractions ORDER BY last_access'):
+            if freed >= excess:
+                break
+            victims.append((key,))
+            freed += size
+        self._conn.executemany('DELETE FROM extractions WHERE key = ?', victims)
+
+    def extract_bytes(self, data, suffix, workers=None):
+        """
+        Extracts text from in-memory file bytes, using the cache when possible.
+
+        Args:
+            data (bytes): The file contents.
+            suffix (str): The file extension, e.g. '.pdf' or '.docx'.
+            workers (int, optional): Worker processes for the pages of a long PDF on a
+                miss. The text does not depend on it, so it is not part of the key.
+
+        Returns:
+            str: The extracted text.
+        """
+        key = content_key(data, self.extract_options)
+        text = self.get(key)
+        if text is not None:
+            return text
+
+        text = extract_text_from_bytes(data, suffix, workers=workers, **self.extract_options)
+        self.put(key, text)
+        return text
+
+    def extract_file(self, file_path):
+        """
+        Extracts text from a file on disk, using the cache when possible.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"The file was not found at: {file_path}")
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        return self.extract_bytes(data, os.path.splitext(file_path)[1].lower())
+
+    def stats(self):
+        """
+        Returns hit and miss counts for this process along with the stored size.
+        """
+        with self._lock:
+            entries, total = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extractions'
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+        }
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM extractions')
+
+    def close(self):
+        self._conn.close()
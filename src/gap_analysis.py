@@ -1,14 +1,25 @@
+from .instrumentation import instrumented
 
-def analyze_gaps(resume_keywords, jd_keywords):
+@instrumented('gaps', sizes=lambda result, resume_keywords, jd_keywords, *args, **kwargs: {'keywords': len(resume_keywords) + len(jd_keywords)})
+def analyze_gaps(resume_keywords, jd_keywords, resume_skills=None, jd_skills=None, taxonomy=None):
     """
     Identifies missing keywords in the resume compared to the job description.
 
     Args:
         resume_keywords (list): A list of keywords from the resume.
         jd_keywords (list): A list of keywords from the job description.
+        resume_skills (list, optional): Canonical skill IDs mentioned anywhere in the
+            resume, from SkillTaxonomy.find_skills.
+        jd_skills (list, optional): Canonical skill IDs mentioned in the job description.
+        taxonomy (SkillTaxonomy, optional): The taxonomy the IDs come from (default:
+            skill_taxonomy.get_taxonomy()).
 
     Returns:
         dict: A dictionary containing the analysis, including missing keywords.
+        When skills are given, it also has 'missing_skills' and 'matched_skills'
+        (canonical IDs) and 'skill_names' (ID to display name). JD keywords that
+        mention skills are then compared by skill ID rather than spelling: they match
+        if the resume has all of their skills, and are otherwise left to missing_skills.
     """
     # Convert lists to sets for efficient comparison
     resume_keywords_set = set(resume_keywords)
@@ -20,11 +31,38 @@ def analyze_gaps(resume_keywords, jd_keywords):
     # For a more detailed analysis, we can also find matched keywords
     strong_matches = list(jd_keywords_set.intersection(resume_keywords_set))
 
+    skill_result = {}
+    if resume_skills is not None and jd_skills is not None:
+        if taxonomy is None:
+            from .skill_taxonomy import get_taxonomy
+            taxonomy = get_taxonomy()
+        resume_skills_set = set(resume_skills)
+        jd_skills_set = set(jd_skills)
+
+        # "javascript" is not missing from a resume that says "JS"
+        remaining = []
+        for keyword in missing_keywords:
+            keyword_skills = taxonomy.find_skills(keyword)
+            if not keyword_skills:
+                remaining.append(keyword)
+            elif resume_skills_set.issuperset(keyword_skills):
+                strong_matches.append(keyword)
+        missing_keywords = remaining
+
+        missing_skills = sorted(jd_skills_set - resume_skills_set)
+        matched_skills = sorted(jd_skills_set & resume_skills_set)
+        skill_result = {
+            'missing_skills': missing_skills,
+            'matched_skills': matched_skills,
+            'skill_names': {skill_id: taxonomy.name(skill_id) for skill_id in missing_skills + matched_skills},
+        }
+
     # For this phase, we will focus on the "missing" category.
     # The output is structured for easy extension.
     gap_analysis_result = {
         'missing_keywords': sorted(missing_keywords),
         'strong_matches': sorted(strong_matches)
     }
+    gap_analysis_result.update(skill_result)
 
     return gap_analysis_result
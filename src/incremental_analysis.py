@@ -0,0 +1,262 @@
+"""
+Incremental re-analysis of an edited resume.
+
+Adding keywords with add_keywords_to_resume changes a few lines of a resume that has
+already been analyzed. IncrementalAnalysis keeps what the analysis of the original
+resume is derived from, and updates it for a list of TextEdits (keyword_edits output,
+or any other replacements) from the text around the edits alone:
+
+- term and n-gram counts: the resume's tokens are kept in chunks that end at
+  whitespace. Only the chunks an edit touches are tokenized again, and n-grams are
+  recounted over them plus the last and first content terms of their neighbours.
+- similarity: the TF-IDF cosine is re-evaluated for the changed terms only.
+- keywords: the unchanged counts were ranked once, so the new keywords are the best
+  of the changed counts and the top of that ranking.
+- skills: SkillTaxonomy.rematch matches the tokens around the edits again.
+- ATS: the rule scan of the text around the edits is merged into the scan of the
+  resume. If a hit found there before the edit is gone after it, the resume is
+  scanned again, since the hit may have had no other occurrence.
+- gaps: recomputed from the keyword and skill lists, which are short.
+
+Results equal AnalysisPipeline.analyze on the edited text, up to floating point
+rounding of the similarity. The semantic score, if any, is computed on the whole text.
+"""
+
+import bisect
+import heapq
+import math
+import re
+from collections import Counter
+from itertools import chain
+
+from .analysis_pipeline import AnalysisResult, word_ngrams
+from .ats_rules import STREAM_OVERLAP, ScanResult, get_rule_engine
+from .instrumentation import span
+from .keyword_optimizer import PAIR_DOCUMENTS, _PairScore
+from .pipeline import run_stage, semantic
+from .result_cache import content_hash, stage_key
+from .resume_updater import TextEdit, apply_edits
+
+# Chunks of resume text tokenized together; an edit re-tokenizes the chunks it touches
+CHUNK_CHARS = 1024
+
+_WHITESPACE = re.compile(r'\s')
+
+def _chunk_starts(text, chunk_chars=CHUNK_CHARS):
+    """
+    Returns the start offsets of chunks of about chunk_chars characters, each ending
+    just after a whitespace character (or at the end of the text).
+    """
+    starts = [0]
+    while True:
+        match = _WHITESPACE.search(text, starts[-1] + chunk_chars)
+        if match is None or match.end() >= len(text):
+            return starts
+        starts.append(match.end())
+
+def _snap_to_words(text, start, end):
+    """
+    Widens [start, end) to whitespace on both sides, so no word is cut.
+    """
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    while end < len(text) and not text[end].isspace():
+        end += 1
+    return start, end
+
+def _merge_edits(text, edits):
+    """
+    Returns edits as one replacement (start, end, new text) of the range they span.
+    """
+    edits = sorted(edits, key=lambda edit: (edit.start, edit.end))
+    start, end = edits[0].start, max(edit.end for edit in edits)
+    relative = [TextEdit(edit.start - start, edit.end - start, edit.text) for edit in edits]
+    return start, end, apply_edits(text[start:end], relative)
+
+def _nonzero(counts):
+    return {key: count for key, count in counts.items() if count}
+
+class IncrementalAnalysis:
+    """
+    The analysis of one resume against one job description, updatable for edits of
+    the resume at a cost that grows with the edits rather than the resume.
+
+    Args:
+        analysis (AnalysisPipeline): The settings and components of the analysis.
+        resume_text (str): The extracted resume text the edits refer to.
+        jd_text (str): The extracted job description text.
+        jd (dict, optional): The job description's AnalysisPipeline.document output,
+            e.g. from a JDStore. Otherwise it is computed, through the pipeline's
+            cache if it has one.
+    """
+
+    def __init__(self, analysis, resume_text, jd_text, jd=None):
+        self.analysis = analysis
+        self.resume_text = resume_text
+        self.jd_text = jd_text
+        self._engine = get_rule_engine()
+        if jd is None:
+            jd = run_stage([], analysis.cache, 'document_jd',
+                           stage_key('document', content_hash(jd_text), analysis.fingerprint),
+                           lambda: analysis.document(jd_text))
+        self.jd = jd
+
+        self._starts = _chunk_starts(resume_text)
+        ends = self._starts[1:] + [len(resume_text)]
+        self._chunk_tokens = [analysis.preprocessor.tokens(resume_text[start:end]) for start, end in zip(self._starts, ends)]
+        self._chunk_content = [analysis.content_terms(analysis.terms(tokens)) for tokens in self._chunk_tokens]
+
+        terms = analysis.terms(list(chain.from_iterable(self._chunk_tokens)))
+        content_terms = list(chain.from_iterable(self._chunk_content))
+        counts, self._keyword_counts = analysis.term_counts(Counter(terms), Counter(word_ngrams(content_terms, analysis.ngram_range)))
+        # Every keyword candidate, best first; updates only look at the top of it
+        self._ranking = sorted(self._keyword_counts.items(), key=analysis.keyword_rank)
+
+        model = analysis.model
+        if model is not None:
+            idf = lambda term, document_frequency: float(model.idf[term])
+        else:
+            # calculate_similarity's smoothed IDF over the resume/JD pair
+            idf = lambda term, document_frequency: math.log((1 + PAIR_DOCUMENTS) / (1 + document_frequency)) + 1
+        self._pair = _PairScore(counts, jd['counts'], idf)
+        self._skill_matches = analysis.taxonomy.match(resume_text)
+        self._scan = self._engine.scan(resume_text)
+
+        stages = []
+        resume = run_stage(stages, None, 'document_resume', None, lambda: {
+            'preprocessed': " ".join(chain.from_iterable(self._chunk_tokens)),
+            'keywords': self._keywords({}),
+            'skills': self._skills(self._skill_matches),
+            'counts_delta': {},
+        })
+        self.result = self._result(resume_text, self._scan, resume, stages)
+
+    def _keywords(self, changed):
+        """
+        Returns the top_n keywords once the counts in changed (key to new count) replace the original ones.
+        """
+        analysis = self.analysis
+        # The unchanged candidates keep their order, so the first top_n of them and
+        # the changed ones hold the new top_n
+        candidates = []
+        for item in self._ranking:
+            if len(candidates) == analysis.top_n:
+                break
+            if item[0] not in changed:
+                candidates.append(item)
+        candidates.extend(item for item in changed.items() if item[1] > 0)
+        return [analysis.keyword(key) for key, _ in heapq.nsmallest(analysis.top_n, candidates, key=analysis.keyword_rank)]
+
+    @staticmethod
+    def _skills(matches):
+        return list(dict.fromkeys(match.skill_id for match in matches))
+
+    def _document(self, new_text, start, end, new_end):
+        """
+        Re-tokenizes the chunks that text[start:end] touches and derives the changed counts.
+        """
+        analysis = self.analysis
+        text, starts = self.resume_text, self._starts
+        first = bisect.bisect_right(starts, start) - 1
+        # The chunk containing end, so the whitespace the region ends with is not edited
+        last = bisect.bisect_right(starts, end) - 1
+        region_start = starts[first]
+        region_end = starts[last + 1] if last + 1 < len(starts) else len(text)
+        new_tokens = analysis.preprocessor.tokens(new_text[region_start:region_end + new_end - end])
+        old_tokens = list(chain.from_iterable(self._chunk_tokens[first:last + 1]))
+
+        old_terms, new_terms = analysis.terms(old_tokens), analysis.terms(new_tokens)
+        term_delta = Counter(new_terms)
+        term_delta.subtract(old_terms)
+
+        # n-grams reaching into the region start up to `context` content terms before it
+        context = analysis.ngram_range[1] - 1
+        left, index = [], first - 1
+        while len(left) < context and index >= 0:
+            left = self._chunk_content[index][-(context - len(left)):] + left
+            index -= 1
+        right, index = [], last + 1
+        while len(right) < context and index < len(self._chunk_content):
+            right += self._chunk_content[index][:context - len(right)]
+            index += 1
+        ngram_delta = Counter(word_ngrams(left + analysis.content_terms(new_terms) + right, analysis.ngram_range))
+        ngram_delta.subtract(word_ngrams(left + analysis.content_terms(old_terms) + right, analysis.ngram_range))
+
+        counts_delta, keyword_delta = analysis.term_counts(_nonzero(term_delta), _nonzero(ngram_delta))
+        changed = {key: self._keyword_counts.get(key, 0) + delta for key, delta in keyword_delta.items()}
+        matches = analysis.taxonomy.rematch(self._skill_matches, text, new_text, start, end, new_end)
+        return {
+            'preprocessed': " ".join(chain(chain.from_iterable(self._chunk_tokens[:first]), new_tokens,
+                                           chain.from_iterable(self._chunk_tokens[last + 1:]))),
+            'keywords': self._keywords(changed),
+            'skills': self._skills(matches),
+            'counts_delta': counts_delta,
+        }
+
+    def _rescan(self, new_text, start, end, new_end):
+        """
+        Returns the rule scan of the edited resume.
+        """
+        text = self.resume_text
+        low, high = _snap_to_words(text, max(0, start - STREAM_OVERLAP), min(len(text), end + STREAM_OVERLAP))
+        before = self._engine.scan_stream([text[low:high]])
+        after = self._engine.scan_stream([new_text[low:high + new_end - end]])
+        if before.terms <= after.terms and before.patterns <= after.patterns:
+            base = self._scan
+            return ScanResult(base.terms | after.terms, base.patterns | after.patterns)
+        return self._engine.scan(new_text)
+
+    def update(self, edits):
+        """
+        Analyzes the resume with edits applied.
+
+        Args:
+            edits (list): TextEdits with offsets into resume_text, e.g. keyword_edits
+                output. Edits spread over the resume are handled as one edit of the
+                range they span.
+
+        Returns:
+            AnalysisResult: The analysis of apply_edits(resume_text, edits).
+
+        Raises:
+            ValueError: If edits overlap or fall outside the resume.
+        """
+        if not edits:
+            return self.result
+        start, end, replacement = _merge_edits(self.resume_text, edits)
+        new_end = start + len(replacement)
+        new_text = self.resume_text[:start] + replacement + self.resume_text[end:]
+
+        stages = []
+        with span('incremental_update', chars=end - start + len(replacement)):
+            scan = run_stage(stages, None, 'ats_scan', None, lambda: self._rescan(new_text, start, end, new_end))
+            resume = run_stage(stages, None, 'document_resume', None, lambda: self._document(new_text, start, end, new_end))
+            return self._result(new_text, scan, resume, stages)
+
+    def _result(self, text, scan, resume, stages):
+        analysis = self.analysis
+        engine = self._engine
+        ats_score, ats_feedback = run_stage(stages, None, 'ats', None, lambda: engine.score_results(engine.evaluate_scan(scan)))
+        stages.append({'stage': 'document_jd', 'seconds': 0.0, 'cached': True})
+        similarity_score = run_stage(stages, None, 'similarity', None, lambda: self._pair.score(resume['counts_delta']))
+        gap_result = run_stage(stages, None, 'gaps', None, lambda: analysis.gaps(resume, self.jd))
+        semantic_score = None
+        if analysis.embedder is not None:
+            semantic_score = run_stage(stages, analysis.cache, 'semantic_similarity',
+                                       stage_key('semantic', content_hash(text), content_hash(self.jd_text),
+                                                 analysis.embedder.fingerprint),
+                                       lambda: semantic(text, self.jd_text, analysis.embedder))
+        return AnalysisResult(
+            ats_score=ats_score,
+            ats_feedback=ats_feedback,
+            similarity_score=similarity_score,
+            resume_keywords=resume['keywords'],
+            jd_keywords=self.jd['keywords'],
+            resume_skills=resume['skills'],
+            jd_skills=self.jd['skills'],
+            gaps=gap_result,
+            preprocessed_resume=resume['preprocessed'],
+            preprocessed_jd=self.jd['preprocessed'],
+            stages=stages,
+            semantic_score=semantic_score,
+        )
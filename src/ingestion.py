@@ -0,0 +1,364 @@
+"""
+Bulk ingestion of resume files.
+
+Walks a directory (or reads a manifest of paths), extracts the text of every PDF and
+DOCX file across a pool of worker processes and streams the results to a JSONL file
+or a directory of Parquet parts. Files already present in the sink are skipped, so an
+interrupted run can simply be started again.
+
+    python -m src.ingestion resumes/ --output resumes.jsonl --workers 8 --timeout 30
+"""
+
+import argparse
+import glob
+import json
+import os
+import signal
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from .text_extraction import PDFExtraction, extract_pdf, extract_text_from_docx
+
+EXTRACTORS = {
+    '.pdf': extract_pdf,
+    '.docx': extract_text_from_docx,
+}
+
+class ExtractionTimeout(BaseException):
+    """
+    Raised inside a worker when a single file exceeds its time budget. It is raised
+    from within the extraction libraries, so it derives from BaseException: an
+    `except Exception` there must not swallow it, as the alarm does not fire twice.
+    """
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout()
+
+def _failed_record(path, error, seconds):
+    # The fields of an _extract_worker record, for a file whose worker never returned one
+    return {'path': path, 'backend': None, 'fallback_pages': 0, 'status': 'error',
+            'text': None, 'chars': 0, 'error': error, 'seconds': seconds}
+
+def _extract_worker(path, timeout):
+    """
+    Extracts one file inside a worker process and returns a sink record.
+    The timeout uses SIGALRM, so it is only enforced on platforms that have it.
+    PDF records name the backend that produced the text and count the pages that
+    fell back to layout analysis.
+    """
+    start = time.perf_counter()
+    # Every record has the same fields, as Parquet parts take their schema from the first
+    record = {'path': path, 'backend': None, 'fallback_pages': 0}
+    use_alarm = timeout and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        extractor = EXTRACTORS[os.path.splitext(path)[1].lower()]
+        text = extractor(path)
+        if isinstance(text, PDFExtraction):
+            record.update(backend=text.backend, fallback_pages=sum(text.fallbacks.values()))
+            text = text.text
+        record.update(status='ok', text=text, chars=len(text), error=None)
+    except ExtractionTimeout:
+        record.update(status='timeout', text=None, chars=0, error=f"Timed out after {timeout}s")
+    except Exception as e:
+        record.update(status='error', text=None, chars=0, error=f"{type(e).__name__}: {e}")
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    record['seconds'] = time.perf_counter() - start
+    return record
+
+def iter_input_paths(source=None, manifest=None):
+    """
+    Yields the supported files under a directory, or the paths listed in a manifest
+    (one path per line; blank lines and lines starting with '#' are ignored).
+    """
+    if manifest:
+        with open(manifest, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+        return
+
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in EXTRACTORS:
+                yield os.path.join(root, name)
+
+class JsonlSink:
+    """
+    Appends one JSON record per line and flushes after every record, so at most
+    the line being written is lost on a crash.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def completed_paths(self, retry_errors=False):
+        done = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # A partial line left behind by a crash
+                if record.get('status') == 'ok' or not retry_errors:
+                    done.add(record['path'])
+        return done
+
+    def write(self, record):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if not self._ends_with_newline():
+                # Finish a partial line left by a crash, or the first record would join it
+                self._file.write('\n')
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class ParquetSink:
+    """
+    Writes records to a directory of small Parquet files. Each part file is complete
+    when written, so a crash loses at most the current unflushed batch.
+    Requires pyarrow.
+    """
+
+    def __init__(self, path, batch_size=500):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+        self.path = path
+        self.batch_size = batch_size
+        self._records = []
+        self._run_id = uuid.uuid4().hex[:8]
+        self._part = 0
+        os.makedirs(path, exist_ok=True)
+
+    def completed_paths(self, retry_errors=False):
+        import pyarrow.parquet as pq
+
+        done = set()
+        for part_path in sorted(glob.glob(os.path.join(self.path, '*.parquet'))):
+            table = pq.read_table(part_path, columns=['path', 'status'])
+            for path, status in zip(table.column('path').to_pylist(), table.column('status').to_pylist()):
+                if status == 'ok' or not retry_errors:
+                    done.add(path)
+        return done
+
+    def write(self, record):
+        self._records.append(record)
+        if len(self._records) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._records:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        part_path = os.path.join(self.path, f"part-{self._run_id}-{self._part:05d}.parquet")
+        # Write under a temporary name first so a half-written part is never read back
+        pq.write_table(pa.Table.from_pylist(self._records), part_path + '.tmp')
+        os.replace(part_path + '.tmp', part_path)
+        self._part += 1
+        self._records = []
+
+    def close(self):
+        self._flush()
+
+def open_sink(output):
+    """
+    Chooses a sink from the output path: '.jsonl' for JSON lines, anything else
+    ending in '.parquet' (or an existing directory) for Parquet parts.
+    """
+    if output.endswith('.jsonl'):
+        return JsonlSink(output)
+    if output.endswith('.parquet') or os.path.isdir(output):
+        return ParquetSink(output)
+    raise ValueError(f"Unsupported output format: {output} (use .jsonl or .parquet)")
+
+def summarize(records, elapsed):
+    """
+    Computes throughput and per-file latency percentiles for a finished run.
+    """
+    latencies = np.array([record['seconds'] for record in records]) if records else np.zeros(1)
+    statuses = [record['status'] for record in records]
+    backends = {}
+    for record in records:
+        if record.get('backend'):
+            backends[record['backend']] = backends.get(record['backend'], 0) + 1
+    return {
+        'files': len(records),
+        'ok': statuses.count('ok'),
+        'errors': statuses.count('error'),
+        'timeouts': statuses.count('timeout'),
+        # PDFs per extraction backend, e.g. {'text_stream': 980, 'text_stream+pdfplumber': 20}
+        'backends': backends,
+        'elapsed_seconds': elapsed,
+        'files_per_second': len(records) / elapsed if elapsed > 0 else 0.0,
+        'latency_p50': float(np.percentile(latencies, 50)),
+        'latency_p95': float(np.percentile(latencies, 95)),
+        'latency_p99': float(np.percentile(latencies, 99)),
+    }
+
+def ingest(paths, sink, workers=None, timeout=60, max_pending=None, retry_errors=False, progress=None):
+    """
+    Extracts text from many files across a process pool and streams records to a sink.
+
+    Args:
+        paths (iterable): File paths to extract. Consumed lazily.
+        sink: A JsonlSink or ParquetSink.
+        workers (int, optional): Number of worker processes (default: CPU count).
+        timeout (float): Per-file time budget in seconds; 0 disables it.
+        max_pending (int, optional): Bound on files submitted but not yet written
+            (default: four per worker), which keeps memory flat on huge inputs.
+        retry_errors (bool): Re-extract files that previously failed or timed out.
+        progress (callable, optional): Called with each record as it is written.
+
+    Returns:
+        dict: Throughput and latency statistics for the run.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    done = sink.completed_paths(retry_errors=retry_errors)
+
+    records = []
+    start = time.perf_counter()
+    executor = ProcessPoolExecutor(max_workers=workers)
+    # When a worker dies (e.g. killed for memory or crashed in a PDF library), every
+    # file pending on its pool fails with it. Any of them may be the cause, so each is
+    # extracted again alone in a one-process pool, alongside the rest of the run: only
+    # a file that brings down that pool too is recorded as failed
+    suspects = deque()
+    isolation = None
+    pending = {}    # future -> (path, submit time, executor)
+
+    def replace(broken):
+        nonlocal executor, isolation
+        # Every future pending on a broken pool fails with it; replace the pool once
+        if executor is broken:
+            broken.shutdown(wait=False)
+            executor = ProcessPoolExecutor(max_workers=workers)
+        elif isolation is broken:
+            broken.shutdown(wait=False)
+            isolation = None
+
+    def submit(path):
+        while True:
+            current = executor
+            try:
+                pending[current.submit(_extract_worker, path, timeout)] = (path, time.perf_counter(), current)
+                return
+            except BrokenProcessPool:
+                replace(current)
+
+    def submit_suspect():
+        nonlocal isolation
+        if not suspects or any(pool is isolation for _, _, pool in pending.values()):
+            return
+        if isolation is None:
+            isolation = ProcessPoolExecutor(max_workers=1)
+        path = suspects.popleft()
+        pending[isolation.submit(_extract_worker, path, timeout)] = (path, time.perf_counter(), isolation)
+
+    def drain(return_when):
+        finished, _ = wait(pending, return_when=return_when)
+        for future in finished:
+            path, submitted, future_executor = pending.pop(future)
+            try:
+                record = future.result()
+            except BrokenProcessPool:
+                isolated = future_executor is isolation
+                replace(future_executor)
+                if not isolated:
+                    suspects.append(path)
+                    continue
+                # --retry-errors tries it again on a later run
+                record = _failed_record(path, "Worker process stopped unexpectedly", time.perf_counter() - submitted)
+            sink.write(record)
+            records.append({'status': record['status'], 'seconds': record['seconds'], 'backend': record['backend']})
+            if progress:
+                progress(record)
+
+    try:
+        for path in paths:
+            if path in done:
+                continue
+            submit_suspect()
+            if len(pending) >= max_pending:
+                drain(FIRST_COMPLETED)
+            submit(path)
+        while pending or suspects:
+            submit_suspect()
+            drain(FIRST_COMPLETED)
+    finally:
+        executor.shutdown()
+        if isolation is not None:
+            isolation.shutdown()
+        sink.close()
+
+    return summarize(records, time.perf_counter() - start)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract text from PDF and DOCX resumes in bulk.")
+    parser.add_argument('source', nargs='?', help="Directory to walk for PDF and DOCX files.")
+    parser.add_argument('--manifest', help="File listing one input path per line, instead of a directory.")
+    parser.add_argument('--output', required=True, help="Sink path ending in .jsonl or .parquet.")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument('--timeout', type=float, default=60, help="Per-file timeout in seconds (default: 60, 0 disables).")
+    parser.add_argument('--max-pending', type=int, default=None, help="Maximum files in flight (default: 4 per worker).")
+    parser.add_argument('--retry-errors', action='store_true', help="Retry files that previously failed.")
+    args = parser.parse_args(argv)
+
+    if not args.source and not args.manifest:
+        parser.error("either a source directory or --manifest is required")
+
+    def progress(record):
+        if record['status'] != 'ok':
+            print(f"{record['status']}: {record['path']}: {record['error']}", file=sys.stderr)
+
+    stats = ingest(
+        iter_input_paths(args.source, args.manifest),
+        open_sink(args.output),
+        workers=args.workers,
+        timeout=args.timeout,
+        max_pending=args.max_pending,
+        retry_errors=args.retry_errors,
+        progress=progress,
+    )
+
+    print(f"Processed {stats['files']} files in {stats['elapsed_seconds']:.1f}s "
+          f"({stats['files_per_second']:.1f} files/sec): "
+          f"{stats['ok']} ok, {stats['errors']} errors, {stats['timeouts']} timeouts")
+    print(f"Per-file latency: p50={stats['latency_p50'] * 1000:.0f}ms "
+          f"p95={stats['latency_p95'] * 1000:.0f}ms p99={stats['latency_p99'] * 1000:.0f}ms")
+    if stats['backends']:
+        print("PDF backends: " + ", ".join(f"{name}={count}" for name, count in sorted(stats['backends'].items())))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+"""
+Timing spans and metrics for the analysis pipeline.
+
+Every pipeline stage is wrapped in a span, either with the @instrumented decorator or
+the span() context manager. A finished span is recorded in the process-wide registry,
+which keeps a latency histogram, error counts and input-size totals per stage plus
+a window of recent latencies for p50/p95/p99. The registry renders the Prometheus
+text exposition format (served at /metrics by app/api.py, or written to a file).
+
+Each span is also logged as one JSON object on the 'src.instrumentation' logger at
+INFO level, so enabling that logger turns on structured logs. trace_request groups the
+spans of one request and can add a cProfile and/or tracemalloc capture.
+
+Only the standard library is imported here, so instrumenting a module costs nothing
+at startup.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Recent latencies kept per stage for percentiles
+RESERVOIR_SIZE = 2048
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC_PREFIX = 'resume_optimizer'
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+
+def percentile(sorted_values, q):
+    """
+    Linearly interpolated percentile of sorted values, like numpy's default method.
+    """
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+class Span:
+    """
+    One timed execution of a stage, with size attributes such as pages, chars and tokens.
+    """
+
+    __slots__ = ('stage', 'attributes', 'parent', 'seconds', 'error')
+
+    def __init__(self, stage, attributes=None, parent=None):
+        self.stage = stage
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.seconds = 0.0
+        self.error = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_record(self):
+        return {
+            'stage': self.stage,
+            'seconds': self.seconds,
+            'error': self.error,
+            'parent': self.parent,
+            'attributes': self.attributes,
+        }
+
+class _StageStats:
+
+    def __init__(self, reservoir_size, buckets):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.bucket_counts = [0] * len(buckets)
+        self.recent = deque(maxlen=reservoir_size)
+        self.attribute_totals = {}
+
+class MetricsRegistry:
+    """
+    Thread-safe per-stage latency, error and input-size metrics.
+    """
+
+    def __init__(self, reservoir_size=RESERVOIR_SIZE, buckets=LATENCY_BUCKETS):
+        self.reservoir_size = reservoir_size
+        self.buckets = tuple(buckets)
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, error=None, attributes=None):
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = _StageStats(self.reservoir_size, self.buckets)
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.recent.append(seconds)
+            if error:
+                stats.errors += 1
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    stats.bucket_counts[i] += 1
+                    break
+            for name, value in (attributes or {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    stats.attribute_totals[name] = stats.attribute_totals.get(name, 0) + value
+
+    def record_span(self, record):
+        """
+        Records a span record, e.g. one shipped back from a worker process.
+        """
+        self.record(record['stage'], record['seconds'], record.get('error'), record.get('attributes'))
+
+    def summary(self):
+        """
+        Returns per-stage count, errors, mean and recent p50/p95/p99 latency in seconds.
+        """
+        with self._lock:
+            snapshot = {stage: (stats.count, stats.errors, stats.total_seconds, sorted(stats.recent))
+                        for stage, stats in self._stages.items()}
+        summary = {}
+        for stage, (count, errors, total, recent) in sorted(snapshot.items()):
+            summary[stage] = {
+                'count': count,
+                'errors': errors,
+                'mean': total / count if count else 0.0,
+                'p50': percentile(recent, 0.5),
+                'p95': percentile(recent, 0.95),
+                'p99': percentile(recent, 0.99),
+            }
+        return summary
+
+    def render_prometheus(self):
+        """
+        Renders every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            stages = sorted(
+                (stage, stats.count, stats.errors, stats.total_seconds, list(stats.bucket_counts),
+                 sorted(stats.recent), dict(stats.attribute_totals))
+                for stage, stats in self._stages.items()
+            )
+
+        histogram = f'{METRIC_PREFIX}_stage_seconds'
+        lines = [
+            f'# HELP {histogram} Time spent in each analysis stage.',
+            f'# TYPE {histogram} histogram',
+        ]
+        for stage, count, _, total, bucket_counts, _, _ in stages:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                lines.append(f'{histogram}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{histogram}_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'{histogram}_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'{histogram}_count{{stage="{stage}"}} {count}')
+
+        quantiles = f'{METRIC_PREFIX}_stage_recent_seconds'
+        lines += [
+            f'# HELP {quantiles} Latency quantiles over the most recent {self.reservoir_size} runs of each stage.',
+            f'# TYPE {quantiles} gauge',
+        ]
+        for stage, _, _, _, _, recent, _ in stages:
+            for q in QUANTILES:
+                lines.append(f'{quantiles}{{stage="{stage}",quantile="{q:g}"}} {percentile(recent, q):.6f}')
+
+        errors = f'{METRIC_PREFIX}_stage_errors_total'
+        lines += [f'# HELP {errors} Stage runs that raised an exception.', f'# TYPE {errors} counter']
+        for stage, _, error_count, _, _, _, _ in stages:
+            lines.append(f'{errors}{{stage="{stage}"}} {error_count}')
+
+        inputs = f'{METRIC_PREFIX}_stage_input_total'
+        lines += [f'# HELP {inputs} Input sizes processed by each stage (pages, chars, tokens, ...).', f'# TYPE {inputs} counter']
+        for stage, _, _, _, _, _, totals in stages:
+            for name, value in sorted(totals.items()):
+                lines.append(f'{inputs}{{stage="{stage}",attribute="{name}"}} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """
+        Writes the metrics to a file atomically, e.g. for node_exporter's textfile collector.
+        """
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(temp_path, path)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+registry = MetricsRegistry()
+
+def _log(event, fields):
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(dict({'event': event}, **fields), default=str))
+
+@contextmanager
+def span(stage, **attributes):
+    """
+    Times a block as one run of a stage. Yields the Span, so attributes known only
+    later (e.g. the number of pages) can be added with span.set or annotate().
+    """
+    parent = _current_span.get()
+    current = Span(stage, attributes, parent.stage if parent is not None else None)
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.seconds = time.perf_counter() - start
+        _current_span.reset(token)
+        registry.record(stage, current.seconds, current.error, current.attributes)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.spans.append(current.to_record())
+        _log('span', dict(current.to_record(), request_id=trace.request_id if trace is not None else None))
+
+def annotate(**attributes):
+    """
+    Adds attributes to the innermost active span, if any.
+    """
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attributes)
+
+def instrumented(stage, sizes=None):
+    """
+    Decorator running every call of a function in a span.
+
+    Args:
+        stage (str): The stage name reported in metrics and logs.
+        sizes (callable, optional): Called as sizes(result, *args, **kwargs) after a
+            successful call; returns a dict of size attributes, e.g. {'chars': 1200}.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage) as current:
+                result = func(*args, **kwargs)
+                if sizes is not None:
+                    current.set(**sizes(result, *args, **kwargs))
+                return result
+        return wrapper
+    return decorator
+
+class RequestTrace:
+    """
+    The spans of one request, plus its optional CPU and memory profiles.
+    """
+
+    def __init__(self, request_id=None):
+        self.request_id = request_id
+        self.spans = []
+        self.seconds = 0.0
+        self.cpu_profile = None
+        self.memory_peak_bytes = None
+        self.memory_top = None
+
+    def to_record(self):
+        return {
+            'request_id': self.request_id,
+            'seconds': self.seconds,
+            'spans': self.spans,
+            'cpu_profile': self.cpu_profile,
+            'memory_peak_bytes': self.memory_peak_bytes,
+            'memory_top': self.memory_top,
+        }
+
+@contextmanager
+def trace_request(request_id=None, cpu_profile=False, memory_profile=False, profile_lines=25):
+    """
+    Collects the spans of one request and optionally profiles it.
+
+    Args:
+        request_id (str, optional): Included in every log record of the request.
+        cpu_profile (bool): Capture a cProfile of the calling thread; the top
+            `profile_lines` functions by cumulative time end up in trace.cpu_profile.
+        memory_profile (bool): Trace allocations with tracemalloc; the peak and the
+            top allocation sites end up in trace.memory_peak_bytes and trace.memory_top.
+            tracemalloc is process-wide, so concurrent requests share its numbers.
+    """
+    trace = RequestTrace(request_id)
+    token = _current_trace.set(trace)
+    profiler = None
+    started_tracemalloc = False
+    if cpu_profile:
+        import cProfile
+        profiler = cProfile.Profile()
+    if memory_profile:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracemalloc = True
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield trace
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        trace.seconds = time.perf_counter() - start
+        _current_trace.reset(token)
+
+        if profiler is not None:
+            import io
+            import pstats
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(profile_lines)
+            trace.cpu_profile = stream.getvalue()
+        if memory_profile:
+            trace.memory_peak_bytes = tracemalloc.get_traced_memory()[1]
+            trace.memory_top = [str(stat) for stat in tracemalloc.take_snapshot().statistics('lineno')[:10]]
+            if started_tracemalloc:
+                tracemalloc.stop()
+        _log('request', {'request_id': request_id, 'seconds': trace.seconds, 'stages': len(trace.spans)})
+
+def call_traced(func, args=(), kwargs=None, cpu_profile=False, memory_profile=False):
+    """
+    Calls func inside trace_request, e.g. in a worker process.
+
+    Returns:
+        tuple: (result, trace record) so the caller can merge the spans into its registry.
+    """
+    with trace_request(cpu_profile=cpu_profile, memory_profile=memory_profile) as trace:
+        result = func(*args, **(kwargs or {}))
+    return result, trace.to_record()
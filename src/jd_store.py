@@ -0,0 +1,158 @@
+"""
+A persistent library of job descriptions and their analysis artifacts.
+
+Recruiters analyze many candidates against the same open requisitions. Each job
+description is registered once under an ID of the caller's choosing (a requisition
+number or title) and stored in a local SQLite database together with its
+AnalysisPipeline.document output: the preprocessed text, keywords, skills and term
+counts (the sparse vector the similarity is computed from). Later analyses reference
+the ID and only process the resume.
+
+Artifacts are tagged with the SHA-256 of the text and the analysis settings they were
+computed with (keyword count, corpus model, skill taxonomy). Registering new text under
+an existing ID, or reading it with different settings, recomputes them on the spot.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .result_cache import content_hash
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'resume_optimizer', 'jd_store.sqlite3')
+# Part of every artifact key; bump when the stored document representation changes
+ARTIFACT_VERSION = 1
+
+def artifact_key(text_hash, analysis):
+    """
+    Returns the key that identifies a JD's artifacts under an AnalysisPipeline's settings.
+    """
+    return f"{ARTIFACT_VERSION}:{text_hash}:{analysis.fingerprint}"
+
+def _dump_features(features):
+    # Term counts are keyed by feature index with a corpus model, which JSON objects cannot hold
+    return json.dumps(dict(features, counts=list(features['counts'].items())))
+
+def _load_features(data):
+    features = json.loads(data)
+    features['counts'] = dict(features['counts'])
+    return features
+
+class JDStore:
+    """
+    Job descriptions by ID with their AnalysisPipeline.document artifacts, in SQLite.
+    Safe to share between threads, e.g. across Streamlit sessions.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS job_descriptions ('
+                ' jd_id TEXT PRIMARY KEY, text TEXT NOT NULL, text_hash TEXT NOT NULL,'
+                ' artifact_key TEXT, features TEXT, updated REAL NOT NULL)'
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM job_descriptions').fetchone()[0]
+
+    def __contains__(self, jd_id):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM job_descriptions WHERE jd_id = ?', (jd_id,)).fetchone() is not None
+
+    def ids(self):
+        """
+        Returns the stored JD IDs, most recently registered first.
+        """
+        with self._lock:
+            return [row[0] for row in self._conn.execute('SELECT jd_id FROM job_descriptions ORDER BY updated DESC, jd_id')]
+
+    def put(self, jd_id, text, analysis=None):
+        """
+        Registers a job description, or replaces the text stored under its ID.
+
+        Args:
+            jd_id (str): The ID later analyses refer to.
+            text (str): The extracted job description text.
+            analysis (AnalysisPipeline, optional): Computes the artifacts now. Without
+                it (e.g. in a thin client of the analysis service) only the text is
+                stored and get() computes them on first use.
+
+        Returns:
+            dict: The artifacts (AnalysisPipeline.document output), or None without analysis.
+        """
+        text_hash = content_hash(text)
+        with self._lock:
+            row = self._conn.execute('SELECT text_hash, artifact_key, features FROM job_descriptions WHERE jd_id = ?',
+                                     (jd_id,)).fetchone()
+        if row is not None and row[0] == text_hash:
+            if analysis is None:
+                return None
+            if row[1] == artifact_key(text_hash, analysis):
+                return _load_features(row[2])
+
+        key = features = None
+        if analysis is not None:
+            features = analysis.document(text)
+            key = artifact_key(text_hash, analysis)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO job_descriptions (jd_id, text, text_hash, artifact_key, features, updated)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                (jd_id, text, text_hash, key, _dump_features(features) if features is not None else None, time.time()),
+            )
+        return features
+
+    def text(self, jd_id):
+        """
+        Returns the stored text of a job description.
+
+        Raises:
+            KeyError: If no job description has this ID.
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT text FROM job_descriptions WHERE jd_id = ?', (jd_id,)).fetchone()
+        if row is None:
+            raise KeyError(jd_id)
+        return row[0]
+
+    def get(self, jd_id, analysis):
+        """
+        Returns (text, artifacts) of a job description, recomputing artifacts that are
+        missing or were computed with other analysis settings.
+
+        Raises:
+            KeyError: If no job description has this ID.
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT text, text_hash, artifact_key, features FROM job_descriptions WHERE jd_id = ?',
+                                     (jd_id,)).fetchone()
+        if row is None:
+            raise KeyError(jd_id)
+        text, text_hash, key, data = row
+        expected = artifact_key(text_hash, analysis)
+        if key == expected:
+            return text, _load_features(data)
+
+        features = analysis.document(text)
+        with self._lock, self._conn:
+            # Only if the text was not replaced in the meantime
+            self._conn.execute(
+                'UPDATE job_descriptions SET artifact_key = ?, features = ? WHERE jd_id = ? AND text_hash = ?',
+                (expected, _dump_features(features), jd_id, text_hash),
+            )
+        return text, features
+
+    def delete(self, jd_id):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM job_descriptions WHERE jd_id = ?', (jd_id,))
+
+    def close(self):
+        self._conn.close()
@@ -1,36 +1,136 @@
 
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
 
-def extract_keywords(text, top_n=20):
+from .instrumentation import instrumented
+
+# Surplus candidates taken per row when redundant n-grams are being suppressed
+DEDUPE_CANDIDATE_FACTOR = 3
+
+@instrumented('keyword_extraction', sizes=lambda keywords, text, *args, **kwargs: {'chars': len(text), 'keywords': len(keywords)})
+def extract_keywords(text, top_n=20, model=None, dedupe=False):
     """
     Extracts the top N keywords from a given text using TF-IDF.
 
     Args:
         text (str): The preprocessed text.
         top_n (int): The number of top keywords to return.
+        model (CorpusModel, optional): A fitted corpus model. When given, its
+            vocabulary and corpus-wide IDF weights are used instead of fitting
+            a vectorizer on this single document.
+        dedupe (bool): Drop n-grams that overlap a higher-ranked keyword.
 
     Returns:
         list: A list of the top N keywords.
     """
-    # Create a TF-IDF Vectorizer
-    # We use a corpus of one document, so we only care about term frequency.
-    # The IDF part is not really used here, but this is a convenient way to get scored words.
-    # We will use n-grams to capture multi-word skills
-    tfidf_vectorizer = TfidfVectorizer(ngram_range=(1, 3), stop_words='english')
+    return extract_keywords_batch([text], top_n=top_n, model=model, dedupe=dedupe)[0]
+
+def extract_keywords_batch(texts, top_n=20, model=None, dedupe=False):
+    """
+    Extracts the top N keywords of many documents at once.
+
+    The scores are never densified: each document's non-zero entries are read
+    straight from the sparse CSR matrix and only the top N are partially selected.
+    Ties are broken alphabetically, so the output is deterministic.
+
+    Without a model, each document is scored as a TF-IDF corpus of one, exactly as
+    extract_keywords always did. Every IDF is then equal and the L2 norm only rescales
+    the row, so ranking by raw n-gram counts gives the same keywords; all documents
+    share one tokenization pass through a single CountVectorizer.
+
+    Args:
+        texts (list): Preprocessed texts.
+        top_n (int): The number of top keywords to return per document.
+        model (CorpusModel, optional): A fitted corpus model supplying vocabulary and IDF.
+        dedupe (bool): Suppress redundant overlapping n-grams (e.g. "machine" and
+            "learning" once "machine learning" is selected). Among equal scores,
+            longer n-grams are preferred.
+
+    Returns:
+        list: One keyword list per input text.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
+    if model is not None:
+        matrix = model.transform(texts)
+        feature_name = model.term
+    else:
+        # We will use n-grams to capture multi-word skills
+        count_vectorizer = CountVectorizer(ngram_range=(1, 3), stop_words='english')
+        try:
+            matrix = count_vectorizer.fit_transform(texts).tocsr()
+        except ValueError:
+            # Every document was empty or made only of stop words
+            return [[] for _ in texts]
+        feature_names = count_vectorizer.get_feature_names_out()
+        feature_name = feature_names.__getitem__
 
-    # We expect a list of documents, so we pass the text in a list
-    tfidf_matrix = tfidf_vectorizer.fit_transform([text])
+    candidates_per_row = top_n * DEDUPE_CANDIDATE_FACTOR if dedupe else top_n
+    keywords = []
+    for row in range(matrix.shape[0]):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        scores = matrix.data[start:end]
+        columns = matrix.indices[start:end]
 
-    # Get the feature names (the keywords)
-    feature_names = tfidf_vectorizer.get_feature_names_out()
+        order = _top_candidates(scores, columns, candidates_per_row, feature_name if dedupe else None)
+        if not dedupe:
+            keywords.append([str(feature_name(columns[i])) for i in order])
+            continue
 
-    # Get the tf-idf scores for the single document
-    scores = tfidf_matrix.toarray().flatten()
+        selected = _select_non_overlapping(order, columns, feature_name, top_n)
+        if len(selected) < top_n and len(order) < len(scores):
+            # Too many candidates were redundant; fall back to the whole row
+            order = _top_candidates(scores, columns, len(scores), feature_name)
+            selected = _select_non_overlapping(order, columns, feature_name, top_n)
+        keywords.append(selected)
 
-    # Get the indices of the top N scores
-    top_indices = scores.argsort()[-top_n:][::-1]
+    return keywords
 
-    # Get the top N keywords
-    top_keywords = [feature_names[i] for i in top_indices]
+def _top_candidates(scores, columns, k, feature_name=None):
+    """
+    Returns the positions of the k best entries of one sparse row, best first.
+    With feature_name given, longer n-grams win ties before alphabetical order.
+    """
+    if k <= 0 or not len(scores):
+        return np.zeros(0, dtype=np.int64)
 
-    return top_keywords
+    positions = np.arange(len(scores))
+    if len(scores) > k:
+        # Partial selection of the k-th best score; everything tied with it stays a candidate
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+        positions = positions[scores >= threshold]
+
+    keys = [columns[positions], -scores[positions]]
+    if feature_name is not None:
+        lengths = np.array([str(feature_name(c)).count(' ') for c in columns[positions]])
+        keys.insert(1, -lengths)
+    return positions[np.lexsort(keys)][:k]
+
+def _select_non_overlapping(order, columns, feature_name, top_n):
+    """
+    Greedily keeps the best n-grams, skipping any that contain an already selected
+    keyword or add no word that the selected keywords do not already cover.
+    """
+    selected = []
+    selected_phrases = set()
+    covered_words = set()
+    for i in order:
+        keyword = str(feature_name(columns[i]))
+        tokens = tuple(keyword.split(' '))
+        if covered_words.issuperset(tokens):
+            continue
+        sub_phrases = {
+            tokens[start:end]
+            for start in range(len(tokens))
+            for end in range(start + 1, len(tokens) + 1)
+        }
+        if sub_phrases & selected_phrases:
+            continue
+        selected.append(keyword)
+        selected_phrases.add(tokens)
+        covered_words.update(tokens)
+        if len(selected) == top_n:
+            break
+    return selected
@@ -0,0 +1,217 @@
+"""
+What-if scoring of keyword additions against one or more job descriptions.
+
+Adding a keyword with add_keywords_to_resume only appends a bullet to the Skills list,
+so its effect on the resume's TF-IDF vector is a handful of term counts. The optimizer
+keeps, per job description, the three sums a cosine needs (resume-JD dot product and
+both squared norms) and re-derives them from the changed terms only, instead of
+re-vectorizing the resume. The ATS score is updated the same way: the rule scan of the
+resume is done once and merged with a scan of the added bullets.
+
+Without a corpus model each resume/JD pair is scored as its own two-document TF-IDF
+corpus, exactly like calculate_similarity, so adding a term the JD uses also changes
+that term's IDF; with a model the IDF is fixed. Keywords are counted as the
+preprocessed terms they consist of, so n-grams spanning the edge of the added bullet
+and the 'Skills' heading word of a newly created section are not modelled.
+"""
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+
+from sklearn.feature_extraction.text import CountVectorizer
+
+from .ats_rules import ScanResult, get_rule_engine
+from .resume_updater import plan_keyword_additions
+
+# Documents in a resume/JD pair, for the smoothed IDF of calculate_similarity
+PAIR_DOCUMENTS = 2
+
+@dataclass(frozen=True)
+class KeywordGain:
+    keyword: str
+    # Percentage points of similarity and ATS points gained by adding the keyword
+    similarity_gain: float
+    ats_gain: int
+
+@dataclass(frozen=True)
+class KeywordSelection:
+    keywords: tuple
+    similarity: float
+    ats_score: int
+    similarity_delta: float
+    ats_delta: int
+
+class _PairScore:
+    """
+    The TF-IDF cosine of the resume and one job description, re-evaluated per term.
+    """
+
+    def __init__(self, resume_counts, jd_counts, idf):
+        self.resume_counts = resume_counts
+        self.jd_counts = jd_counts
+        self._idf = idf
+        self.dot = self.resume_norm2 = self.jd_norm2 = 0.0
+        for term in set(resume_counts) | set(jd_counts):
+            dot, resume_norm2, jd_norm2 = self._contribution(term, resume_counts.get(term, 0))
+            self.dot += dot
+            self.resume_norm2 += resume_norm2
+            self.jd_norm2 += jd_norm2
+
+    def _contribution(self, term, resume_count):
+        jd_count = self.jd_counts.get(term, 0)
+        weight = self._idf(term, (resume_count > 0) + (jd_count > 0)) ** 2
+        return resume_count * jd_count * weight, resume_count * resume_count * weight, jd_count * jd_count * weight
+
+    def score(self, added_counts=None):
+        """
+        The similarity (0 to 100) after adding term counts to the resume.
+        """
+        dot, resume_norm2, jd_norm2 = self.dot, self.resume_norm2, self.jd_norm2
+        for term, count in (added_counts or {}).items():
+            resume_count = self.resume_counts.get(term, 0)
+            old = self._contribution(term, resume_count)
+            new = self._contribution(term, resume_count + count)
+            dot += new[0] - old[0]
+            resume_norm2 += new[1] - old[1]
+            jd_norm2 += new[2] - old[2]
+        if resume_norm2 <= 0 or jd_norm2 <= 0:
+            return 0.0
+        return dot / math.sqrt(resume_norm2 * jd_norm2) * 100
+
+class KeywordOptimizer:
+    """
+    Scores keyword additions to one resume against any number of job descriptions.
+
+    Args:
+        resume_text (str): The extracted resume text, as passed to add_keywords_to_resume.
+        preprocessed_resume (str): The same resume after preprocess_text.
+        model (CorpusModel, optional): The corpus model used for similarity, if any.
+        engine (ATSRuleEngine, optional): The ATS rules (default: data/ats_rules.json).
+    """
+
+    def __init__(self, resume_text, preprocessed_resume, model=None, engine=None):
+        self.resume_text = resume_text
+        self.model = model
+        self.engine = engine or get_rule_engine()
+        if model is None:
+            self._analyzer = CountVectorizer().build_analyzer()
+        self._resume_counts = self._count(preprocessed_resume)
+        self._term_counts = {}
+        self._jobs = {}
+        self._base_scan = self.engine.scan(resume_text)
+        self.base_ats_score = self.engine.score_results(self.engine.evaluate_scan(self._base_scan))[0]
+
+    def _count(self, text):
+        if self.model is not None:
+            return self.model.term_counts(text)
+        return dict(Counter(self._analyzer(text)))
+
+    def _idf(self, term, document_frequency):
+        if self.model is not None:
+            return float(self.model.idf[term])
+        # TfidfVectorizer's smoothed IDF over the resume/JD pair
+        return math.log((1 + PAIR_DOCUMENTS) / (1 + document_frequency)) + 1
+
+    def _keyword_counts(self, keyword):
+        counts = self._term_counts.get(keyword)
+        if counts is None:
+            counts = self._term_counts[keyword] = self._count(keyword)
+        return counts
+
+    def add_job(self, name, preprocessed_jd, candidates):
+        """
+        Registers a job description and the keywords that may be added for it,
+        typically its gap analysis' missing_keywords.
+        """
+        self._jobs[name] = (_PairScore(self._resume_counts, self._count(preprocessed_jd), self._idf), list(candidates))
+
+    @property
+    def jobs(self):
+        return list(self._jobs)
+
+    def candidates(self, job):
+        return list(self._jobs[job][1])
+
+    def _added(self, keywords):
+        """
+        Returns (added term counts, added text) of adding keywords with add_keywords_to_resume.
+        """
+        if not keywords:
+            return Counter(), ''
+        _, added_keywords, added_text = plan_keyword_additions(self.resume_text, keywords)
+        counts = Counter()
+        for keyword in added_keywords:
+            counts.update(self._keyword_counts(keyword))
+        return counts, added_text
+
+    def _ats_score(self, added_text):
+        if not added_text:
+            return self.base_ats_score
+        added = self.engine.scan(added_text)
+        base = self._base_scan
+        merged = ScanResult(base.terms | added.terms, base.patterns | added.patterns)
+        return self.engine.score_results(self.engine.evaluate_scan(merged))[0]
+
+    def similarity(self, job, keywords=()):
+        """
+        The resume's similarity (0 to 100) to a job description after adding keywords.
+        """
+        return self._jobs[job][0].score(self._added(keywords)[0])
+
+    def evaluate(self, job, keywords=()):
+        """
+        Scores a set of keywords against one job description.
+
+        Returns:
+            KeywordSelection: The resulting similarity and ATS score, and their change.
+        """
+        pair = self._jobs[job][0]
+        counts, added_text = self._added(keywords)
+        similarity = pair.score(counts)
+        ats_score = self._ats_score(added_text)
+        return KeywordSelection(tuple(sorted(set(keywords))), similarity, ats_score,
+                                similarity - pair.score(), ats_score - self.base_ats_score)
+
+    def marginal_gains(self, job, selected=(), candidates=None):
+        """
+        The gain of adding each candidate on top of the selected keywords.
+
+        Returns:
+            list: KeywordGain per candidate not yet selected, best first.
+        """
+        selected = set(selected)
+        current = self.evaluate(job, selected)
+        gains = []
+        for keyword in (self.candidates(job) if candidates is None else candidates):
+            if keyword in selected:
+                continue
+            result = self.evaluate(job, selected | {keyword})
+            gains.append(KeywordGain(keyword, result.similarity - current.similarity, result.ats_score - current.ats_score))
+        gains.sort(key=lambda gain: (-gain.similarity_gain, -gain.ats_gain, gain.keyword))
+        return gains
+
+    def best_keywords(self, job, k, candidates=None):
+        """
+        Greedily picks up to k keywords, each time the one with the largest similarity
+        gain (then ATS gain). Stops early once no candidate improves either score.
+
+        Returns:
+            KeywordSelection: The chosen keywords and their combined effect.
+        """
+        selected = set()
+        for _ in range(k):
+            gains = self.marginal_gains(job, selected, candidates)
+            if not gains or (gains[0].similarity_gain <= 0 and gains[0].ats_gain <= 0):
+                break
+            selected.add(gains[0].keyword)
+        return self.evaluate(job, selected)
+
+    def best_keywords_per_job(self, k):
+        """
+        Runs best_keywords for every registered job description.
+
+        Returns:
+            dict: Job name to its KeywordSelection.
+        """
+        return {job: self.best_keywords(job, k) for job in self._jobs}
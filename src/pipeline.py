@@ -0,0 +1,170 @@
+"""
+The resume analysis pipeline as plain, picklable functions.
+
+Every stage takes and returns built-in types only, so the same functions run in the
+Streamlit process, in the API service's worker processes (see app/api.py) or in any
+other executor. A worker process calls init_worker once to load the corpus model and
+the NLTK corpora, instead of paying for them on every request.
+"""
+
+import time
+
+# PDFs are extracted page by page under these limits, so an oversized upload
+# (e.g. a 200-page portfolio) cannot exhaust memory or block a worker.
+DEFAULT_EXTRACTION_LIMITS = {'max_pages': 20, 'max_chars': 100_000, 'time_limit': 20}
+
+_worker_model = None
+
+class ExtractionError(ValueError):
+    """
+    Raised by extract when the bytes are not a readable document of their type,
+    e.g. a truncated PDF or a DOCX that is not a zip archive.
+    """
+
+def init_worker(corpus_model_path=None):
+    """
+    Process pool initializer: loads the shared state every stage needs up front
+    (corpus model, skill taxonomy and NLTK corpora).
+
+    Args:
+        corpus_model_path (str, optional): A corpus model written by src.corpus_model.
+            When given, it is memory-mapped once and used by every stage of this process.
+    """
+    global _worker_model
+    from .skill_taxonomy import get_taxonomy
+    from .text_preprocessing import MissingNLTKDataError, warmup
+
+    if corpus_model_path:
+        from .corpus_model import load_corpus_model
+        _worker_model = load_corpus_model(corpus_model_path)
+    get_taxonomy()
+    try:
+        warmup()
+    except MissingNLTKDataError:
+        # Keep the worker alive; the requests that need the corpora report the error
+        pass
+
+def _model(model):
+    return model if model is not None else _worker_model
+
+def extract(data, suffix, extract_options=None):
+    """
+    Extracts text from the bytes of a PDF or DOCX file.
+
+    Raises:
+        ExtractionError: If the file is malformed.
+        ValueError: If the suffix is not a supported format.
+    """
+    import zipfile
+    from xml.etree.ElementTree import ParseError
+
+    from pdfminer.psexceptions import PSException
+    from pdfplumber.utils.exceptions import PdfminerException
+
+    from .text_extraction import extract_text_from_bytes
+
+    try:
+        return extract_text_from_bytes(data, suffix, **(extract_options or {}))
+    except (PSException, PdfminerException, zipfile.BadZipFile, ParseError) as e:
+        raise ExtractionError(f"Could not read the {suffix.lstrip('.').upper()} file: {e}") from e
+    except KeyError as e:
+        # docx2txt looks up the document part of the archive by name
+        if suffix.lower() != '.docx':
+            raise
+        raise ExtractionError(f"Could not read the DOCX file: {e}") from e
+
+def preprocess(text):
+    from .text_preprocessing import preprocess_text
+
+    return preprocess_text(text)
+
+def keywords(preprocessed_text, top_n=20, model=None):
+    from .keyword_extraction import extract_keywords
+
+    return extract_keywords(preprocessed_text, top_n=top_n, model=_model(model))
+
+def similarity(preprocessed_resume, preprocessed_jd, model=None):
+    from .similarity_scoring import calculate_similarity
+
+    return float(calculate_similarity(preprocessed_resume, preprocessed_jd, model=_model(model)))
+
+def semantic(resume_text, jd_text, embedder):
+    from .semantic_similarity import semantic_similarity
+
+    return float(semantic_similarity(resume_text, jd_text, embedder))
+
+def ats(resume_text):
+    """
+    Returns:
+        dict: {'score': int, 'feedback': list of str}
+    """
+    from .ats_scoring import calculate_ats_score
+
+    score, feedback = calculate_ats_score(resume_text)
+    return {'score': score, 'feedback': feedback}
+
+def skills(text):
+    """
+    Returns:
+        list: The canonical IDs of the taxonomy skills the extracted text mentions.
+    """
+    from .skill_taxonomy import get_taxonomy
+
+    return get_taxonomy().find_skills(text)
+
+def gaps(resume_keywords, jd_keywords, resume_skills=None, jd_skills=None):
+    """
+    Returns:
+        dict: analyze_gaps output plus the matching 'explanations'.
+    """
+    from .gap_analysis import analyze_gaps
+    from .explainability import generate_explanations
+
+    result = analyze_gaps(resume_keywords, jd_keywords, resume_skills, jd_skills)
+    result['explanations'] = generate_explanations(result)
+    return result
+
+def _model_key(model):
+    return model.fingerprint if model is not None else 'none'
+
+def run_stage(stages, cache, name, key, compute):
+    """
+    Runs one stage through the cache, if any, and records its timing in stages.
+    """
+    start = time.perf_counter()
+    if cache is not None:
+        value, cached = cache.get_or_compute(key, compute)
+    else:
+        value, cached = compute(), False
+    stages.append({'stage': name, 'seconds': time.perf_counter() - start, 'cached': cached})
+    return value
+
+def run_analysis(resume_text, jd_text, top_n=20, model=None, cache=None, embedder=None, jd=None):
+    """
+    Runs the whole analysis on extracted resume and job description text, as
+    AnalysisPipeline.analyze does (each document is tokenized once).
+
+    Args:
+        resume_text (str): The extracted resume text.
+        jd_text (str): The extracted job description text.
+        top_n (int): The number of keywords to extract from each document.
+        model (CorpusModel, optional): A corpus model (default: the worker's model, if any).
+        cache (ResultCache, optional): Serves stages already computed for the same
+            content, e.g. on a rerun or for the same resume against another JD.
+        embedder (optional): An embedder from semantic_similarity. When given, the
+            result also has a 'semantic_score' computed on the extracted texts.
+        jd (dict, optional): The job description's AnalysisPipeline.document output
+            under the same settings, e.g. from a JDStore, so only the resume is processed.
+
+    Returns:
+        dict: 'ats_score', 'ats_feedback', 'similarity_score', 'resume_keywords',
+        'jd_keywords', 'resume_skills' and 'jd_skills' (canonical skill IDs), 'gaps'
+        (as returned by gaps()), 'preprocessed_resume' and 'preprocessed_jd' (for
+        keyword_optimizer's what-if scoring), 'semantic_score' (only with an embedder)
+        and 'stages', one {'stage', 'seconds', 'cached'} record per stage in
+        execution order.
+    """
+    from .analysis_pipeline import AnalysisPipeline
+
+    pipeline = AnalysisPipeline(top_n, _model(model), cache=cache, embedder=embedder)
+    return pipeline.analyze(resume_text, jd_text, jd).to_dict()
@@ -0,0 +1,95 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+def fit_vectorizer(corpus):
+    """
+    Fits a TF-IDF vectorizer once over a corpus of preprocessed documents.
+
+    Args:
+        corpus (iterable): Preprocessed resume and job description texts.
+
+    Returns:
+        TfidfVectorizer: The fitted vectorizer. Its rows are L2-normalized,
+        so the dot product of two transformed documents is their cosine similarity.
+    """
+    tfidf_vectorizer = TfidfVectorizer()
+    tfidf_vectorizer.fit(corpus)
+    return tfidf_vectorizer
+
+def _split_resumes(resumes):
+    """
+    Accepts either a mapping of resume IDs to texts or a plain sequence of texts.
+    Sequence positions are used as IDs in the latter case.
+    """
+    if hasattr(resumes, 'keys'):
+        resume_ids = list(resumes.keys())
+        resume_texts = [resumes[resume_id] for resume_id in resume_ids]
+    else:
+        resume_texts = list(resumes)
+        resume_ids = list(range(len(resume_texts)))
+    return resume_ids, resume_texts
+
+def score_matrix(jd_texts, resume_texts, vectorizer=None):
+    """
+    Scores many job descriptions against many resumes as one sparse matrix product.
+
+    Args:
+        jd_texts (list): Preprocessed job description texts.
+        resume_texts (list): Preprocessed resume texts.
+        vectorizer (TfidfVectorizer, optional): A vectorizer already fitted on a
+            reference corpus. If omitted, one is fitted over the given documents.
+
+    Returns:
+        numpy.ndarray: A (len(jd_texts), len(resume_texts)) array of similarity
+        scores between 0 and 100.
+    """
+    jd_texts = list(jd_texts)
+    resume_texts = list(resume_texts)
+
+    if vectorizer is None:
+        vectorizer = fit_vectorizer(resume_texts + jd_texts)
+
+    # One sparse matrix per side; the vectorizer L2-normalizes every row
+    resume_matrix = vectorizer.transform(resume_texts)
+    jd_matrix = vectorizer.transform(jd_texts)
+
+    # Cosine similarity of normalized rows is a plain sparse product
+    similarity = (jd_matrix @ resume_matrix.T).toarray()
+
+    return similarity * 100
+
+def rank_resumes(jd_text, resumes, vectorizer=None, top_n=None):
+    """
+    Ranks a pool of resumes against a single job description.
+
+    Args:
+        jd_text (str): The preprocessed job description text.
+        resumes (dict or list): Preprocessed resume texts, either keyed by resume ID
+            or as a list (list positions are then used as IDs).
+        vectorizer (TfidfVectorizer, optional): A vectorizer already fitted on a
+            reference corpus. If omitted, one is fitted over the job description and
+            all resumes, so the IDF reflects the whole applicant pool.
+        top_n (int, optional): Only return the N best matches.
+
+    Returns:
+        list: (resume_id, score) tuples sorted by descending score (0 to 100).
+    """
+    resume_ids, resume_texts = _split_resumes(resumes)
+    if not resume_texts:
+        return []
+
+    if vectorizer is None:
+        vectorizer = fit_vectorizer(resume_texts + [jd_text])
+
+    resume_matrix = vectorizer.transform(resume_texts)
+    jd_vector = vectorizer.transform([jd_text])
+
+    # A single sparse matrix-vector product scores the whole pool
+    scores = np.asarray((resume_matrix @ jd_vector.T).todense()).ravel() * 100
+
+    # Stable sort keeps the input order among equal scores
+    order = np.argsort(-scores, kind='stable')
+    if top_n is not None:
+        order = order[:top_n]
+
+    return [(resume_ids[i], float(scores[i])) for i in order]
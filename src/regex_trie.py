@@ -0,0 +1,31 @@
+"""
+Compiles a list of literal terms into one trie-shaped regex alternation.
+
+A flat alternation retries every term at every position; sharing prefixes lets the
+regex engine reject most positions after one character, which keeps the scan cost
+close to flat as the number of terms grows.
+"""
+
+import re
+
+def build_trie(terms):
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return trie
+
+def trie_pattern(node):
+    """
+    Renders a character trie as a regex alternation. Longer continuations are
+    optional-greedy, so the longest term at a position is preferred.
+    """
+    alternatives = [re.escape(char) + trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not alternatives:
+        return ''
+    is_end = '' in node
+    if len(alternatives) == 1 and not is_end:
+        return alternatives[0]
+    return '(?:' + '|'.join(alternatives) + ')' + ('?' if is_end else '')
@@ -0,0 +1,145 @@
+"""
+Renders resumes to PDF and DOCX bytes.
+
+The professional template is laid out once per resume (see resume_template.template_blocks)
+and every requested format is rendered from the same blocks. The reportlab style sheet
+and a blank DOCX skeleton are built once per process, and documents are written to
+in-memory buffers, so concurrent sessions never share an output file.
+
+render_batch spreads a batch of resumes over worker processes, e.g. to regenerate every
+tailored resume after a template change.
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from docx import Document
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+from .instrumentation import instrumented
+from .resume_template import template_blocks
+
+FORMATS = ('pdf', 'docx')
+MIME_TYPES = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+# Below this many resumes a batch renders in the calling process; starting workers costs more
+MIN_PARALLEL_BATCH = 4
+
+@lru_cache(maxsize=None)
+def _pdf_styles():
+    return getSampleStyleSheet()
+
+@lru_cache(maxsize=None)
+def _docx_skeleton():
+    """
+    A blank document from python-docx's default template, serialized once. Opening it
+    from memory skips locating and reading the template file on every render.
+    """
+    buffer = io.BytesIO()
+    Document().save(buffer)
+    return buffer.getvalue()
+
+def _blocks_size(result, blocks, *args, **kwargs):
+    return {'chars': sum(len(text) for _, text in blocks)}
+
+@instrumented('pdf_generation', sizes=_blocks_size)
+def render_pdf_blocks(blocks):
+    """
+    Renders template blocks to PDF bytes.
+    """
+    styles = _pdf_styles()
+    story = []
+    for tag, text in blocks:
+        # Paragraph parses its text as markup, so resume text must be escaped
+        text = escape(text)
+        if tag == 'h1':
+            story.append(Paragraph(text, styles['h1']))
+        elif tag == 'h2':
+            story.append(Paragraph(text, styles['h2']))
+        elif tag == 'li':
+            story.append(Paragraph(f"• {text}", styles['Normal']))
+        else:
+            story.append(Paragraph(text, styles['Normal']))
+        story.append(Spacer(1, 0.1 * inch))
+
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=letter).build(story)
+    return buffer.getvalue()
+
+@instrumented('docx_generation', sizes=_blocks_size)
+def render_docx_blocks(blocks):
+    """
+    Renders template blocks to DOCX bytes.
+    """
+    document = Document(io.BytesIO(_docx_skeleton()))
+    for tag, text in blocks:
+        if tag == 'h1':
+            document.add_heading(text, level=1)
+        elif tag == 'h2':
+            document.add_heading(text, level=2)
+        elif tag == 'li':
+            document.add_paragraph(text, style='List Bullet')
+        else:
+            document.add_paragraph(text)
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+_RENDERERS = {'pdf': render_pdf_blocks, 'docx': render_docx_blocks}
+
+def render(resume_text, formats=FORMATS):
+    """
+    Renders a resume in one or more formats from a single template layout.
+
+    Args:
+        resume_text (str): The resume text.
+        formats (iterable): Any of 'pdf' and 'docx'.
+
+    Returns:
+        dict: The document bytes per format.
+    """
+    unknown = [f for f in formats if f not in _RENDERERS]
+    if unknown:
+        raise ValueError(f"Unsupported output format: {', '.join(unknown)}")
+    blocks = template_blocks(resume_text)
+    return {f: _RENDERERS[f](blocks) for f in formats}
+
+def render_pdf(resume_text):
+    return render(resume_text, ('pdf',))['pdf']
+
+def render_docx(resume_text):
+    return render(resume_text, ('docx',))['docx']
+
+def render_batch(resume_texts, formats=FORMATS, workers=None):
+    """
+    Renders many resumes, in worker processes when the batch is large enough.
+
+    Args:
+        resume_texts (iterable): The resume texts.
+        formats (iterable): Any of 'pdf' and 'docx'.
+        workers (int, optional): Worker processes (default: CPU count); 1 renders in
+            the calling process.
+
+    Returns:
+        list: One dict of document bytes per format for each resume, in input order.
+    """
+    resume_texts = list(resume_texts)
+    formats = tuple(formats)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(resume_texts) < MIN_PARALLEL_BATCH:
+        return [render(text, formats) for text in resume_texts]
+
+    # A few chunks per worker balances uneven resume lengths without much pickling overhead
+    chunksize = max(1, len(resume_texts) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(render, resume_texts, [formats] * len(resume_texts), chunksize=chunksize))
@@ -0,0 +1,125 @@
+"""
+In-memory cache of analysis pipeline stage outputs.
+
+Each entry is keyed by a stage name and content hashes of that stage's inputs (see
+stage_key), so a stage computed once for a resume/job description pair is reused by
+every later rerun and session that sees the same content. Entries expire after a TTL,
+and least recently used entries are evicted once their approximate size exceeds a
+memory budget.
+"""
+
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 60 * 60
+
+def content_hash(text):
+    """
+    Returns the SHA-256 hex digest of a text or byte string.
+    """
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return hashlib.sha256(text).hexdigest()
+
+def stage_key(stage, *parts):
+    """
+    Builds the cache key of a stage from the hashes and options that determine its output.
+    """
+    return stage + ':' + ':'.join(str(part) for part in parts)
+
+def _approximate_size(value):
+    """
+    Estimates the memory held by a stage output made of built-in containers.
+    """
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_approximate_size(k) + _approximate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_approximate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+class ResultCache:
+    """
+    A thread-safe LRU cache with a TTL and a memory budget.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()   # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for a key, or default if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= self._clock():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value):
+        """
+        Stores a value, then evicts least recently used entries over the budget.
+        Values larger than the whole budget are not stored.
+        """
+        size = _approximate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size, self._clock() + self.ttl)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns (value, was_cached), calling compute() and storing its result on a miss.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value, True
+        value = compute()
+        self.put(key, value)
+        return value, False
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,216 @@
+"""
+Single-pass resume section parser.
+
+parse_resume scans the text line by line once, finds the section headings (Summary,
+Skills, Experience, Education, Projects and their common variants) and returns a
+ParsedResume with the header, contact details, skills list, experience entries and
+education, each with character offsets into the original text. The template and the
+keyword updater both read the same ParsedResume, and recent results are cached, so a
+document is segmented once however many of them use it.
+
+Headings are matched as literal words, so the scan is linear in the text length even
+on long unbroken text such as whitespace-normalized PDF extractions.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .regex_trie import build_trie, trie_pattern
+
+# Heading variants per section kind; a longer variant wins where both match
+SECTION_HEADINGS = {
+    'summary': ('professional summary', 'summary', 'objective', 'profile'),
+    'skills': ('technical skills', 'core competencies', 'skills', 'proficiencies'),
+    'experience': ('professional experience', 'work experience', 'experience', 'work history', 'employment'),
+    'education': ('academic background', 'education'),
+    'projects': ('projects',),
+    'certifications': ('certifications', 'certificates', 'licenses'),
+}
+
+# A line this short that ends with a heading is a heading, e.g. 'Selected Projects'
+MAX_HEADING_WORDS = 4
+
+PARSE_CACHE_SIZE = 64
+
+NAME_PATTERN = re.compile(r'([A-ZÀ-ÖØ-Þ][a-zß-öø-ÿ]+)\s+([A-ZÀ-ÖØ-Þ][a-zß-öø-ÿ]+)')
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+# Heading text, casefolded with single spaces, to its section kind
+HEADING_KINDS = {heading: kind for kind, headings in SECTION_HEADINGS.items() for heading in headings}
+
+def _heading_regex(headings):
+    # Spaces inside a heading match any whitespace
+    return trie_pattern(build_trie(headings)).replace(r'\ ', r'\s+')
+
+# One trie-shaped alternation of every variant, so most positions fail on their first character
+HEADING_PATTERN = re.compile(r'\b' + _heading_regex(HEADING_KINDS) + r'\b', re.IGNORECASE)
+KIND_PATTERNS = {kind: re.compile(_heading_regex(headings), re.IGNORECASE) for kind, headings in SECTION_HEADINGS.items()}
+SKILL_SEPARATOR = re.compile(r'[\n,;•]')
+ENTRY_SEPARATOR = re.compile(r'\n[ \t]*\r?\n')
+
+_WHITESPACE = ' \t\r\n'
+_HEADING_PUNCTUATION = _WHITESPACE + ':'
+_BULLETS = _WHITESPACE + '-*•·'
+
+# How confidently a match is a heading; lower is better
+_OWN_LINE = 0
+_LINE_START = 1
+_INLINE = 2
+
+@dataclass(frozen=True)
+class TextSpan:
+    text: str
+    start: int
+    end: int
+
+@dataclass(frozen=True)
+class Section:
+    kind: str
+    heading: TextSpan
+    body: TextSpan
+    # Whether the heading starts its line, as opposed to a fallback match inside prose
+    line_start: bool
+
+    @property
+    def start(self):
+        return self.heading.start
+
+    @property
+    def end(self):
+        return self.body.end
+
+@dataclass(frozen=True)
+class ParsedResume:
+    """
+    The sections and contact details of a resume, with offsets into `text`.
+
+    `sections` holds at most one Section per kind, in document order.
+    """
+    text: str
+    header: TextSpan
+    # Contact details and name; None when not found
+    name: TextSpan
+    email: TextSpan
+    phone: TextSpan
+    sections: tuple
+
+    def section(self, kind):
+        for section in self.sections:
+            if section.kind == kind:
+                return section
+        return None
+
+    @property
+    def summary(self):
+        section = self.section('summary')
+        return section.body if section is not None else None
+
+    @property
+    def skills(self):
+        """
+        The skills as separate items, split on lines, commas and semicolons.
+        """
+        section = self.section('skills')
+        return _split(self.text, section.body, SKILL_SEPARATOR, _BULLETS) if section is not None else ()
+
+    @property
+    def experience(self):
+        """
+        The experience entries, split on blank lines.
+        """
+        section = self.section('experience')
+        return _split(self.text, section.body, ENTRY_SEPARATOR, _WHITESPACE) if section is not None else ()
+
+    @property
+    def education(self):
+        section = self.section('education')
+        return section.body if section is not None else None
+
+def _trim(text, start, end, chars=_WHITESPACE):
+    while start < end and text[start] in chars:
+        start += 1
+    while end > start and text[end - 1] in chars:
+        end -= 1
+    return TextSpan(text[start:end], start, end)
+
+def _split(text, span, separator, strip_chars):
+    items = []
+    position = span.start
+    for match in separator.finditer(span.text):
+        items.append(_trim(text, position, span.start + match.start(), strip_chars))
+        position = span.start + match.end()
+    items.append(_trim(text, position, span.end, strip_chars))
+    return tuple(item for item in items if item.text)
+
+def _match(pattern, text):
+    match = pattern.search(text)
+    return TextSpan(match.group(0), match.start(), match.end()) if match else None
+
+def _kind(match):
+    heading = match.group(0)
+    kind = HEADING_KINDS.get(' '.join(heading.casefold().split()))
+    if kind is None:
+        # Case-insensitive matching accepts a few characters (e.g. a dotted capital I)
+        # that casefold() does not map back to the heading
+        kind = next(kind for kind, pattern in KIND_PATTERNS.items() if pattern.fullmatch(heading))
+    return kind
+
+def _classify_heading(line, match):
+    """
+    Returns (rank, start) of a heading match within its line. A short line ending in
+    the heading is taken whole, so 'Selected Projects' starts at 'Selected'.
+    """
+    rest = line[match.end():].strip()
+    if line[:match.start()].strip(_BULLETS):
+        if rest in ('', ':') and len(line.split()) <= MAX_HEADING_WORDS:
+            return _OWN_LINE, len(line) - len(line.lstrip(_BULLETS))
+        return _INLINE, match.start()
+    return (_OWN_LINE if not rest or rest.startswith(':') else _LINE_START), match.start()
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_resume(text):
+    """
+    Segments a resume into its sections in one line-by-line scan.
+
+    For each kind the heading on a line of its own is preferred, then one starting
+    a line, then the first occurrence anywhere (extracted PDF text has no line
+    breaks). Each section runs until the next chosen heading.
+
+    Args:
+        text (str): The resume text.
+
+    Returns:
+        ParsedResume: The parsed resume. Results are cached and shared, so treat them as read-only.
+    """
+    best = {}
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        for match in HEADING_PATTERN.finditer(line):
+            kind = _kind(match)
+            rank, start = _classify_heading(line, match)
+            if kind not in best or rank < best[kind][0]:
+                best[kind] = (rank, offset + start, offset + match.end())
+        offset += len(line)
+
+    chosen = sorted((start, end, kind, rank) for kind, (rank, start, end) in best.items())
+    sections = []
+    for i, (start, end, kind, rank) in enumerate(chosen):
+        body_end = chosen[i + 1][0] if i + 1 < len(chosen) else len(text)
+        sections.append(Section(
+            kind,
+            TextSpan(text[start:end], start, end),
+            _trim(text, end, body_end, _HEADING_PUNCTUATION),
+            rank != _INLINE,
+        ))
+
+    header = _trim(text, 0, chosen[0][0] if chosen else len(text))
+    name = _match(NAME_PATTERN, header.text)
+    return ParsedResume(
+        text=text,
+        header=header,
+        name=TextSpan(name.text, header.start + name.start, header.start + name.end) if name else _match(NAME_PATTERN, text),
+        email=_match(EMAIL_PATTERN, text),
+        phone=_match(PHONE_PATTERN, text),
+        sections=tuple(sections),
+    )
@@ -1,27 +1,58 @@
 import re
-import pdfplumber
+from dataclasses import dataclass
 
-def add_keywords_to_resume(resume_text, keywords_to_add):
+from .instrumentation import instrumented
+from .resume_parser import ENTRY_SEPARATOR, parse_resume
+
+SKILL_TOKEN_PATTERN = re.compile(r'[\w\+\#\.]+')
+
+@dataclass(frozen=True)
+class TextEdit:
+    # Replaces text[start:end] with `text`; an insertion has start == end
+    start: int
+    end: int
+    text: str
+
+def apply_edits(text, edits):
     """
-    Adds keywords as bullet points under the Skills section.
-    If Skills section does not exist, it creates one.
+    Applies edits whose offsets refer to the original text.
+
+    Raises:
+        ValueError: If edits overlap or fall outside the text.
     """
+    parts = []
+    position = 0
+    for edit in sorted(edits, key=lambda edit: (edit.start, edit.end)):
+        if edit.start < position or edit.end < edit.start or edit.end > len(text):
+            raise ValueError(f"Invalid or overlapping edit: {edit.start}-{edit.end}")
+        parts.append(text[position:edit.start])
+        parts.append(edit.text)
+        position = edit.end
+    parts.append(text[position:])
+    return ''.join(parts)
 
-    keywords_to_add = sorted(set(keywords_to_add))
+def plan_keyword_additions(resume_text, keywords_to_add):
+    """
+    Works out what add_keywords_to_resume would insert, without building the new text.
 
-    # Regex to capture full Skills section
-    skills_pattern = re.compile(
-        r'(?is)(skills|technical skills|proficiencies)\s*\n(.*?)(\n\n|$)'
-    )
+    Returns:
+        tuple: (insert_at, added_keywords, added_text). insert_at is the offset the text
+        goes in at, or None when a new Skills section is appended; added_keywords are the
+        keywords not already listed, in the order they are added.
+    """
+    keywords_to_add = sorted(set(keywords_to_add))
 
-    match = skills_pattern.search(resume_text)
+    # Only a heading that starts its line counts; 'skills' inside a sentence is not a section
+    skills_section = parse_resume(resume_text).section('skills')
 
-    if match:
-        skills_title = match.group(1)
-        existing_skills_block = match.group(2)
+    if skills_section is not None and skills_section.line_start:
+        # The list ends at the first blank line; anything after it may be an unrecognized section
+        body = skills_section.body
+        blank_line = ENTRY_SEPARATOR.search(body.text)
+        skills_block = body.text[:blank_line.start()].rstrip() if blank_line else body.text
 
         # Extract existing skills (bullets or commas)
-        existing_skills = re.findall(r'[\w\+\#\.]+', existing_skills_block.lower())
+        existing_skills = set(SKILL_TOKEN_PATTERN.findall(skills_block.lower()))
 
         # Filter new keywords
         new_skills = [
@@ -29,23 +60,36 @@ def add_keywords_to_resume(resume_text, keywords_to_add):
             if skill.lower() not in existing_skills
         ]
 
-        if not new_skills:
-            return resume_text  # nothing to add
-
         # Convert to bullet format
-        new_skills_text = "\n" + "\n".join(f"- {skill}" for skill in new_skills)
+        new_skills_text = "".join(f"\n- {skill}" for skill in new_skills)
+        return body.start + len(skills_block), new_skills, new_skills_text
+
+    # Create a new Skills section
+    return None, keywords_to_add, "\n\nSkills\n" + "\n".join(f"- {k}" for k in keywords_to_add)
 
-        updated_skills_block = existing_skills_block.rstrip() + new_skills_text
+def keyword_edits(resume_text, keywords_to_add):
+    """
+    Returns the edits add_keywords_to_resume makes, as a list of TextEdit (empty when
+    every keyword is already listed).
+    """
+    insert_at, added_keywords, added_text = plan_keyword_additions(resume_text, keywords_to_add)
 
-        updated_resume = (
-            resume_text[:match.start(2)] +
-            updated_skills_block +
-            resume_text[match.end(2):]
-        )
+    if insert_at is None:
+        return [TextEdit(len(resume_text), len(resume_text), added_text)]
+    if not added_keywords:
+        return []  # nothing to add
 
-        return updated_resume
+    rest = resume_text[insert_at:]
+    # Keep whatever follows the section (usually the next heading) on its own line
+    if rest and not rest.startswith('\n'):
+        indent = len(rest) - len(rest.lstrip(' \t'))
+        return [TextEdit(insert_at, insert_at + indent, added_text + '\n')]
+    return [TextEdit(insert_at, insert_at, added_text)]
 
-    else:
-        # Create a new Skills section
-        skills_section = "\n\nSkills\n" + "\n".join(f"- {k}" for k in keywords_to_add)
-        return resume_text + skills_section
+@instrumented('updater', sizes=lambda result, resume_text, keywords_to_add: {'chars': len(resume_text), 'keywords': len(keywords_to_add)})
+def add_keywords_to_resume(resume_text, keywords_to_add):
+    """
+    Adds keywords as bullet points under the Skills section.
+    If Skills section does not exist, it creates one.
+    """
+    return apply_edits(resume_text, keyword_edits(resume_text, keywords_to_add))
@@ -0,0 +1,260 @@
+"""
+Screening many resumes against one job description.
+
+The job description is preprocessed once. Each resume is then extracted, preprocessed
+and scored on its own in an executor (a process pool running pipeline.init_worker, or
+threads calling the analysis service), and screen_resumes yields one row per resume
+as soon as it finishes, so a ranking table can fill in while the rest are still
+running. A resume that fails produces an error row instead of stopping the batch.
+
+Each resume is scored against the job description exactly as in the single-resume
+analysis (a two-document TF-IDF similarity), so a candidate's score does not depend
+on which other resumes are in the batch.
+"""
+
+import io
+import os
+import time
+import zipfile
+import zlib
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, wait
+from dataclasses import dataclass
+
+from . import pipeline
+from .extraction_cache import content_key
+
+SUPPORTED_SUFFIXES = ('.pdf', '.docx')
+# Upper bounds for one zip upload, so an archive cannot exhaust memory when expanded
+MAX_ZIP_MEMBERS = 1000
+MAX_MEMBER_BYTES = 20 * 1024 * 1024
+
+def _suffix(name):
+    return os.path.splitext(name)[1].lower()
+
+def _document_members(archive):
+    """
+    The PDF and DOCX members of a zip, without directories and macOS metadata.
+    """
+    return [info for info in archive.infolist()
+            if not info.is_dir() and _suffix(info.filename) in SUPPORTED_SUFFIXES
+            and not info.filename.startswith('__MACOSX/')]
+
+@dataclass(frozen=True)
+class UnreadableDocument:
+    # Stands in for the data of an uploaded document that could not be read
+    error: str
+
+def iter_upload_documents(name, data):
+    """
+    Yields (name, data) for an uploaded file: the file itself, or every PDF and DOCX
+    in it if it is a zip. Zip members are named 'archive.zip/inner/path.pdf' and are
+    read one at a time as the generator advances. Unsupported members and macOS
+    metadata are skipped.
+
+    A zip that is unreadable or has more than MAX_ZIP_MEMBERS documents, and a member
+    over MAX_MEMBER_BYTES or one that fails to decompress (corrupt, encrypted or
+    compressed with an unsupported method), is yielded with an UnreadableDocument as
+    its data, to be reported as an error row.
+    """
+    if _suffix(name) != '.zip':
+        yield name, data
+        return
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        yield name, UnreadableDocument(f"Not a valid zip file: {name}")
+        return
+    with archive:
+        members = _document_members(archive)
+        if len(members) > MAX_ZIP_MEMBERS:
+            yield name, UnreadableDocument(f"{name} contains {len(members)} documents; the limit is {MAX_ZIP_MEMBERS}")
+            return
+        for info in members:
+            member_name = f"{name}/{info.filename}"
+            if info.file_size > MAX_MEMBER_BYTES:
+                yield member_name, UnreadableDocument(f"File is larger than {MAX_MEMBER_BYTES // (1024 * 1024)} MB")
+                continue
+            try:
+                member = archive.read(info)
+            except (zipfile.BadZipFile, RuntimeError, NotImplementedError, EOFError, zlib.error) as e:
+                yield member_name, UnreadableDocument(f"Could not read the file from {name}: {e}")
+                continue
+            yield member_name, member
+
+def count_upload_documents(name, data):
+    """
+    Returns how many (name, data) pairs iter_upload_documents yields for an upload,
+    without reading any zip member.
+    """
+    if _suffix(name) != '.zip':
+        return 1
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            count = len(_document_members(archive))
+    except zipfile.BadZipFile:
+        return 1
+    return count if count <= MAX_ZIP_MEMBERS else 1
+
+def prepare_job(jd_text):
+    """
+    Returns the job description inputs every resume is scored against.
+    """
+    return {
+        'preprocessed_jd': pipeline.preprocess(jd_text),
+        'jd_skills': pipeline.skills(jd_text),
+    }
+
+def _row(name, start, **fields):
+    row = {'name': name, 'status': 'ok', 'seconds': time.perf_counter() - start, 'error': None}
+    row.update(fields)
+    return row
+
+def error_row(name, error, start=None):
+    """
+    A row for a document that could not be screened.
+    """
+    return _row(name, time.perf_counter() if start is None else start, status='error', error=error)
+
+def screen_resume(name, data, job, resume_text=None, extract_options=None):
+    """
+    Extracts and scores one resume against a prepared job. Runs in a worker process.
+
+    Args:
+        name (str): The file name, whose extension selects the extractor.
+        data (bytes): The file contents (unused if resume_text is given).
+        job (dict): The output of prepare_job.
+        resume_text (str, optional): Already extracted text, e.g. from the extraction cache.
+        extract_options (dict, optional): Extraction limits, as for pipeline.extract.
+
+    Returns:
+        dict: 'name', 'status' ('ok' or 'error'), 'seconds', 'error', and for scored
+        resumes 'similarity_score', 'ats_score', 'matched_skills', 'missing_skills'
+        and 'text' (the extracted text, for caching).
+    """
+    start = time.perf_counter()
+    try:
+        if resume_text is None:
+            resume_text = pipeline.extract(data, _suffix(name), extract_options)
+        resume_skills = set(pipeline.skills(resume_text))
+        return _row(
+            name, start,
+            similarity_score=pipeline.similarity(pipeline.preprocess(resume_text), job['preprocessed_jd']),
+            ats_score=pipeline.ats(resume_text)['score'],
+            matched_skills=[skill for skill in job['jd_skills'] if skill in resume_skills],
+            missing_skills=[skill for skill in job['jd_skills'] if skill not in resume_skills],
+            text=resume_text,
+        )
+    except Exception as e:
+        return error_row(name, f"{type(e).__name__}: {e}", start)
+
+def screen_resume_remote(client, name, data, jd_text):
+    """
+    Scores one resume through the analysis service (see api_client). Runs in a thread.
+    """
+    start = time.perf_counter()
+    try:
+        result = client.analyze(data, os.path.basename(name), jd_text=jd_text)
+    except Exception as e:
+        return error_row(name, f"{type(e).__name__}: {e}", start)
+    gaps = result['gaps']
+    return _row(
+        name, start,
+        similarity_score=result['similarity_score'],
+        ats_score=result['ats_score'],
+        matched_skills=gaps.get('matched_skills', []),
+        missing_skills=gaps.get('missing_skills', []),
+        text=result['resume_text'],
+    )
+
+def screen_resumes(documents, jd_text, executor, extraction_cache=None, client=None, max_pending=None,
+                   replace_executor=None):
+    """
+    Screens resumes against one job description, yielding rows as they finish.
+
+    Args:
+        documents (iterable): (name, data) pairs, e.g. from iter_upload_documents.
+            They are consumed as workers free up, so a generator keeps only the
+            pending documents in memory. An UnreadableDocument as data becomes an error row.
+        jd_text (str): The extracted job description text.
+        executor: A ProcessPoolExecutor (ideally initialized with pipeline.init_worker)
+            or, with client, a ThreadPoolExecutor.
+        extraction_cache (ExtractionCache, optional): Serves and stores extracted text.
+        client (AnalysisClient, optional): Scores through the analysis service instead.
+        max_pending (int, optional): Bound on submitted but unfinished documents
+            (default: four per CPU), so large uploads are not all queued at once.
+        replace_executor (callable, optional): Called with the executor when it breaks
+            (e.g. a worker process was killed), returning the executor to continue
+            with. The documents pending on the broken one get error rows. Without it,
+            every document after the break gets an error row.
+
+    Yields:
+        dict: screen_resume rows without 'text', in completion order.
+    """
+    job = None if client is not None else prepare_job(jd_text)
+    extract_options = extraction_cache.extract_options if extraction_cache is not None else pipeline.DEFAULT_EXTRACTION_LIMITS
+    max_pending = max_pending or 4 * (os.cpu_count() or 1)
+    pending = {}    # future -> (name, cache key, executor)
+
+    def replace(broken):
+        nonlocal executor
+        # Every future pending on a broken executor fails; replace it only once
+        if executor is broken:
+            executor = replace_executor(broken) if replace_executor is not None else None
+
+    def submit(fn, *args):
+        while executor is not None:
+            current = executor
+            try:
+                return current.submit(fn, *args)
+            except BrokenExecutor:
+                replace(current)
+        return None
+
+    def finished(return_when):
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            name, key, future_executor = pending.pop(future)
+            try:
+                row = future.result()
+            except BrokenExecutor as e:
+                replace(future_executor)
+                row = error_row(name, f"The worker screening this file stopped unexpectedly ({type(e).__name__})")
+            text = row.pop('text', None)
+            if key is not None and row['status'] == 'ok':
+                extraction_cache.put(key, text)
+            yield row
+
+    for name, data in documents:
+        if isinstance(data, UnreadableDocument):
+            yield error_row(name, data.error)
+            continue
+        if _suffix(name) not in SUPPORTED_SUFFIXES:
+            yield error_row(name, f"Unsupported file type: {_suffix(name) or name}")
+            continue
+        if len(pending) >= max_pending:
+            yield from finished(FIRST_COMPLETED)
+
+        key = None
+        if client is not None:
+            future = submit(screen_resume_remote, client, name, data, jd_text)
+        else:
+            cached_text = None
+            if extraction_cache is not None:
+                key = content_key(data, extract_options)
+                cached_text = extraction_cache.get(key)
+            if cached_text is not None:
+                key = None
+            future = submit(screen_resume, name, data if cached_text is None else None, job,
+                            cached_text, extract_options)
+        if future is None:
+            yield error_row(name, "Not screened: a worker stopped unexpectedly and was not replaced")
+            continue
+        pending[future] = (name, key, executor)
+    while pending:
+        yield from finished(FIRST_COMPLETED)
+
+def rank_rows(rows):
+    """
+    Orders screening rows best first: scored resumes by similarity, then errors by name.
+    """
+    return sorted(rows, key=lambda row: (row['status'] != 'ok', -(row.get('similarity_score') or 0), row['name']))
@@ -0,0 +1,468 @@
+"""
+Embedding-based similarity of resumes and job descriptions.
+
+calculate_similarity only sees shared terms, so "k8s" and "Kubernetes" or "led a team"
+and "managed engineers" count as unrelated. Here documents are embedded as dense unit
+vectors and compared by cosine instead. Two embedders are available:
+
+    SentenceTransformerEmbedder  a sentence-embedding model stored on local disk, run on
+                                 the CPU (requires sentence-transformers). It knows that
+                                 paraphrases and abbreviations mean the same thing.
+    HashingEmbedder              hashed word and character n-grams, with no model and no
+                                 extra dependency. It matches inflections and spelling
+                                 variants ("managed"/"management"), not synonyms.
+
+get_embedder picks the model named by RESUME_OPTIMIZER_EMBEDDING_MODEL and falls back to
+hashing. CachedEmbedder puts either one behind a cache keyed by content hash, so a
+document is embedded once however many job descriptions it is compared with.
+
+EmbeddingIndex stores resume embeddings for top-k retrieval. Once trained, it is an
+inverted-file (IVF) index: the vectors are clustered around about sqrt(n) k-means
+centroids and a query only scores the members of its n_probe nearest clusters, so
+search cost grows with sqrt(n) rather than n. File layout (little-endian):
+
+    magic 'RSEI' | format version (uint32) | header length (uint32) | JSON header
+    vectors      float32[n_docs, dim]
+    centroids    float32[n_lists, dim]
+    assignments  int32[n_docs]           cluster of each vector
+"""
+
+import json
+import os
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+from .instrumentation import instrumented
+from .result_cache import ResultCache, content_hash, stage_key
+
+MAGIC = b'RSEI'
+FORMAT_VERSION = 1
+
+HASHING_DIMENSIONS = 1024
+# Sentence models truncate long inputs, so documents are embedded in chunks of this
+# many words and the chunk embeddings averaged
+CHUNK_WORDS = 200
+EMBEDDING_BATCH_SIZE = 32
+
+# Below this many vectors search scores every vector; clustering would not pay off
+MIN_TRAINED_SIZE = 1024
+DEFAULT_N_PROBE = 8
+KMEANS_ITERATIONS = 10
+# k-means is fitted on a sample of at most this many vectors per centroid
+TRAINING_SAMPLE_PER_LIST = 64
+# Rows scored per block when assigning vectors to centroids, to bound memory
+ASSIGN_BLOCK_ROWS = 8192
+
+DEFAULT_SEMANTIC_WEIGHT = 0.5
+
+@dataclass(frozen=True)
+class SemanticHit:
+    doc_id: object
+    # Cosine similarity scaled to 0 to 100, like calculate_similarity
+    score: float
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+class HashingEmbedder:
+    """
+    Embeds text as L2-normalized hashed counts of words and character n-grams.
+
+    Args:
+        dimensions (int): The embedding size.
+        char_ngram_range (tuple): Character n-gram lengths, taken within word boundaries.
+    """
+
+    def __init__(self, dimensions=HASHING_DIMENSIONS, char_ngram_range=(3, 5)):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.dimensions = dimensions
+        self.char_ngram_range = tuple(char_ngram_range)
+        self._words = HashingVectorizer(n_features=dimensions, alternate_sign=False, norm='l2')
+        self._chars = HashingVectorizer(n_features=dimensions, alternate_sign=False, norm='l2',
+                                        analyzer='char_wb', ngram_range=self.char_ngram_range)
+
+    @property
+    def fingerprint(self):
+        return f"hashing-{self.dimensions}-{self.char_ngram_range[0]}-{self.char_ngram_range[1]}"
+
+    def embed(self, texts):
+        """
+        Returns a (len(texts), dimensions) float32 array of unit vectors (zero rows for empty texts).
+        """
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        # Words and character n-grams get equal weight
+        matrix = (self._words.transform(texts) + self._chars.transform(texts)).toarray()
+        return _normalize_rows(matrix).astype(np.float32)
+
+class SentenceTransformerEmbedder:
+    """
+    Embeds text with a sentence-transformers model loaded from a local directory, on the CPU.
+    Requires sentence-transformers.
+
+    Args:
+        model_path (str): The model directory, e.g. a saved all-MiniLM-L6-v2.
+        batch_size (int): Chunks encoded per forward pass.
+    """
+
+    def __init__(self, model_path, batch_size=EMBEDDING_BATCH_SIZE):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError("Sentence embeddings require sentence-transformers: pip install sentence-transformers")
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(f"Embedding model directory not found: {model_path}")
+        self.model_path = os.path.abspath(model_path)
+        self.batch_size = batch_size
+        self._model = SentenceTransformer(self.model_path, device='cpu')
+        self.dimensions = self._model.get_sentence_embedding_dimension()
+
+    @property
+    def fingerprint(self):
+        return f"sentence-transformers-{self.model_path}"
+
+    def embed(self, texts):
+        """
+        Returns a (len(texts), dimensions) float32 array of unit vectors. Long texts are
+        split into chunks, all chunks of the batch are encoded together, and each text's
+        chunk embeddings are averaged.
+        """
+        texts = list(texts)
+        chunks, owners = [], []
+        for number, text in enumerate(texts):
+            words = text.split()
+            for start in range(0, len(words), CHUNK_WORDS):
+                chunks.append(' '.join(words[start:start + CHUNK_WORDS]))
+                owners.append(number)
+        result = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        if chunks:
+            encoded = self._model.encode(chunks, batch_size=self.batch_size, convert_to_numpy=True,
+                                         normalize_embeddings=True, show_progress_bar=False)
+            np.add.at(result, np.asarray(owners), encoded)
+        return _normalize_rows(result).astype(np.float32)
+
+class CachedEmbedder:
+    """
+    Wraps an embedder with a cache keyed by the embedder's fingerprint and each text's
+    content hash. A batch embeds only its texts that are not cached yet, in one call.
+
+    Args:
+        embedder: A HashingEmbedder, SentenceTransformerEmbedder or anything with
+            embed(texts), dimensions and fingerprint.
+        cache (ResultCache, optional): Where embeddings are kept (default: a new cache).
+    """
+
+    def __init__(self, embedder, cache=None):
+        self.embedder = embedder
+        self.cache = cache if cache is not None else ResultCache()
+
+    @property
+    def dimensions(self):
+        return self.embedder.dimensions
+
+    @property
+    def fingerprint(self):
+        return self.embedder.fingerprint
+
+    def embed(self, texts):
+        texts = list(texts)
+        keys = [stage_key('embedding', self.fingerprint, content_hash(text)) for text in texts]
+        result = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        missing = {}    # key -> positions of the texts sharing it
+        for position, key in enumerate(keys):
+            vector = self.cache.get(key)
+            if vector is None:
+                missing.setdefault(key, []).append(position)
+            else:
+                result[position] = vector
+        if missing:
+            embedded = self.embedder.embed([texts[positions[0]] for positions in missing.values()])
+            for (key, positions), vector in zip(missing.items(), embedded):
+                self.cache.put(key, vector)
+                result[positions] = vector
+        return result
+
+def get_embedder(model_path=None, cache=None):
+    """
+    Returns a cached embedder: the sentence model at model_path (default: the
+    RESUME_OPTIMIZER_EMBEDDING_MODEL environment variable), or HashingEmbedder if no
+    model is configured.
+    """
+    model_path = model_path or os.environ.get('RESUME_OPTIMIZER_EMBEDDING_MODEL')
+    embedder = SentenceTransformerEmbedder(model_path) if model_path else HashingEmbedder()
+    return CachedEmbedder(embedder, cache)
+
+@instrumented('semantic_similarity', sizes=lambda score, resume_text, job_description_text, *args, **kwargs: {'chars': len(resume_text) + len(job_description_text)})
+def semantic_similarity(resume_text, job_description_text, embedder=None):
+    """
+    Calculates the cosine similarity of a resume's and a job description's embeddings.
+
+    Args:
+        resume_text (str): The resume text. Sentence models expect the extracted text,
+            not preprocess_text output.
+        job_description_text (str): The job description text.
+        embedder (optional): The embedder (default: HashingEmbedder).
+
+    Returns:
+        float: A similarity score between 0 and 100 (negative cosines count as 0).
+    """
+    embedder = embedder or HashingEmbedder()
+    resume_vector, jd_vector = embedder.embed([resume_text, job_description_text])
+    return max(0.0, float(resume_vector @ jd_vector)) * 100
+
+def blend_scores(lexical_score, semantic_score, semantic_weight=DEFAULT_SEMANTIC_WEIGHT):
+    """
+    Mixes a TF-IDF score with a semantic score, both on the 0 to 100 scale. Works on
+    single scores and on numpy arrays of scores alike.
+    """
+    if not 0 <= semantic_weight <= 1:
+        raise ValueError(f"semantic_weight must be between 0 and 1, got {semantic_weight}")
+    return (1 - semantic_weight) * lexical_score + semantic_weight * semantic_score
+
+def _nearest_centroids(vectors, centroids):
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BLOCK_ROWS):
+        block = vectors[start:start + ASSIGN_BLOCK_ROWS]
+        assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+def _spherical_kmeans(vectors, n_lists, iterations, rng):
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _nearest_centroids(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        empty = ~sums.any(axis=1)
+        # An empty cluster is restarted at a random vector
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = _normalize_rows(sums).astype(np.float32)
+    return centroids
+
+class EmbeddingIndex:
+    """
+    An approximate nearest-neighbour index of unit-length document embeddings.
+
+    Until train() is called (or while the index is small) search is exact. Documents
+    added after training are assigned to their nearest existing centroid; retrain after
+    the collection has grown several times over.
+
+    Args:
+        dimensions (int): The embedding size.
+        fingerprint (str, optional): The embedder's fingerprint. A loaded index checks it,
+            so queries are never embedded by a different model than the documents.
+    """
+
+    def __init__(self, dimensions, fingerprint=None):
+        self.dimensions = dimensions
+        self.fingerprint = fingerprint
+        self._doc_ids = []          # internal number -> external ID (None once deleted)
+        self._doc_numbers = {}      # external ID -> internal number
+        self._vectors = np.zeros((0, dimensions), dtype=np.float32)
+        self._count = 0             # rows of _vectors in use; the rest is spare capacity
+        self._centroids = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lists = None          # cluster -> internal numbers, rebuilt after changes
+
+    def __len__(self):
+        return len(self._doc_numbers)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._doc_numbers
+
+    @property
+    def is_trained(self):
+        return self._centroids is not None
+
+    def _check_embedder(self, embedder):
+        if self.fingerprint is not None and embedder.fingerprint != self.fingerprint:
+            raise ValueError(f"Index was built with embedder {self.fingerprint}, not {embedder.fingerprint}")
+
+    def add(self, doc_ids, vectors):
+        """
+        Stores embeddings, replacing any earlier version of the same documents.
+
+        Args:
+            doc_ids (list): The external resume IDs.
+            vectors (numpy.ndarray): One unit-length embedding row per ID.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimensions)
+        if len(vectors) != len(doc_ids):
+            raise ValueError(f"Got {len(doc_ids)} IDs for {len(vectors)} vectors")
+        for doc_id in doc_ids:
+            if doc_id in self._doc_numbers:
+                self.delete(doc_id)
+
+        needed = self._count + len(vectors)
+        if needed > len(self._vectors):
+            # Grow by doubling, so adding one document at a time stays amortized O(1)
+            capacity = max(needed, 2 * len(self._vectors), 64)
+            grown = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            grown[:self._count] = self._vectors[:self._count]
+            self._vectors = grown
+        self._vectors[self._count:needed] = vectors
+
+        assignments = (_nearest_centroids(vectors, self._centroids) if self.is_trained
+                       else np.zeros(len(vectors), dtype=np.int32))
+        self._assignments = np.concatenate([self._assignments, assignments])
+        for doc_id in doc_ids:
+            self._doc_numbers[doc_id] = len(self._doc_ids)
+            self._doc_ids.append(doc_id)
+        self._count = needed
+        self._lists = None
+
+    def add_texts(self, doc_ids, texts, embedder):
+        """
+        Embeds documents in one batch and stores them.
+        """
+        self._check_embedder(embedder)
+        self.add(list(doc_ids), embedder.embed(texts))
+
+    def delete(self, doc_id):
+        """
+        Removes a document. Its vector is dropped at the next compaction.
+        """
+        number = self._doc_numbers.pop(doc_id)
+        self._doc_ids[number] = None
+        self._lists = None
+
+    def compact(self):
+        """
+        Drops the vectors of deleted documents and renumbers the rest.
+        """
+        alive = np.array([doc_id is not None for doc_id in self._doc_ids], dtype=bool)
+        if alive.all():
+            return
+        self._vectors = self._vectors[:self._count][alive]
+        self._assignments = self._assignments[alive]
+        self._doc_ids = [doc_id for doc_id in self._doc_ids if doc_id is not None]
+        self._doc_numbers = {doc_id: number for number, doc_id in enumerate(self._doc_ids)}
+        self._count = len(self._doc_ids)
+        self._lists = None
+
+    def train(self, n_lists=None, iterations=KMEANS_ITERATIONS, seed=0):
+        """
+        Clusters the stored vectors with spherical k-means and assigns every vector to
+        its nearest centroid.
+
+        Args:
+            n_lists (int, optional): The number of clusters (default: about sqrt(n)).
+            iterations (int): k-means iterations.
+            seed (int): Seed for the initial centroids and the training sample.
+        """
+        self.compact()
+        vectors = self._vectors[:self._count]
+        if not len(vectors):
+            raise ValueError("Cannot train an empty index")
+        n_lists = min(n_lists or max(1, int(round(np.sqrt(len(vectors))))), len(vectors))
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(vectors), TRAINING_SAMPLE_PER_LIST * n_lists)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        self._centroids = _spherical_kmeans(sample, n_lists, iterations, rng)
+        self._assignments = _nearest_centroids(vectors, self._centroids)
+        self._lists = None
+
+    def _candidates(self, query, n_probe):
+        if self._lists is None:
+            alive = np.array([doc_id is not None for doc_id in self._doc_ids], dtype=bool)
+            numbers = np.flatnonzero(alive)
+            order = np.argsort(self._assignments[numbers], kind='stable')
+            numbers = numbers[order]
+            bounds = np.searchsorted(self._assignments[numbers], np.arange(len(self._centroids) + 1))
+            self._lists = [numbers[bounds[i]:bounds[i + 1]] for i in range(len(self._centroids))]
+        centroid_scores = self._centroids @ query
+        n_probe = min(n_probe, len(self._centroids))
+        probed = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        return np.concatenate([self._lists[i] for i in probed])
+
+    def search(self, query, top_k=10, n_probe=DEFAULT_N_PROBE):
+        """
+        Finds the stored documents most similar to a query embedding.
+
+        Args:
+            query (numpy.ndarray): A unit-length embedding.
+            top_k (int): The number of hits to return.
+            n_probe (int): Clusters searched in a trained index. More is slower and
+                closer to exact; n_probe equal to the number of clusters is exact.
+
+        Returns:
+            list: SemanticHit objects, best first.
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(self.dimensions)
+        if not self._doc_numbers or top_k <= 0:
+            return []
+        if self.is_trained and self._count >= MIN_TRAINED_SIZE:
+            candidates = self._candidates(query, n_probe)
+        else:
+            candidates = np.fromiter(self._doc_numbers.values(), dtype=np.int64, count=len(self._doc_numbers))
+        scores = self._vectors[candidates] @ query
+        if len(candidates) > top_k:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            candidates, scores = candidates[best], scores[best]
+        order = np.lexsort((candidates, -scores))
+        return [SemanticHit(self._doc_ids[number], max(0.0, float(score)) * 100)
+                for number, score in zip(candidates[order], scores[order])]
+
+    def search_text(self, text, embedder, top_k=10, n_probe=DEFAULT_N_PROBE):
+        """
+        Embeds a job description and finds the most similar stored resumes.
+        """
+        self._check_embedder(embedder)
+        return self.search(embedder.embed([text])[0], top_k=top_k, n_probe=n_probe)
+
+    def save(self, path):
+        """
+        Compacts the index and writes it to disk atomically.
+        """
+        self.compact()
+        centroids = self._centroids if self.is_trained else np.zeros((0, self.dimensions), dtype=np.float32)
+        header = json.dumps({
+            'doc_ids': self._doc_ids,
+            'dimensions': self.dimensions,
+            'fingerprint': self.fingerprint,
+            'n_lists': len(centroids),
+        }).encode('utf-8')
+
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<II', FORMAT_VERSION, len(header)))
+            f.write(header)
+            f.write(np.ascontiguousarray(self._vectors[:self._count], dtype='<f4').tobytes())
+            f.write(np.ascontiguousarray(centroids, dtype='<f4').tobytes())
+            f.write(np.ascontiguousarray(self._assignments, dtype='<i4').tobytes())
+        os.replace(temp_path, path)
+
+def load_embedding_index(path):
+    """
+    Loads an index written by EmbeddingIndex.save. The loaded index can be updated further.
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    if content[:4] != MAGIC:
+        raise ValueError(f"Not an embedding index file: {path}")
+    version, header_length = struct.unpack_from('<II', content, 4)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported embedding index version {version} in: {path}")
+
+    offset = 12
+    header = json.loads(content[offset:offset + header_length].decode('utf-8'))
+    offset += header_length
+    n_docs, dimensions, n_lists = len(header['doc_ids']), header['dimensions'], header['n_lists']
+
+    index = EmbeddingIndex(dimensions, header['fingerprint'])
+    index._doc_ids = header['doc_ids']
+    index._doc_numbers = {doc_id: number for number, doc_id in enumerate(index._doc_ids)}
+    index._vectors = np.frombuffer(content, dtype='<f4', count=n_docs * dimensions, offset=offset).reshape(n_docs, dimensions).copy()
+    offset += 4 * n_docs * dimensions
+    if n_lists:
+        index._centroids = np.frombuffer(content, dtype='<f4', count=n_lists * dimensions, offset=offset).reshape(n_lists, dimensions).copy()
+    offset += 4 * n_lists * dimensions
+    index._assignments = np.frombuffer(content, dtype='<i4', count=n_docs, offset=offset).astype(np.int32)
+    index._count = n_docs
+    return index
@@ -1,20 +1,35 @@
 
+import math
+
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
-def calculate_similarity(resume_text, job_description_text):
+from .instrumentation import instrumented
+
+# Documents in a resume/JD pair, for TfidfVectorizer's smoothed IDF
+PAIR_DOCUMENTS = 2
+
+@instrumented('similarity', sizes=lambda score, resume_text, job_description_text, *args, **kwargs: {'chars': len(resume_text) + len(job_description_text)})
+def calculate_similarity(resume_text, job_description_text, model=None):
     """
     Calculates the cosine similarity between a resume and a job description.
 
     Args:
         resume_text (str): The preprocessed resume text.
         job_description_text (str): The preprocessed job description text.
+        model (CorpusModel, optional): A fitted corpus model. When given, its
+            corpus-wide IDF weights are used instead of fitting on these two documents.
 
     Returns:
         float: A similarity score between 0 and 100.
     """
     documents = [resume_text, job_description_text]
 
+    if model is not None:
+        # The model's rows are already L2-normalized, so the dot product is the cosine
+        tfidf_matrix = model.transform(documents)
+        return float(tfidf_matrix[0].multiply(tfidf_matrix[1]).sum()) * 100
+
     # Create a TF-IDF Vectorizer
     tfidf_vectorizer = TfidfVectorizer()
 
@@ -29,3 +44,34 @@ def calculate_similarity(resume_text, job_description_text):
     similarity_score = similarity_matrix[0][0] * 100
 
     return similarity_score
+
+def similarity_from_counts(resume_counts, jd_counts, idf=None):
+    """
+    Calculates calculate_similarity's score from term counts, without re-vectorizing.
+
+    Args:
+        resume_counts (dict): Term counts of the preprocessed resume.
+        jd_counts (dict): Term counts of the preprocessed job description.
+        idf (optional): IDF weights indexed by term, e.g. a corpus model's idf with
+            counts keyed by feature index. Default: the smoothed IDF of the two
+            documents, as TfidfVectorizer computes it.
+
+    Returns:
+        float: A similarity score between 0 and 100.
+    """
+    dot = resume_norm2 = jd_norm2 = 0.0
+    for term in resume_counts.keys() | jd_counts.keys():
+        resume_count = resume_counts.get(term, 0)
+        jd_count = jd_counts.get(term, 0)
+        if idf is None:
+            document_frequency = (resume_count > 0) + (jd_count > 0)
+            weight = math.log((1 + PAIR_DOCUMENTS) / (1 + document_frequency)) + 1
+        else:
+            weight = float(idf[term])
+        weight *= weight
+        dot += resume_count * jd_count * weight
+        resume_norm2 += resume_count * resume_count * weight
+        jd_norm2 += jd_count * jd_count * weight
+    if resume_norm2 <= 0 or jd_norm2 <= 0:
+        return 0.0
+    return dot / math.sqrt(resume_norm2 * jd_norm2) * 100
@@ -0,0 +1,310 @@
+"""
+Skill taxonomy: canonical skills and the aliases they go by.
+
+A taxonomy file lists skills with a canonical ID, a display name and any number of
+aliases ("js", "ecmascript" and "java script" for javascript). Every alias is split into
+tokens and the token sequences are compiled into one Aho-Corasick automaton, so all
+skills mentioned in a text are found in a single left-to-right pass over its tokens,
+however many aliases the taxonomy has. Where mentions overlap, the leftmost and then
+longest one wins ("java script" is JavaScript, not Java).
+
+Text is matched case-insensitively on the extracted text, not on preprocess_text
+output, which strips the punctuation of names like "c++", "c#" and ".net".
+
+Taxonomy file format (JSON):
+
+    {"version": 1, "skills": [
+        {"id": "javascript", "name": "JavaScript", "aliases": ["js", "ecmascript"]},
+        {"id": "go", "name": "Go", "aliases": ["golang"], "match_name": false}
+    ]}
+
+match_name false keeps a name that is also an everyday word ("go", "spring") from
+matching on its own. Compiling a large taxonomy takes a while, so the compiled
+automaton is pickled to a cache directory, keyed by the SHA-256 of the taxonomy file,
+and later processes load the pickle instead.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+from collections import deque
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), 'data', 'skill_taxonomy.json')
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'resume_optimizer')
+# Part of the cache key; bump when the compiled representation changes
+COMPILED_VERSION = 1
+# Characters of context rematch() starts from on each side of an edit; doubled as needed
+REMATCH_CONTEXT = 256
+
+# Words, optionally with inner dots ("node.js", "asp.net") and trailing + or # ("c++",
+# "c#"), or a dotted name on its own (".net"). Hyphens and slashes separate tokens, so
+# "ci/cd" and "ci cd" are the same alias.
+TOKEN_PATTERN = re.compile(r"[^\W_][^\W_]*[+#]*(?:\.[^\W_]+[+#]*)*|\.[^\W_]+")
+
+@dataclass(frozen=True)
+class SkillMatch:
+    skill_id: str
+    # The matched text and its character offsets in the searched text
+    text: str
+    start: int
+    end: int
+
+def tokenize(text):
+    """
+    Returns the (token, start, end) triples the automaton matches on.
+    """
+    return [(m.group().casefold(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+class SkillTaxonomy:
+    """
+    A compiled skill taxonomy. Build one with compile_taxonomy or load_taxonomy.
+    """
+
+    def __init__(self, skill_ids, names, goto, fail, outputs, fingerprint):
+        self.skill_ids = skill_ids      # skill number -> canonical ID
+        self.names = names              # canonical ID -> display name
+        self._goto = goto               # state -> {token: next state}
+        self._fail = fail               # state -> longest proper suffix state
+        self._outputs = outputs         # state -> ((skill number, token count), ...) ending here
+        self.fingerprint = fingerprint
+
+    def __len__(self):
+        return len(self.skill_ids)
+
+    def __contains__(self, skill_id):
+        return skill_id in self.names
+
+    def name(self, skill_id):
+        return self.names[skill_id]
+
+    def _scan(self, tokens):
+        """
+        Yields (first token, token count, skill number) for every alias occurrence.
+        """
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for position, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for number, length in outputs[state]:
+                yield position - length + 1, length, number
+
+    def match(self, text):
+        """
+        Finds the skill mentions in a text.
+
+        Returns:
+            list: SkillMatch objects in text order, without overlaps.
+        """
+        tokens = tokenize(text)
+        found = sorted(self._scan([token for token, _, _ in tokens]), key=lambda m: (m[0], -m[1]))
+        matches = []
+        next_free = 0
+        for first, length, number in found:
+            if first < next_free:
+                continue
+            start, end = tokens[first][1], tokens[first + length - 1][2]
+            matches.append(SkillMatch(self.skill_ids[number], text[start:end], start, end))
+            next_free = first + length
+        return matches
+
+    def find_skills(self, text):
+        """
+        Returns the canonical IDs of the skills a text mentions, in order of first mention.
+        """
+        return list(dict.fromkeys(match.skill_id for match in self.match(text)))
+
+    def canonicalize(self, phrase):
+        """
+        Returns the canonical ID if the whole phrase is one alias of a skill, else None.
+        """
+        tokens = [token for token, _, _ in tokenize(phrase)]
+        state = 0
+        for token in tokens:
+            state = self._goto[state].get(token)
+            if state is None:
+                return None
+        for number, length in self._outputs[state]:
+            if length == len(tokens):
+                return self.skill_ids[number]
+        return None
+
+    @cached_property
+    def max_alias_tokens(self):
+        """
+        The token count of the longest alias.
+        """
+        return max((length for ends in self._outputs for _, length in ends), default=1)
+
+    def _is_cut(self, tokens, index):
+        """
+        Whether no alias occurrence spans the boundary before tokens[index]. tokens must
+        extend max_alias_tokens - 1 tokens past the boundary on both sides, or to the
+        edge of the text.
+        """
+        span = self.max_alias_tokens - 1
+        first_token = max(0, index - span)
+        return not any(first_token + first < index < first_token + first + length
+                       for first, length, _ in self._scan(tokens[first_token:index + span]))
+
+    def rematch(self, matches, text, new_text, start, end, new_end):
+        """
+        Updates match(text) output for an edit, matching only the tokens around it.
+
+        The rematched range is widened to boundaries that no alias occurrence spans, in
+        the old text and in the new one, so mentions outside it resolve the same way in
+        both and the result equals match(new_text).
+
+        Args:
+            matches (list): match(text) output.
+            text (str): The text before the edit.
+            new_text (str): The text after it: text[start:end] replaced by
+                new_text[start:new_end].
+
+        Returns:
+            list: SkillMatch objects in new_text order, without overlaps.
+        """
+        shift = new_end - end
+        span = self.max_alias_tokens - 1
+        # Tokens never contain whitespace, so the changed tokens lie between these
+        while start > 0 and not text[start - 1].isspace():
+            start -= 1
+        while end < len(text) and not text[end].isspace():
+            end += 1
+
+        context = REMATCH_CONTEXT
+        while True:
+            low = max(0, start - context)
+            while low > 0 and not text[low - 1].isspace():
+                low -= 1
+            high = min(len(text), end + context)
+            while high < len(text) and not text[high].isspace():
+                high += 1
+            before = tokenize(text[low:start])
+            after = tokenize(text[end:high])
+            before_tokens = [token for token, _, _ in before]
+            after_tokens = [token for token, _, _ in after]
+
+            # The nearest cuts at least `span` unchanged tokens away from the edit; the
+            # edges of the text always are
+            left = next((index for index in range(len(before) - span, -1, -1)
+                         if (index >= span or low == 0) and self._is_cut(before_tokens, index)),
+                        0 if low == 0 else None)
+            right = next((index for index in range(span, len(after) + 1)
+                          if (index <= len(after) - span or high == len(text)) and self._is_cut(after_tokens, index)),
+                         len(after) if high == len(text) else None)
+            if left is not None and right is not None:
+                break
+            context *= 2
+
+        cut_start = low + before[left][1] if left < len(before) else start
+        cut_end = end + after[right][1] if right < len(after) else high
+        rematched = [SkillMatch(match.skill_id, match.text, match.start + cut_start, match.end + cut_start)
+                     for match in self.match(new_text[cut_start:cut_end + shift])]
+        return ([match for match in matches if match.start < cut_start] + rematched +
+                [SkillMatch(match.skill_id, match.text, match.start + shift, match.end + shift)
+                 for match in matches if match.start >= cut_end])
+
+def compile_taxonomy(config, fingerprint=None):
+    """
+    Compiles a taxonomy config (the parsed JSON file) into a SkillTaxonomy.
+
+    Raises:
+        ValueError: If an alias belongs to two skills or a skill ID is repeated.
+    """
+    skill_ids, names = [], {}
+    goto, fail, own_output = [{}], [0], [None]
+    owners = {}
+    for skill in config['skills']:
+        skill_id = skill['id']
+        if skill_id in names:
+            raise ValueError(f"Duplicate skill ID in taxonomy: '{skill_id}'")
+        number = len(skill_ids)
+        skill_ids.append(skill_id)
+        names[skill_id] = skill.get('name', skill_id)
+
+        aliases = list(skill.get('aliases', []))
+        if skill.get('match_name', True):
+            aliases = [names[skill_id], skill_id] + aliases
+        for alias in aliases:
+            tokens = tuple(token for token, _, _ in tokenize(alias))
+            if not tokens:
+                continue
+            owner = owners.setdefault(tokens, skill_id)
+            if owner != skill_id:
+                raise ValueError(f"Alias '{alias}' belongs to both '{owner}' and '{skill_id}'")
+            state = 0
+            for token in tokens:
+                next_state = goto[state].get(token)
+                if next_state is None:
+                    next_state = goto[state][token] = len(goto)
+                    goto.append({})
+                    fail.append(0)
+                    own_output.append(None)
+                state = next_state
+            own_output[state] = (number, len(tokens))
+
+    # Breadth-first, so a state's failure link is final before its children need it.
+    # Each state's outputs include those of its failure chain.
+    outputs = [()] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        outputs[state] = ((own_output[state],) if own_output[state] else ()) + outputs[fail[state]]
+        for token, child in goto[state].items():
+            suffix = fail[state]
+            while suffix and token not in goto[suffix]:
+                suffix = fail[suffix]
+            fail[child] = goto[suffix].get(token, 0) if state else 0
+            queue.append(child)
+    return SkillTaxonomy(skill_ids, names, goto, fail, outputs, fingerprint)
+
+def load_taxonomy(path=DEFAULT_TAXONOMY_PATH, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Loads a taxonomy file, from its compiled cache when the file has not changed.
+
+    Args:
+        path (str): The taxonomy JSON file.
+        cache_dir (str, optional): Where compiled taxonomies are kept; None disables
+            the cache. An unwritable directory only costs the compilation.
+    """
+    digest = file_hash(path)
+    fingerprint = f"{COMPILED_VERSION}-{digest[:16]}"
+    cache_path = os.path.join(cache_dir, f"skill_taxonomy-{fingerprint}.pickle") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            # A truncated or stale cache file is rebuilt below
+            pass
+
+    with open(path, encoding='utf-8') as f:
+        taxonomy = compile_taxonomy(json.load(f), fingerprint)
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                pickle.dump(taxonomy, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass
+    return taxonomy
+
+@lru_cache(maxsize=None)
+def get_taxonomy(path=None):
+    """
+    Returns the taxonomy at path (default: RESUME_OPTIMIZER_SKILL_TAXONOMY, else the
+    bundled data/skill_taxonomy.json), loading it once per process.
+    """
+    return load_taxonomy(path or os.environ.get('RESUME_OPTIMIZER_SKILL_TAXONOMY') or DEFAULT_TAXONOMY_PATH)
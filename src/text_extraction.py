@@ -3,37 +3,524 @@ import pdfplumber
 import re
 import docx2txt
 import os
+import logging
+import multiprocessing
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 
-def extract_text_from_pdf(pdf_path):
+from pdfminer.converter import PDFLayoutAnalyzer
+from pdfminer.layout import LTChar, LTContainer
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+
+from .instrumentation import annotate, instrumented
+
+# Bump whenever a change alters extracted text, so cached extractions are invalidated
+EXTRACTOR_VERSION = "2"
+
+# Shorter PDFs, which covers typical resumes, are always extracted in the calling process
+PARALLEL_MIN_PAGES = 8
+# Longer ones are spread over worker processes when the first page shows that the rest
+# would take this long serially (text-layer pages take about 20 ms, fallbacks far more)
+PARALLEL_MIN_SECONDS = 0.5
+
+DEFAULT_PDF_BACKEND = 'text_stream'
+# Re-extracts the pages whose fast text fails the quality checks below
+FALLBACK_PDF_BACKEND = 'pdfplumber'
+
+# Page text quality checks: a page with fewer characters, a larger share of unmapped
+# glyphs or control characters, or longer average "words" (spaces lost) is suspect
+MIN_PAGE_CHARS = 20
+MAX_GARBLED_RATIO = 0.05
+MAX_MEAN_WORD_LENGTH = 20
+GARBLED_PATTERN = re.compile(r'\(cid:\d+\)|[\ufffd\x00-\x08\x0b\x0c\x0e-\x1f\ue000-\uf8ff]')
+
+# Gaps in points that start a new line or word in the text stream, as pdfplumber's
+# default x and y tolerances
+LINE_TOLERANCE = 3
+WORD_TOLERANCE = 3
+
+logger = logging.getLogger(__name__)
+
+def _filter_page_lines(page_text):
     """
-    Extracts clean text from a PDF file.
+    A simple heuristic to remove headers/footers:
+    Assumes they are in the top/bottom 5% of the page's lines.
+    """
+    lines = (page_text or '').split('\n')
+    # This can be adjusted based on resume format
+    if len(lines) > 10: # Only filter if there are enough lines
+        filtered_lines = lines[int(len(lines) * 0.05):int(len(lines) * 0.95)]
+    else:
+        filtered_lines = lines
+    return '\n'.join(filtered_lines)
+
+def check_page_text(page_text):
+    """
+    Returns why a page's extracted text looks unusable ('too_few_chars', 'garbled'
+    or 'missing_spaces'), or None if it passes.
+    """
+    stripped = (page_text or '').strip()
+    if len(stripped) < MIN_PAGE_CHARS:
+        return 'too_few_chars'
+    garbled = GARBLED_PATTERN.findall(stripped)
+    # An unmapped glyph is spelled '(cid:N)' but is one character of the page
+    glyphs = len(stripped) - sum(len(match) - 1 for match in garbled)
+    if len(garbled) > MAX_GARBLED_RATIO * glyphs:
+        return 'garbled'
+    words = stripped.split()
+    if sum(len(word) for word in words) / len(words) > MAX_MEAN_WORD_LENGTH:
+        return 'missing_spaces'
+    return None
+
+class PDFBackend:
+    """
+    A way of extracting the text of PDF pages. Subclasses set name and implement open;
+    register them with register_pdf_backend.
+    """
+
+    name = None
+
+    def open(self, pdf_path):
+        """
+        Opens a PDF. The returned document supports len() (the page count),
+        page_text(page_number) (the page's text, lines separated by newlines) and close().
+        """
+        raise NotImplementedError
+
+class _PdfplumberDocument:
+
+    def __init__(self, pdf_path):
+        self._pdf = pdfplumber.open(pdf_path)
+
+    def __len__(self):
+        return len(self._pdf.pages)
+
+    def page_text(self, page_number):
+        page = self._pdf.pages[page_number]
+        try:
+            return page.extract_text() or ''
+        finally:
+            # Drop the page's cached characters and layout objects
+            page.close()
+
+    def close(self):
+        self._pdf.close()
+
+class PdfplumberBackend(PDFBackend):
+    """
+    pdfplumber's character-level layout analysis. Slow, but orders text by position
+    rather than by how the PDF happens to draw it.
+    """
+
+    name = 'pdfplumber'
+
+    def open(self, pdf_path):
+        return _PdfplumberDocument(pdf_path)
+
+def _iter_chars(container):
+    for item in container:
+        if isinstance(item, LTChar):
+            yield item
+        elif isinstance(item, LTContainer):
+            yield from _iter_chars(item)
+
+class _TextStreamDevice(PDFLayoutAnalyzer):
+    """
+    Collects a page's characters in content stream order, without layout analysis.
+    """
+
+    def __init__(self, resources):
+        super().__init__(resources, laparams=None)
+        self.text = ''
+
+    def receive_layout(self, ltpage):
+        parts = []
+        previous = None
+        for char in _iter_chars(ltpage):
+            if previous is not None:
+                if abs(char.y0 - previous.y0) > LINE_TOLERANCE:
+                    parts.append('\n')
+                elif char.x0 - previous.x1 > WORD_TOLERANCE or char.x0 < previous.x0 - WORD_TOLERANCE:
+                    parts.append(' ')
+            parts.append(char.get_text())
+            previous = char
+        self.text = ''.join(parts)
+
+class _TextStreamDocument:
+
+    def __init__(self, pdf_path):
+        self._file = open(pdf_path, 'rb')
+        try:
+            self._pages = list(PDFPage.create_pages(PDFDocument(PDFParser(self._file))))
+        except Exception:
+            self._file.close()
+            raise
+        resources = PDFResourceManager(caching=True)
+        self._device = _TextStreamDevice(resources)
+        self._interpreter = PDFPageInterpreter(resources, self._device)
+
+    def __len__(self):
+        return len(self._pages)
+
+    def page_text(self, page_number):
+        self._interpreter.process_page(self._pages[page_number])
+        return self._device.text
+
+    def close(self):
+        self._device.close()
+        self._file.close()
+
+class TextStreamBackend(PDFBackend):
+    """
+    pdfminer's text stream: characters in drawing order, with a line break where the
+    baseline moves and a space at a horizontal gap. Much faster than pdfplumber, since
+    extract_text_from_pdf collapses whitespace anyway, but it relies on the PDF drawing
+    text in reading order; check_page_text catches the pages where that fails.
+    """
+
+    name = 'text_stream'
+
+    def open(self, pdf_path):
+        return _TextStreamDocument(pdf_path)
+
+PDF_BACKENDS = {}
+
+def register_pdf_backend(backend):
+    """
+    Makes a PDFBackend instance selectable by its name.
+    """
+    PDF_BACKENDS[backend.name] = backend
+
+register_pdf_backend(PdfplumberBackend())
+register_pdf_backend(TextStreamBackend())
+
+def get_pdf_backend(name=None):
+    """
+    Returns a registered backend (default: DEFAULT_PDF_BACKEND).
+
+    Raises:
+        ValueError: If no backend has that name.
+    """
+    name = name or DEFAULT_PDF_BACKEND
+    try:
+        return PDF_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown PDF backend: {name} (available: {', '.join(sorted(PDF_BACKENDS))})")
+
+@dataclass(frozen=True)
+class PDFExtraction:
+    text: str
+    # Pages extracted and seconds spent per backend, fallback included
+    pages: dict
+    seconds: dict
+    # Pages re-extracted with the fallback backend, per check_page_text reason
+    fallbacks: dict
+
+    @property
+    def backend(self):
+        """
+        The backend that produced the text, or 'primary+fallback' for a mix.
+        """
+        return '+'.join(name for name, count in self.pages.items() if count) or None
+
+class _PageExtractor:
+    """
+    Extracts pages with a backend, re-extracting the pages whose text fails
+    check_page_text with FALLBACK_PDF_BACKEND, and accounts for both.
+    """
+
+    def __init__(self, pdf_path, backend=None):
+        self.pdf_path = pdf_path
+        self.backend = get_pdf_backend(backend)
+        self.stats = {'pages': {self.backend.name: 0}, 'seconds': {self.backend.name: 0.0}, 'fallbacks': {}}
+        self._fallback = None
+        start = time.perf_counter()
+        self._document = self.backend.open(pdf_path)
+        self._add(self.backend.name, 0, start)
+
+    def _add(self, name, pages, start):
+        stats = self.stats
+        stats['pages'][name] = stats['pages'].get(name, 0) + pages
+        stats['seconds'][name] = stats['seconds'].get(name, 0.0) + time.perf_counter() - start
+
+    def __len__(self):
+        return len(self._document)
+
+    def page_text(self, page_number):
+        """
+        Returns a page's text, minus headers and footers.
+        """
+        start = time.perf_counter()
+        page_text = self._document.page_text(page_number)
+        reason = check_page_text(page_text) if self.backend.name != FALLBACK_PDF_BACKEND else None
+        if reason is None:
+            self._add(self.backend.name, 1, start)
+            return _filter_page_lines(page_text)
+
+        self._add(self.backend.name, 0, start)
+        start = time.perf_counter()
+        if self._fallback is None:
+            self._fallback = get_pdf_backend(FALLBACK_PDF_BACKEND).open(self.pdf_path)
+        page_text = self._fallback.page_text(page_number)
+        self._add(FALLBACK_PDF_BACKEND, 1, start)
+        self.stats['fallbacks'][reason] = self.stats['fallbacks'].get(reason, 0) + 1
+        return _filter_page_lines(page_text)
+
+    def close(self):
+        self._document.close()
+        if self._fallback is not None:
+            self._fallback.close()
+
+def _merge_stats(total, stats):
+    for field, values in stats.items():
+        for name, value in values.items():
+            total[field][name] = total[field].get(name, 0) + value
+
+def _extract_page_range(pdf_path, start, stop, time_limit=None, backend=None):
+    """
+    Extracts the text of pages start to stop - 1, minus headers and footers.
+    Runs in a worker process for parallel extraction, so it opens the file itself.
+
+    Returns:
+        tuple: (list of page texts, True if the time limit stopped it early,
+        _PageExtractor stats)
+    """
+    began = time.perf_counter()
+    texts = []
+    extractor = _PageExtractor(pdf_path, backend)
+    try:
+        for page_number in range(start, stop):
+            if time_limit is not None and time.perf_counter() - began > time_limit:
+                return texts, True, extractor.stats
+            texts.append(extractor.page_text(page_number))
+    finally:
+        extractor.close()
+    return texts, False, extractor.stats
+
+_page_pool = None
+_page_pool_workers = 0
+_page_pool_lock = threading.Lock()
+
+def _get_page_pool(workers):
+    """
+    Returns the process pool shared by parallel extractions, created on first use.
+    Its workers are spawned rather than forked, since forking a multithreaded caller
+    (such as the Streamlit server) can deadlock.
+    """
+    global _page_pool, _page_pool_workers
+    with _page_pool_lock:
+        if _page_pool is None or _page_pool_workers < workers:
+            if _page_pool is not None:
+                # Extractions already running on the smaller pool finish there
+                _page_pool.shutdown(wait=False)
+            _page_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _page_pool_workers = workers
+        return _page_pool
+
+def _discard_page_pool(pool):
+    """
+    Drops a broken pool, so the next parallel extraction starts a new one.
+    """
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is pool:
+            _page_pool = None
+    pool.shutdown(wait=False)
+
+def _submit_page_ranges(workers, pdf_path, ranges, time_limit, backend):
+    """
+    Submits _extract_page_range calls to the shared pool, replacing it first if an
+    earlier document broke it. Returns the pool and the futures.
+    """
+    for attempt in range(2):
+        pool = _get_page_pool(workers)
+        try:
+            return pool, [pool.submit(_extract_page_range, pdf_path, first, stop, time_limit, backend)
+                          for first, stop in ranges]
+        except BrokenProcessPool:
+            _discard_page_pool(pool)
+            if attempt:
+                raise
+
+def _page_ranges(n_pages, parts):
+    """
+    Splits n_pages into at most parts contiguous (start, stop) ranges of near-equal size.
+    """
+    parts = min(parts, n_pages)
+    size, extra = divmod(n_pages, parts)
+    ranges = []
+    start = 0
+    for part in range(parts):
+        stop = start + size + (part < extra)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def _iter_page_texts(pdf_path, max_pages=None, time_limit=None, workers=None, backend=None, stats=None):
+    """
+    Yields (page number, header/footer-trimmed text) for the pages of a PDF, in order.
+
+    With workers > 1 and at least PARALLEL_MIN_PAGES pages to extract, the first page
+    is extracted here and timed. If the remaining pages would take PARALLEL_MIN_SECONDS
+    or more at that rate, they are split into contiguous ranges that the shared worker
+    pool extracts independently; ranges are yielded in order as they finish. The time
+    limit then applies to each worker, and pages after the first range it cuts short
+    are dropped, so the output is always a prefix of the document.
+
+    The backends used are added to the current span and, if given, to the stats dict
+    ('pages', 'seconds' and 'fallbacks', as in PDFExtraction).
+    """
+    start = time.perf_counter()
+    total = {'pages': {}, 'seconds': {}, 'fallbacks': {}}
+    try:
+        extractor = _PageExtractor(pdf_path, backend)
+        try:
+            n_pages = len(extractor)
+            if max_pages is not None and n_pages > max_pages:
+                n_pages = max_pages
+                limited = True
+            else:
+                limited = False
+            annotate(pages=n_pages)
+
+            # Handing pages to worker processes costs more than it saves on short documents
+            parallel = bool(workers) and workers > 1 and n_pages >= PARALLEL_MIN_PAGES
+            for page_number in range(n_pages):
+                if time_limit is not None and time.perf_counter() - start > time_limit:
+                    logger.warning("Stopped extracting %s after %d pages (time limit of %ss)", pdf_path, page_number, time_limit)
+                    return
+                if parallel and page_number == 1 and page_seconds * (n_pages - 1) >= PARALLEL_MIN_SECONDS:
+                    break
+                page_start = time.perf_counter()
+                page_text = extractor.page_text(page_number)
+                page_seconds = time.perf_counter() - page_start
+                yield page_number, page_text
+            else:
+                if limited:
+                    logger.warning("Stopped extracting %s after %d pages (page limit)", pdf_path, max_pages)
+                return
+        finally:
+            extractor.close()
+            _merge_stats(total, extractor.stats)
+
+        # Pages 1 to n_pages - 1; the first one was yielded above
+        ranges = [(first + 1, stop + 1) for first, stop in _page_ranges(n_pages - 1, workers)]
+        pool, futures = _submit_page_ranges(workers, pdf_path, ranges, time_limit, extractor.backend.name)
+        try:
+            for (first, _), future in zip(ranges, futures):
+                texts, stopped, range_stats = future.result()
+                _merge_stats(total, range_stats)
+                for offset, page_text in enumerate(texts):
+                    yield first + offset, page_text
+                if stopped:
+                    logger.warning("Stopped extracting %s after %d pages (time limit of %ss)",
+                                   pdf_path, first + len(texts), time_limit)
+                    return
+            if limited:
+                logger.warning("Stopped extracting %s after %d pages (page limit)", pdf_path, max_pages)
+        except BrokenProcessPool:
+            # A worker died (e.g. in a PDF library); this document fails, the next gets a new pool
+            _discard_page_pool(pool)
+            raise
+        finally:
+            # Pages past an early stop are not needed
+            for future in futures:
+                future.cancel()
+    finally:
+        report = PDFExtraction('', total['pages'], total['seconds'], total['fallbacks'])
+        annotate(backend=report.backend, fallback_pages=sum(report.fallbacks.values()))
+        if stats is not None:
+            _merge_stats(stats, total)
+
+def extract_pdf(pdf_path, workers=None, backend=None):
+    """
+    Extracts clean text from a PDF file and reports how it was extracted.
 
     Args:
         pdf_path (str): The path to the PDF file.
+        workers (int, optional): Worker processes to spread the pages over. Documents
+            shorter than PARALLEL_MIN_PAGES or quick to extract, and the default of
+            one worker, are extracted in the calling process. The text is the same
+            either way.
+        backend (str, optional): A registered PDF backend (default: DEFAULT_PDF_BACKEND).
+            Pages whose text fails check_page_text are re-extracted with
+            FALLBACK_PDF_BACKEND.
 
     Returns:
-        str: The extracted and cleaned text.
+        PDFExtraction: The text, plus pages and seconds per backend.
     """
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            # Extract text from the page
-            page_text = page.extract_text()
-
-            # A simple heuristic to remove headers/footers:
-            # Assumes they are in the top/bottom 10% of the page
-            lines = page_text.split('\n')
-            # This can be adjusted based on resume format
-            if len(lines) > 10: # Only filter if there are enough lines
-                filtered_lines = lines[int(len(lines) * 0.05):int(len(lines) * 0.95)]
-            else:
-                filtered_lines = lines
-            text += '\n'.join(filtered_lines)
+    stats = {'pages': {}, 'seconds': {}, 'fallbacks': {}}
+    # Pages are concatenated as they are, then whitespace is normalized once
+    text = ''.join(page_text for _, page_text in _iter_page_texts(pdf_path, workers=workers, backend=backend, stats=stats))
 
     # Remove excessive whitespace
     text = re.sub(r'\s+', ' ', text).strip()
 
-    return text
+    return PDFExtraction(text, stats['pages'], stats['seconds'], stats['fallbacks'])
+
+def extract_text_from_pdf(pdf_path, workers=None, backend=None):
+    """
+    Extracts clean text from a PDF file.
+
+    Args:
+        pdf_path (str): The path to the PDF file.
+        workers (int, optional): Worker processes for long documents, as for extract_pdf.
+        backend (str, optional): A registered PDF backend, as for extract_pdf.
+
+    Returns:
+        str: The extracted and cleaned text.
+    """
+    return extract_pdf(pdf_path, workers, backend).text
+
+def iter_pdf_pages(pdf_path, max_pages=None, max_chars=None, time_limit=None, workers=None, backend=None):
+    """
+    Extracts a PDF page by page, yielding each page's cleaned text as soon as it is ready.
+
+    Each page's layout objects are released once its text is extracted, so peak memory
+    stays flat regardless of document length. Extraction stops early, with a logged
+    warning, when any limit is reached.
+
+    Args:
+        pdf_path (str): The path to the PDF file.
+        max_pages (int, optional): Stop after this many pages.
+        max_chars (int, optional): Stop once this many characters have been yielded;
+            the last page is truncated to fit.
+        time_limit (float, optional): Stop starting new pages after this many seconds.
+        workers (int, optional): Worker processes to spread the pages over, as for
+            extract_pdf. Pages are then yielded a range at a time.
+        backend (str, optional): A registered PDF backend, as for extract_pdf.
+
+    Yields:
+        str: The whitespace-normalized text of each non-empty page. Unlike
+        extract_text_from_pdf, page boundaries are kept, so join pages with a space.
+    """
+    chars = 0
+    pages = _iter_page_texts(pdf_path, max_pages, time_limit, workers, backend)
+    try:
+        for page_number, page_text in pages:
+            annotate(pages=page_number + 1)
+            page_text = re.sub(r'\s+', ' ', page_text).strip()
+            if not page_text:
+                continue
+
+            if max_chars is not None and chars + len(page_text) > max_chars:
+                remaining = max_chars - chars
+                if remaining > 0:
+                    yield page_text[:remaining]
+                logger.warning("Stopped extracting %s at %d characters (character limit)", pdf_path, max_chars)
+                return
+
+            chars += len(page_text)
+            yield page_text
+    finally:
+        pages.close()
 
 def extract_text_from_docx(docx_path):
     """
@@ -44,9 +531,15 @@ def extract_text_from_docx(docx_path):
     text = re.sub(r'\s+', ' ', text).strip()
     return text
 
-def extract_text(file_path):
+@instrumented('extraction', sizes=lambda text, *args, **kwargs: {'chars': len(text)})
+def extract_text(file_path, max_pages=None, max_chars=None, time_limit=None, workers=None, backend=None):
     """
     Extracts text from a file, supporting PDF and DOCX formats.
+
+    Page, character and time limits only apply to PDFs. When any is given, the PDF
+    is extracted page by page with iter_pdf_pages and stops early at the limit.
+    workers spreads the pages of long PDFs over worker processes and backend picks
+    the PDF backend (see extract_pdf).
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"The file was not found at: {file_path}")
@@ -54,8 +547,31 @@ def extract_text(file_path):
     file_extension = os.path.splitext(file_path)[1].lower()
 
     if file_extension == '.pdf':
-        return extract_text_from_pdf(file_path)
+        if max_pages is None and max_chars is None and time_limit is None:
+            return extract_text_from_pdf(file_path, workers, backend)
+        return ' '.join(iter_pdf_pages(file_path, max_pages, max_chars, time_limit, workers, backend))
     elif file_extension == '.docx':
-        return extract_text_from_docx(file_path)
+        text = extract_text_from_docx(file_path)
+        return text[:max_chars] if max_chars is not None else text
     else:
         raise ValueError(f"Unsupported file format: {file_extension}")
+
+def extract_text_from_bytes(data, suffix, max_pages=None, max_chars=None, time_limit=None, workers=None, backend=None):
+    """
+    Extracts text from in-memory file contents, e.g. an upload.
+
+    Args:
+        data (bytes): The file contents.
+        suffix (str): The file extension, e.g. '.pdf' or '.docx'.
+    """
+    if suffix.lower() not in ('.pdf', '.docx'):
+        raise ValueError(f"Unsupported file format: {suffix}")
+
+    # The extractors work on paths, so the bytes go through a temporary file
+    with tempfile.NamedTemporaryFile(suffix=suffix.lower(), delete=False) as f:
+        f.write(data)
+        temp_path = f.name
+    try:
+        return extract_text(temp_path, max_pages, max_chars, time_limit, workers, backend)
+    finally:
+        os.remove(temp_path)
@@ -1,53 +1,190 @@
 
-import nltk
 import re
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
-
-# Download necessary NLTK data (if not already downloaded)
-try:
-    stopwords.words('english')
-except LookupError:
-    nltk.download('stopwords')
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt_tab')
+import threading
+from functools import lru_cache
 
-def preprocess_text(text):
+from .instrumentation import instrumented
+
+# NLTK is imported lazily: importing it takes seconds, and the corpora it needs
+# are checked once by warmup() instead of being probed (or downloaded) at import time.
+# Tokenization no longer uses Punkt, so only these corpora are required.
+REQUIRED_NLTK_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+}
+
+class MissingNLTKDataError(LookupError):
     """
-    Cleans and preprocesses text for NLP analysis.
+    Raised when the bundled NLTK corpora are not installed.
+    """
+
+def find_missing_resources():
+    """
+    Returns the names of required NLTK corpora that cannot be found locally.
+    Never touches the network.
+    """
+    import nltk
+
+    missing = []
+    for name, resource_path in REQUIRED_NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(resource_path)
+        except LookupError:
+            missing.append(name)
+    return missing
+
+_warmup_lock = threading.Lock()
+
+def warmup(download=False):
+    """
+    Checks the required NLTK corpora once and loads them, so the first
+    preprocessing call does not pay for it.
 
     Args:
-        text (str): The input text.
+        download (bool): Try to download missing corpora instead of failing.
+            Leave this off in offline environments.
 
     Returns:
-        str: The preprocessed text.
+        Preprocessor: The process-wide preprocessor, ready to use.
+
+    Raises:
+        MissingNLTKDataError: If corpora are missing and download is off (or failed).
+    """
+    global _default_preprocessor
+    with _warmup_lock:
+        if _default_preprocessor is not None:
+            return _default_preprocessor
+
+        missing = find_missing_resources()
+        if missing and download:
+            import nltk
+
+            for name in missing:
+                nltk.download(name, quiet=True)
+            missing = find_missing_resources()
+        if missing:
+            raise MissingNLTKDataError(
+                f"Missing NLTK data: {', '.join(missing)}. "
+                f"Install it with `python -m nltk.downloader {' '.join(missing)}`, "
+                "or point the NLTK_DATA environment variable at a directory that contains it."
+            )
+
+        _default_preprocessor = Preprocessor()
+        return _default_preprocessor
+
+# Characters kept by preprocessing; everything else is dropped before tokenization
+NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]')
+
+# Once punctuation is stripped, word_tokenize reduces to a whitespace split plus
+# these whole-word contraction splits from the Treebank tokenizer. The remaining
+# contractions it knows ("d'ye", "more'n") need an apostrophe and cannot occur.
+TREEBANK_CONTRACTIONS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
+LEMMA_CACHE_SIZE = 65536
+
+class Preprocessor:
+    """
+    A reusable text preprocessor that produces exactly the same output as
+    preprocess_text, but builds its stopword set, tokenizer and lemmatizer once
+    and memoizes lemmas, since resumes repeat the same words many times.
     """
-    # 1. Lowercasing
-    text = text.lower()
 
-    # 2. Remove punctuation and numbers
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    def __init__(self, lemma_cache_size=LEMMA_CACHE_SIZE):
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
 
-    # 3. Tokenization
-    tokens = word_tokenize(text)
+        self.stop_words = frozenset(stopwords.words('english'))
+        self._lemmatizer = WordNetLemmatizer()
+        self.lemmatize = lru_cache(maxsize=lemma_cache_size)(self._lemmatizer.lemmatize)
 
-    # 4. Remove stopwords
-    stop_words = set(stopwords.words('english'))
-    filtered_tokens = [word for word in tokens if word not in stop_words]
+    def tokenize(self, text):
+        """
+        Lowercases, strips punctuation and numbers, and splits text into tokens.
+        """
+        tokens = []
+        for token in NON_ALPHA_PATTERN.sub('', text.lower()).split():
+            parts = TREEBANK_CONTRACTIONS.get(token)
+            if parts:
+                tokens.extend(parts)
+            else:
+                tokens.append(token)
+        return tokens
 
-    # 5. Lemmatization
-    lemmatizer = WordNetLemmatizer()
-    lemmatized_tokens = [lemmatizer.lemmatize(word) for word in filtered_tokens]
+    def tokens(self, text):
+        """
+        Returns the lemmatized, stopword-free tokens of a text.
+        """
+        stop_words = self.stop_words
+        lemmatize = self.lemmatize
+        return [lemmatize(token) for token in self.tokenize(text) if token not in stop_words]
 
-    return " ".join(lemmatized_tokens)
+    def preprocess(self, text):
+        """
+        Cleans and preprocesses text for NLP analysis.
+
+        Args:
+            text (str): The input text.
+
+        Returns:
+            str: The preprocessed text.
+        """
+        return " ".join(self.tokens(text))
+
+    def preprocess_many(self, texts):
+        """
+        Preprocesses a batch of texts, sharing the lemma cache across all of them.
+
+        Args:
+            texts (iterable): The input texts.
+
+        Returns:
+            list: The preprocessed texts, in input order.
+        """
+        return [self.preprocess(text) for text in texts]
+
+    def preprocess_stream(self, chunks):
+        """
+        Preprocesses text that arrives in chunks, e.g. PDF pages, one chunk at a time.
+        Chunks are treated as separated by whitespace, so joining the non-empty
+        results with spaces gives the same output as preprocessing the joined text.
+
+        Args:
+            chunks (iterable): The input text chunks, in order.
+
+        Yields:
+            str: The preprocessed text of each chunk that has any tokens left.
+        """
+        for chunk in chunks:
+            processed = self.preprocess(chunk)
+            if processed:
+                yield processed
+
+_default_preprocessor = None
+
+def get_preprocessor():
+    """
+    Returns the process-wide Preprocessor, warming it up on first use.
+    """
+    if _default_preprocessor is None:
+        return warmup()
+    return _default_preprocessor
+
+@instrumented('preprocessing', sizes=lambda result, text: {'chars': len(text), 'tokens': result.count(' ') + 1 if result else 0})
+def preprocess_text(text):
+    """
+    Cleans and preprocesses text for NLP analysis.
+
+    Args:
+        text (str): The input text.
+
+    Returns:
+        str: The preprocessed text.
+    """
+    return get_preprocessor().preprocess(text)
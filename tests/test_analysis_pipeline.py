@@ -0,0 +1,69 @@
+
+import unittest
+import os
+import sys
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.analysis_pipeline import AnalysisPipeline
+from src.corpus_model import fit_corpus_model
+from src.keyword_extraction import extract_keywords
+from src.pipeline import gaps
+from src.result_cache import ResultCache
+from src.similarity_scoring import calculate_similarity
+
+class SplitPreprocessor:
+    """Stands in for the NLTK preprocessor: lowercases and splits on whitespace."""
+    def tokens(self, text):
+        return text.lower().split()
+
+RESUME = "python developer built data pipeline in python and spark led data engineering team a b"
+JOB = "senior data engineer python spark airflow pipeline the engineering team lead kubernetes"
+OTHER_JOB = "java backend developer spring microservices team"
+
+class TestAnalysisPipeline(unittest.TestCase):
+
+    def test_matches_stage_functions(self):
+        """Test that keywords, similarity and gaps equal those of the chained stage functions."""
+        analysis = AnalysisPipeline(top_n=6, preprocessor=SplitPreprocessor())
+        resume, jd = analysis.document(RESUME), analysis.document(JOB)
+        self.assertEqual(resume['preprocessed'], RESUME)
+        self.assertEqual(resume['keywords'], extract_keywords(RESUME, top_n=6))
+        self.assertEqual(jd['keywords'], extract_keywords(JOB, top_n=6))
+        self.assertAlmostEqual(analysis.similarity(resume, jd), calculate_similarity(RESUME, JOB), places=9)
+        self.assertEqual(analysis.gaps(resume, jd), gaps(resume['keywords'], jd['keywords'], resume['skills'], jd['skills']))
+        self.assertIn('kubernetes', jd['skills'])
+
+    def test_matches_stage_functions_with_model(self):
+        """Test that keywords and similarity follow a corpus model's vocabulary and IDF."""
+        model = fit_corpus_model([RESUME, JOB, OTHER_JOB], ngram_range=(1, 2), stop_words='english')
+        analysis = AnalysisPipeline(top_n=6, model=model, preprocessor=SplitPreprocessor())
+        resume, jd = analysis.document(RESUME), analysis.document(JOB)
+        self.assertEqual(resume['keywords'], extract_keywords(RESUME, top_n=6, model=model))
+        self.assertAlmostEqual(analysis.similarity(resume, jd), calculate_similarity(RESUME, JOB, model=model), places=9)
+
+    def test_empty_document(self):
+        """Test that a document without terms has no keywords and zero similarity."""
+        analysis = AnalysisPipeline(preprocessor=SplitPreprocessor())
+        empty = analysis.document("a b")
+        self.assertEqual(empty['keywords'], [])
+        self.assertEqual(analysis.similarity(empty, analysis.document(JOB)), 0.0)
+
+    def test_analyze_reuses_cached_documents(self):
+        """Test that a resume analyzed once is not tokenized again for another job."""
+        analysis = AnalysisPipeline(preprocessor=SplitPreprocessor(), cache=ResultCache())
+        first = analysis.analyze(RESUME, JOB)
+        second = analysis.analyze(RESUME, OTHER_JOB)
+        cached = {stage['stage']: stage['cached'] for stage in second.stages}
+        self.assertEqual(cached, {'ats': True, 'document_resume': True, 'document_jd': False,
+                                  'similarity': False, 'gaps': False})
+        self.assertGreater(first.similarity_score, second.similarity_score)
+
+        result = first.to_dict()
+        self.assertNotIn('semantic_score', result)
+        self.assertEqual(result['preprocessed_jd'], JOB)
+        self.assertEqual(result['gaps'], first.gaps)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+
+import unittest
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import uvicorn
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.api import create_app
+from src.api_client import AnalysisClient, ServiceError
+from src.ats_scoring import calculate_ats_score
+from tests.create_dummy_pdf import create_dummy_pdf
+
+class TestAPI(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the service with one worker on a free local port."""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.app = create_app(workers=1, extraction_cache_path=os.path.join(cls.temp_dir, "cache.sqlite3"))
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        cls.server = uvicorn.Server(uvicorn.Config(cls.app, host="127.0.0.1", port=port, log_level="warning"))
+        cls.thread = threading.Thread(target=cls.server.run, daemon=True)
+        cls.thread.start()
+        while not cls.server.started:
+            time.sleep(0.05)
+        cls.client = AnalysisClient(f"http://127.0.0.1:{port}")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+        cls.server.should_exit = True
+        cls.thread.join()
+        shutil.rmtree(cls.temp_dir)
+
+    def test_health(self):
+        """Test that the health check reports the pool."""
+        self.assertEqual(self.client.health()['pool']['workers'], 1)
+
+    def test_ats_runs_in_pool(self):
+        """Test that a pooled stage returns the same result as the library."""
+        resume_text = "jane@example.com (555) 123-4567 Experience Education Skills"
+        score, feedback = calculate_ats_score(resume_text)
+        self.assertEqual(self.client.ats(resume_text), {'score': score, 'feedback': feedback})
+
+    def test_worker_spans_reach_metrics(self):
+        """Test that stage spans recorded in worker processes are exported at /metrics."""
+        self.client.ats("Experience")
+        self.assertIn('resume_optimizer_stage_seconds_count{stage="ats"}', self.client.metrics())
+
+    def test_extract_upload_is_cached(self):
+        """Test that uploads are extracted once and then served from the cache."""
+        pdf_path = os.path.join(self.temp_dir, "resume.pdf")
+        create_dummy_pdf(pdf_path, "This is a dummy resume.")
+        with open(pdf_path, "rb") as f:
+            data = f.read()
+        self.assertEqual(self.client.extract(data, "resume.pdf"), "This is a dummy resume.")
+        self.assertEqual(self.client.extract(data, "resume.pdf"), "This is a dummy resume.")
+        self.assertGreaterEqual(self.client.health()['extraction_cache']['hits'], 1)
+
+    def test_gaps(self):
+        """Test that gap analysis includes explanations."""
+        result = self.client.gaps(["python"], ["python", "sql"])
+        self.assertEqual(result['missing_keywords'], ["sql"])
+        self.assertEqual(len(result['explanations']['missing']), 1)
+
+    def test_skills_feed_gaps(self):
+        """Test that skills found by the service make aliases count as matches."""
+        resume_skills = self.client.skills("Built UIs in JS on k8s")
+        jd_skills = self.client.skills("JavaScript, Kubernetes and Terraform")
+        self.assertEqual(resume_skills, ["javascript", "kubernetes"])
+        result = self.client.gaps(["js"], ["javascript", "terraform"], resume_skills, jd_skills)
+        self.assertEqual(result['strong_matches'], ["javascript"])
+        self.assertEqual(result['missing_skills'], ["terraform"])
+
+    def test_errors(self):
+        """Test that bad input and unsupported uploads are rejected with a status."""
+        with self.assertRaises(ServiceError) as cm:
+            self.client.extract(b"plain text", "resume.txt")
+        self.assertEqual(cm.exception.status_code, 415)
+        for data, filename in [(b"not a pdf at all", "resume.pdf"), (b"not a zip", "resume.docx")]:
+            with self.assertRaises(ServiceError) as cm:
+                self.client.extract(data, filename)
+            self.assertEqual(cm.exception.status_code, 422, filename)
+        with self.assertRaises(ServiceError) as cm:
+            self.client.analyze(b"not a pdf at all", "resume.pdf", jd_text="Python developer")
+        self.assertEqual(cm.exception.status_code, 422)
+        with self.assertRaises(ServiceError) as cm:
+            self.client._request('POST', '/ats', json={})
+        self.assertEqual(cm.exception.status_code, 400)
+        for path, body in [('/ats', {'text': None}), ('/keywords', {'text': "python", 'top_n': "ten"}),
+                           ('/keywords', {'text': "python", 'top_n': 0}), ('/gaps', {'resume_keywords': "python", 'jd_keywords': []})]:
+            with self.assertRaises(ServiceError) as cm:
+                self.client._request('POST', path, json=body)
+            self.assertEqual(cm.exception.status_code, 400, path)
+
+    def test_null_top_n_uses_the_default(self):
+        """Test that a null top_n is treated as absent."""
+        self.assertEqual(self.client._request('POST', '/keywords', json={'text': "python developer", 'top_n': None}),
+                         {'keywords': self.client.keywords("python developer")})
+
+    def test_dead_worker_is_replaced(self):
+        """Test that a request on a pool whose worker died gets 503 and the next one is served."""
+        self.app.state.pool._executor.submit(os._exit, 1).exception()
+        with self.assertRaises(ServiceError) as cm:
+            self.client.ats("Experience")
+        self.assertEqual(cm.exception.status_code, 503)
+        self.assertEqual(self.client.ats("Experience")['score'], calculate_ats_score("Experience")[0])
+
+    def test_saturated_pool_returns_503(self):
+        """Test that work is rejected instead of queued once the pool is saturated."""
+        pool = self.app.state.pool
+        pool.max_pending, max_pending = 0, pool.max_pending
+        try:
+            with self.assertRaises(ServiceError) as cm:
+                self.client.ats("Experience")
+            self.assertEqual(cm.exception.status_code, 503)
+        finally:
+            pool.max_pending = max_pending
+
+if __name__ == '__main__':
+    unittest.main()
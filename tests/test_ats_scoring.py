@@ -0,0 +1,71 @@
+
+import unittest
+import os
+import sys
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ats_scoring import calculate_ats_score, check_action_verbs, check_key_sections
+from src.ats_rules import ATSRuleEngine
+
+class TestATSScoring(unittest.TestCase):
+
+    def test_complete_resume_scores_full_marks(self):
+        """Test that a resume meeting every criterion gets full marks and no feedback."""
+        resume_text = (
+            "Jane Doe jane.doe@example.com (555) 123-4567 Experience Managed a team and "
+            "developed tools that increased revenue by 20%. Education BSc. Skills Python"
+        )
+        self.assertEqual(calculate_ats_score(resume_text), (90, []))
+
+    def test_missing_criteria_feedback_order(self):
+        """Test that feedback is reported in criteria order."""
+        score, feedback = calculate_ats_score("Skills: Python. Led projects.")
+        self.assertEqual(score, 20)
+        self.assertEqual(feedback, [
+            "Missing email address.",
+            "Missing phone number.",
+            "Missing 'Experience' section.",
+            "Missing 'Education' section.",
+            "Add quantifiable achievements to demonstrate your impact (e.g., 'Increased sales by 20%').",
+        ])
+
+    def test_terms_respect_word_boundaries(self):
+        """Test that terms only match whole words, case-insensitively."""
+        self.assertEqual(check_action_verbs("ledger management"), (0, ["Include more action verbs to describe your accomplishments."]))
+        self.assertEqual(check_action_verbs("LED, Managed, created"), (20, []))
+        self.assertEqual(check_key_sections("EXPERIENCE education")[0], 20)
+        # Heading variants in prose are not the section terms
+        self.assertEqual(check_key_sections("Jane. My profile: work history at ACME, 5 years. Education BSc. Skills python"),
+                         (20, ["Missing 'Experience' section."]))
+
+    def test_email_overlapping_a_term_is_found(self):
+        """Test that a pattern starting where a term starts is still detected."""
+        score, feedback = calculate_ats_score("led@example.com")
+        self.assertNotIn("Missing email address.", feedback)
+
+    def test_patterns_starting_at_the_same_character_are_all_found(self):
+        """Test that a pattern hidden by an earlier pattern at the same offset is found."""
+        scan = ATSRuleEngine({
+            'rules': [
+                {'name': 'phone', 'type': 'pattern', 'pattern': r'\d{3}-\d\d', 'points': 10, 'feedback': "No phone."},
+                {'name': 'number', 'type': 'pattern', 'pattern': r'\d{3,}', 'points': 10, 'feedback': "No number."},
+            ],
+        }).scan("Call 555-12")
+        self.assertEqual(scan.patterns, frozenset({'phone', 'number'}))
+
+    def test_custom_config_with_nested_terms(self):
+        """Test that overlapping terms in a custom config are all counted."""
+        engine = ATSRuleEngine({
+            'max_score': 100,
+            'rules': [{
+                'name': 'skills', 'type': 'term_count',
+                'terms': ['machine', 'machine learning', 'learning', 'python'],
+                'tiers': [[3, 40], [1, 10]], 'feedback': "No skills.",
+            }],
+        })
+        self.assertEqual(engine.score("Machine Learning with C++ code"), (40, []))
+
+if __name__ == '__main__':
+    unittest.main()
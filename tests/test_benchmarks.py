@@ -0,0 +1,47 @@
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+# Add the 'src' and 'benchmarks' directories to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+from run_benchmarks import compare
+from synthetic_corpus import generate_corpus
+from src.text_extraction import extract_text
+
+class TestBenchmarks(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_corpus_is_reproducible(self):
+        """Test that the same seed yields the same documents and page counts."""
+        first = generate_corpus(os.path.join(self.temp_dir, "a"), resumes=3, jds=1, seed=5, max_pages=3)
+        second = generate_corpus(os.path.join(self.temp_dir, "b"), resumes=3, jds=1, seed=5, max_pages=3)
+        self.assertEqual(first, second)
+        for entry in first:
+            self.assertLessEqual(entry['pages'], 4)
+            texts = [extract_text(os.path.join(self.temp_dir, d, entry['file'])) for d in ("a", "b")]
+            self.assertEqual(texts[0], texts[1])
+
+    def test_compare_flags_regressions_above_threshold(self):
+        """Test that only slowdowns above the threshold and the noise floor are reported."""
+        def case(p50, rss=100.0):
+            return {'p50_seconds': p50, 'peak_rss_mb': rss}
+        baseline = {'cases': {'a': case(0.010), 'b': case(0.010), 'c': case(0.00001), 'd': case(0.010)}}
+        results = {'cases': {'a': case(0.0105), 'b': case(0.020), 'c': case(0.00005), 'd': case(0.010, rss=150.0),
+                             'e': case(1.0)}}
+        self.assertEqual(compare(results, baseline, threshold=0.10), [
+            ('b', 'p50_seconds', 0.010, 0.020),
+            ('d', 'peak_rss_mb', 100.0, 150.0),
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
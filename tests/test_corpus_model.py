@@ -0,0 +1,66 @@
+
+import unittest
+import os
+import sys
+import tempfile
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.corpus_model import fit_corpus_model, load_corpus_model
+from src.keyword_extraction import extract_keywords
+from src.similarity_scoring import calculate_similarity
+
+class TestCorpusModel(unittest.TestCase):
+
+    def setUp(self):
+        self.documents = [
+            "python developer machine learning",
+            "java developer spring backend",
+            "python data pipeline engineer developer",
+        ]
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.temp_dir.name, "corpus.model")
+        fit_corpus_model(self.documents, ngram_range=(1, 2)).save(self.model_path)
+        self.model = load_corpus_model(self.model_path)
+
+    def test_transform_matches_tfidf_vectorizer(self):
+        """Test that the memory-mapped model reproduces sklearn's TF-IDF vectors."""
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2)).fit(self.documents)
+        expected = vectorizer.transform(self.documents).toarray()
+        actual = self.model.transform(self.documents).toarray()
+        self.assertTrue(np.allclose(expected, actual, atol=1e-6))
+        self.assertEqual(self.model.get_feature_names(), list(vectorizer.get_feature_names_out()))
+
+    def test_lookup_unknown_term(self):
+        """Test that out-of-vocabulary terms are reported as missing."""
+        self.assertEqual(self.model.lookup("kubernetes"), -1)
+        self.assertEqual(self.model.term(self.model.lookup("python developer")), "python developer")
+
+    def test_keywords_and_similarity_accept_model(self):
+        """Test that keyword extraction and similarity scoring use the loaded model."""
+        keywords = extract_keywords(self.documents[0], top_n=3, model=self.model)
+        self.assertEqual(len(keywords), 3)
+        # Terms unique to the document outrank "python" and "developer", which are shared
+        self.assertNotIn("python", keywords)
+        self.assertNotIn("developer", keywords)
+        score = calculate_similarity(self.documents[0], self.documents[0], model=self.model)
+        self.assertAlmostEqual(score, 100.0, places=4)
+
+    def test_close_while_a_view_is_held(self):
+        """Test that closing the model does not invalidate arrays taken from it."""
+        idf = self.model.idf
+        expected = idf.copy()
+        self.model.close()
+        self.assertIsNone(self.model.idf)
+        self.assertTrue(np.array_equal(idf, expected))
+
+    def tearDown(self):
+        self.model.close()
+        self.temp_dir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+from unittest import mock
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.extraction_cache import ExtractionCache, content_key
+from tests.create_dummy_pdf import create_dummy_pdf
+
+class TestExtractionCache(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a dummy PDF and an empty cache."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "resume.pdf")
+        create_dummy_pdf(self.pdf_path, "This is a dummy resume.")
+        self.cache = ExtractionCache(os.path.join(self.temp_dir, "cache.sqlite3"))
+
+    def test_repeat_extraction_is_a_hit(self):
+        """Test that the second extraction of the same bytes skips the extractor."""
+        with open(self.pdf_path, "rb") as f:
+            data = f.read()
+        text = self.cache.extract_bytes(data, ".pdf")
+        self.assertIn("This is a dummy resume.", text)
+
+        with mock.patch('src.extraction_cache.extract_text_from_bytes') as extract_text:
+            self.assertEqual(self.cache.extract_file(self.pdf_path), text)
+            extract_text.assert_not_called()
+
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_lru_eviction_respects_budget(self):
+        """Test that the least recently used entries are evicted over the size budget."""
+        self.cache.max_bytes = 25
+        self.cache.put(content_key(b"a"), "x" * 10)
+        self.cache.put(content_key(b"b"), "y" * 10)
+        self.cache.get(content_key(b"a"))
+        self.cache.put(content_key(b"c"), "z" * 10)
+
+        self.assertIsNotNone(self.cache.get(content_key(b"a")))
+        self.assertIsNone(self.cache.get(content_key(b"b")))
+        self.assertLessEqual(self.cache.stats()['bytes'], 25)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+
+import unittest
+import os
+import sys
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.analysis_pipeline import AnalysisPipeline
+from src.corpus_model import fit_corpus_model
+from src.incremental_analysis import IncrementalAnalysis
+from src.resume_updater import TextEdit, add_keywords_to_resume, keyword_edits
+
+class SplitPreprocessor:
+    """Stands in for the NLTK preprocessor: lowercases and splits on whitespace."""
+    def tokens(self, text):
+        return text.lower().split()
+
+RESUME = (
+    "Jane Doe\njane@example.com\n\nSummary\nData engineer who built a data pipeline in python and spark.\n"
+    + "Managed a team of 5 engineers and reduced costs by 20%.\n" * 60
+    + "\nSkills\n- SQL\n- python\n\nExperience\nAnalyst at Initech\n\nEducation\nBSc Computer Science\n"
+)
+JOB = "senior data engineer python spark airflow kubernetes docker pipeline engineering team java script"
+
+def comparable(result):
+    result = result.to_dict()
+    del result['stages']
+    return result, result.pop('similarity_score')
+
+class TestIncrementalAnalysis(unittest.TestCase):
+
+    def assertMatchesFullAnalysis(self, analysis, incremental, edits, edited_text):
+        updated, similarity = comparable(incremental.update(edits))
+        full, full_similarity = comparable(analysis.analyze(edited_text, JOB))
+        self.assertEqual(updated, full)
+        self.assertAlmostEqual(similarity, full_similarity, places=9)
+
+    def test_keyword_additions_match_full_analysis(self):
+        """Test that updating for the updater's edits gives the analysis of the updated resume."""
+        for model in (None, fit_corpus_model([RESUME, JOB], ngram_range=(1, 2), stop_words='english')):
+            analysis = AnalysisPipeline(top_n=8, model=model, preprocessor=SplitPreprocessor())
+            incremental = IncrementalAnalysis(analysis, RESUME, JOB)
+            self.assertMatchesFullAnalysis(analysis, incremental, [], RESUME)
+
+            keywords = ["airflow", "kubernetes", "docker", "java script"]
+            edits = keyword_edits(RESUME, keywords)
+            self.assertMatchesFullAnalysis(analysis, incremental, edits, add_keywords_to_resume(RESUME, keywords))
+            result = incremental.update(edits)
+            self.assertIn("javascript", result.resume_skills)
+            self.assertNotIn("kubernetes", result.gaps['missing_skills'])
+
+    def test_removals_and_rule_hits_lost(self):
+        """Test that removing text, including the only email address, updates every score."""
+        analysis = AnalysisPipeline(top_n=8, preprocessor=SplitPreprocessor())
+        incremental = IncrementalAnalysis(analysis, RESUME, JOB)
+        start = RESUME.index("jane@")
+        edits = [TextEdit(start, start + len("jane@example.com"), "Portland"), TextEdit(len(RESUME) - 30, len(RESUME) - 20, "")]
+        edited = RESUME[:start] + "Portland" + RESUME[start + len("jane@example.com"):len(RESUME) - 30] + RESUME[len(RESUME) - 20:]
+        self.assertMatchesFullAnalysis(analysis, incremental, edits, edited)
+        self.assertLess(incremental.update(edits).ats_score, incremental.result.ats_score)
+        self.assertIs(incremental.update([]), incremental.result)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+
+import unittest
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest import mock
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import ingestion
+from src.ingestion import JsonlSink, ingest, iter_input_paths
+from tests.create_dummy_pdf import create_dummy_pdf
+
+def crash_worker(path):
+    """Ends the worker process the way an out-of-memory kill would."""
+    os._exit(1)
+
+def swallowing_worker(path):
+    """Catches every Exception while it works, as some extraction library code does."""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            time.sleep(0.01)
+        except Exception:
+            pass
+    return "finished"
+
+class TestIngestion(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a directory of dummy PDFs and one broken file."""
+        self.input_dir = tempfile.mkdtemp()
+        for i in range(3):
+            create_dummy_pdf(os.path.join(self.input_dir, f"resume_{i}.pdf"), f"Resume number {i}.")
+        with open(os.path.join(self.input_dir, "broken.pdf"), "wb") as f:
+            f.write(b"not a pdf")
+        with open(os.path.join(self.input_dir, "notes.txt"), "w") as f:
+            f.write("ignored")
+        self.output_path = os.path.join(self.input_dir, "out.jsonl")
+
+    def test_iter_input_paths_filters_extensions(self):
+        """Test that only PDF and DOCX files are picked up."""
+        paths = list(iter_input_paths(self.input_dir))
+        self.assertEqual(len(paths), 4)
+
+    def test_ingest_writes_records_and_resumes(self):
+        """Test that every file gets a record and a second run skips them."""
+        stats = ingest(iter_input_paths(self.input_dir), JsonlSink(self.output_path), workers=2, timeout=30)
+        self.assertEqual(stats['files'], 4)
+        self.assertEqual(stats['ok'], 3)
+        self.assertEqual(stats['errors'], 1)
+
+        with open(self.output_path) as f:
+            records = {os.path.basename(r['path']): r for r in map(json.loads, f)}
+        self.assertIn("Resume number 1.", records['resume_1.pdf']['text'])
+        self.assertEqual(records['broken.pdf']['status'], 'error')
+
+        stats = ingest(iter_input_paths(self.input_dir), JsonlSink(self.output_path), workers=2)
+        self.assertEqual(stats['files'], 0)
+
+        stats = ingest(iter_input_paths(self.input_dir), JsonlSink(self.output_path), workers=2, retry_errors=True)
+        self.assertEqual(stats['files'], 1)
+
+    def test_resume_after_a_partial_line(self):
+        """Test that the first record of a resumed run does not join a line cut off by a crash."""
+        with open(self.output_path, "w") as f:
+            f.write('{"path": "a.pdf", "status": "ok"}\n{"path": "b.pd')
+        sink = JsonlSink(self.output_path)
+        sink.write({'path': "c.pdf", 'status': 'ok'})
+        sink.close()
+        self.assertEqual(JsonlSink(self.output_path).completed_paths(), {"a.pdf", "c.pdf"})
+
+    @unittest.skipIf(multiprocessing.get_start_method() != 'fork', "workers must inherit the patched extractors")
+    def test_ingest_survives_a_worker_crash(self):
+        """Test that only the file whose worker dies is recorded as failed, not the files pending beside it."""
+        crash_path = os.path.join(self.input_dir, "crash.crash")
+        open(crash_path, "w").close()
+        resumes = [os.path.join(self.input_dir, f"resume_{i}.pdf") for i in range(3)]
+        paths = resumes[:1] + [crash_path] + resumes[1:]
+        with mock.patch.dict(ingestion.EXTRACTORS, {'.crash': crash_worker}):
+            for workers, max_pending in [(1, 1), (2, 8)]:
+                if os.path.exists(self.output_path):
+                    os.remove(self.output_path)
+                stats = ingest(paths, JsonlSink(self.output_path), workers=workers, max_pending=max_pending, timeout=30)
+                self.assertEqual((stats['files'], stats['ok'], stats['errors']), (4, 3, 1))
+
+                with open(self.output_path) as f:
+                    records = {os.path.basename(r['path']): r for r in map(json.loads, f)}
+                self.assertEqual(records['crash.crash']['error'], "Worker process stopped unexpectedly")
+                self.assertEqual({name: r['status'] for name, r in records.items() if name != 'crash.crash'},
+                                 {"resume_0.pdf": 'ok', "resume_1.pdf": 'ok', "resume_2.pdf": 'ok'})
+
+    @unittest.skipIf(multiprocessing.get_start_method() != 'fork', "workers must inherit the patched extractors")
+    def test_timeout_escapes_except_exception(self):
+        """Test that library code catching Exception cannot swallow the per-file timeout."""
+        slow_path = os.path.join(self.input_dir, "slow.slow")
+        open(slow_path, "w").close()
+        with mock.patch.dict(ingestion.EXTRACTORS, {'.slow': swallowing_worker}):
+            stats = ingest([slow_path], JsonlSink(self.output_path), workers=1, timeout=0.2)
+        self.assertEqual(stats['timeouts'], 1)
+
+    def tearDown(self):
+        shutil.rmtree(self.input_dir)
+
+if __name__ == '__main__':
+    unittest.main()
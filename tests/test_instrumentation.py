@@ -0,0 +1,68 @@
+
+import unittest
+import os
+import sys
+
+import numpy as np
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.instrumentation import annotate, call_traced, instrumented, percentile, registry, span, trace_request
+from src.gap_analysis import analyze_gaps
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        registry.reset()
+
+    def test_span_records_latency_and_sizes(self):
+        """Test that spans land in the registry with their size attributes."""
+        with span('extraction', chars=120):
+            annotate(pages=3)
+        with span('extraction', chars=80):
+            pass
+        summary = registry.summary()['extraction']
+        self.assertEqual((summary['count'], summary['errors']), (2, 0))
+        text = registry.render_prometheus()
+        self.assertIn('resume_optimizer_stage_seconds_count{stage="extraction"} 2', text)
+        self.assertIn('resume_optimizer_stage_input_total{stage="extraction",attribute="chars"} 200', text)
+        self.assertIn('resume_optimizer_stage_input_total{stage="extraction",attribute="pages"} 3', text)
+
+    def test_errors_are_counted(self):
+        """Test that a failing stage is recorded as an error and the exception propagates."""
+        with self.assertRaises(ValueError):
+            with span('similarity'):
+                raise ValueError("boom")
+        self.assertEqual(registry.summary()['similarity']['errors'], 1)
+
+    def test_instrumented_stage_functions(self):
+        """Test that decorated pipeline stages report spans with input sizes."""
+        with trace_request(request_id="req-1") as trace:
+            analyze_gaps(["python"], ["python", "sql"])
+        self.assertEqual(trace.spans[0]['stage'], 'gaps')
+        self.assertEqual(trace.spans[0]['attributes'], {'keywords': 3})
+
+    def test_nested_spans_know_their_parent(self):
+        """Test that nested spans record the enclosing stage."""
+        outer = instrumented('outer')(lambda: analyze_gaps([], ["sql"]))
+        with trace_request() as trace:
+            outer()
+        self.assertEqual([(s['stage'], s['parent']) for s in trace.spans], [('gaps', 'outer'), ('outer', None)])
+
+    def test_percentiles_match_numpy(self):
+        """Test that interpolated percentiles agree with numpy's default."""
+        values = sorted(np.random.default_rng(0).random(101).tolist())
+        for q in (0.5, 0.95, 0.99):
+            self.assertAlmostEqual(percentile(values, q), float(np.percentile(values, q * 100)))
+
+    def test_call_traced_profiles(self):
+        """Test that a traced call returns its spans and CPU and memory profiles."""
+        result, trace = call_traced(analyze_gaps, (["a"], ["a", "b"]), cpu_profile=True, memory_profile=True)
+        self.assertEqual(result['missing_keywords'], ["b"])
+        self.assertEqual([s['stage'] for s in trace['spans']], ['gaps'])
+        self.assertIn('analyze_gaps', trace['cpu_profile'])
+        self.assertGreater(trace['memory_peak_bytes'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.analysis_pipeline import AnalysisPipeline
+from src.corpus_model import fit_corpus_model
+from src.jd_store import JDStore
+
+class SplitPreprocessor:
+    """Stands in for the NLTK preprocessor: lowercases and splits on whitespace."""
+    def tokens(self, text):
+        return text.lower().split()
+
+class CountingPipeline(AnalysisPipeline):
+    def __init__(self, **kwargs):
+        super().__init__(preprocessor=SplitPreprocessor(), **kwargs)
+        self.documents = []
+
+    def document(self, text, preprocessed=None):
+        self.documents.append(text)
+        return super().document(text, preprocessed)
+
+JOB = "senior data engineer python spark airflow kubernetes pipeline engineering team"
+RESUME = "python developer built spark data pipeline on kubernetes"
+
+class TestJDStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "jd_store.sqlite3")
+        self.store = JDStore(self.path)
+
+    def test_artifacts_are_computed_once_and_persisted(self):
+        """Test that a registered JD is processed once, also across reopening the store."""
+        analysis = CountingPipeline()
+        artifacts = self.store.put("REQ-1", JOB, analysis)
+        self.assertEqual(self.store.put("REQ-1", JOB, analysis), artifacts)
+        self.store.close()
+
+        self.store = JDStore(self.path)
+        self.assertEqual(self.store.ids(), ["REQ-1"])
+        self.assertEqual(self.store.get("REQ-1", analysis), (JOB, artifacts))
+        self.assertEqual(analysis.documents, [JOB])
+
+    def test_changed_text_or_settings_refresh_artifacts(self):
+        """Test that new text under an ID, or other analysis settings, recompute the artifacts."""
+        analysis = CountingPipeline()
+        self.store.put("REQ-1", JOB)
+        self.assertEqual(self.store.get("REQ-1", analysis)[1]['preprocessed'], JOB)
+
+        self.store.put("REQ-1", JOB + " terraform", analysis)
+        text, artifacts = self.store.get("REQ-1", analysis)
+        self.assertEqual(text, JOB + " terraform")
+        self.assertEqual(artifacts['preprocessed'], JOB + " terraform")
+
+        model = fit_corpus_model([JOB, RESUME], stop_words='english')
+        with_model = CountingPipeline(model=model)
+        self.assertEqual(self.store.get("REQ-1", with_model)[1], with_model.document(JOB + " terraform"))
+        self.assertEqual(len(self.store), 1)
+        with self.assertRaises(KeyError):
+            self.store.get("REQ-2", analysis)
+
+    def test_analysis_with_stored_jd_matches_full_analysis(self):
+        """Test that analyzing against stored artifacts gives the same result without processing the JD."""
+        model = fit_corpus_model([JOB, RESUME], ngram_range=(1, 2), stop_words='english')
+        analysis = CountingPipeline(model=model)
+        self.store.put("REQ-1", JOB, analysis)
+        _, artifacts = self.store.get("REQ-1", analysis)
+        analysis.documents.clear()
+
+        stored = analysis.analyze(RESUME, JOB, artifacts).to_dict()
+        self.assertEqual(analysis.documents, [RESUME])
+        full = analysis.analyze(RESUME, JOB).to_dict()
+        for result in (stored, full):
+            del result['stages']
+        self.assertEqual(stored, full)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
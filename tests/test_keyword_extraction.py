@@ -0,0 +1,37 @@
+
+import unittest
+import os
+import sys
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.keyword_extraction import extract_keywords, extract_keywords_batch
+
+class TestKeywordExtraction(unittest.TestCase):
+
+    def test_extract_keywords_ranks_by_frequency(self):
+        """Test that the most frequent n-grams come first, ties alphabetically."""
+        text = "python python python developer developer sql"
+        self.assertEqual(extract_keywords(text, top_n=3), ["python", "developer", "python python"])
+
+    def test_batch_matches_single_document(self):
+        """Test that batching documents does not change any document's keywords."""
+        texts = ["python developer machine learning", "java spring backend java", "designer"]
+        self.assertEqual(extract_keywords_batch(texts, top_n=5), [extract_keywords(text, top_n=5) for text in texts])
+
+    def test_empty_documents(self):
+        """Test that documents without usable terms get no keywords."""
+        self.assertEqual(extract_keywords("the and of"), [])
+        self.assertEqual(extract_keywords_batch(["", "python"]), [[], ["python"]])
+
+    def test_dedupe_suppresses_nested_ngrams(self):
+        """Test that nested n-grams of a selected keyword are suppressed."""
+        text = "machine learning engineer machine learning models machine learning"
+        keywords = extract_keywords(text, top_n=3, dedupe=True)
+        self.assertEqual(keywords[0], "machine learning")
+        self.assertNotIn("machine", keywords)
+        self.assertNotIn("learning", keywords)
+
+if __name__ == '__main__':
+    unittest.main()
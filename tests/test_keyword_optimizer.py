@@ -0,0 +1,68 @@
+
+import unittest
+import os
+import sys
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ats_scoring import calculate_ats_score
+from src.corpus_model import fit_corpus_model
+from src.keyword_optimizer import KeywordOptimizer
+from src.resume_updater import add_keywords_to_resume
+from src.similarity_scoring import calculate_similarity
+
+RESUME = "Jane Doe\njane@example.com\n\nExperience\nManaged data pipelines in python.\n"
+PREPROCESSED_RESUME = "jane doe experience managed data pipeline python"
+JOBS = {
+    'data': ("data engineer python spark spark airflow kubernetes pipeline", ["spark", "airflow", "kubernetes", "sql"]),
+    'web': ("frontend engineer react typescript graphql react", ["react", "typescript", "graphql", "sql"]),
+}
+
+class TestKeywordOptimizer(unittest.TestCase):
+
+    def setUp(self):
+        self.optimizer = KeywordOptimizer(RESUME, PREPROCESSED_RESUME)
+        for name, (jd, candidates) in JOBS.items():
+            self.optimizer.add_job(name, jd, candidates)
+
+    def test_incremental_scores_match_full_rescoring(self):
+        """Test that similarity and ATS updates equal re-vectorizing and re-scoring the updated resume."""
+        for name, (jd, _) in JOBS.items():
+            self.assertAlmostEqual(self.optimizer.similarity(name), calculate_similarity(PREPROCESSED_RESUME, jd))
+            for keywords in (["spark"], ["spark", "airflow"], ["react", "sql", "kubernetes"]):
+                result = self.optimizer.evaluate(name, keywords)
+                added = " ".join(sorted(keywords))
+                self.assertAlmostEqual(result.similarity, calculate_similarity(PREPROCESSED_RESUME + " " + added, jd))
+                self.assertEqual(result.ats_score, calculate_ats_score(add_keywords_to_resume(RESUME, keywords))[0])
+                self.assertAlmostEqual(result.similarity_delta, result.similarity - self.optimizer.similarity(name))
+
+    def test_adding_a_skills_section_gains_ats_points(self):
+        """Test that the first keyword's ATS gain includes the new Skills section."""
+        gains = {gain.keyword: gain for gain in self.optimizer.marginal_gains('data')}
+        self.assertEqual(gains['sql'].ats_gain, 10)
+        # A term the job description never uses only lengthens the resume vector
+        self.assertLess(gains['sql'].similarity_gain, 0)
+        self.assertGreater(gains['spark'].similarity_gain, gains['kubernetes'].similarity_gain)
+
+    def test_greedy_best_keywords_per_job(self):
+        """Test that the greedy selection picks the strongest keywords for each job."""
+        best = self.optimizer.best_keywords_per_job(2)
+        self.assertEqual(best['data'].keywords, ('airflow', 'spark'))
+        # typescript and graphql tie; ties go alphabetically
+        self.assertEqual(best['web'].keywords, ('graphql', 'react'))
+        self.assertGreater(best['data'].similarity_delta, 0)
+        # Keywords that add nothing stop the selection early
+        self.assertEqual(len(self.optimizer.best_keywords('data', 10).keywords), 3)
+
+    def test_corpus_model_similarity(self):
+        """Test that a corpus model's fixed IDF is used when given."""
+        model = fit_corpus_model([PREPROCESSED_RESUME] + [jd for jd, _ in JOBS.values()])
+        optimizer = KeywordOptimizer(RESUME, PREPROCESSED_RESUME, model=model)
+        jd, candidates = JOBS['data']
+        optimizer.add_job('data', jd, candidates)
+        self.assertAlmostEqual(optimizer.similarity('data', ["spark"]),
+                               calculate_similarity(PREPROCESSED_RESUME + " spark", jd, model=model), places=5)
+
+if __name__ == '__main__':
+    unittest.main()
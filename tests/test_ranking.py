@@ -0,0 +1,49 @@
+
+import unittest
+import os
+import sys
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ranking import rank_resumes, score_matrix, fit_vectorizer
+from src.similarity_scoring import calculate_similarity
+
+class TestRanking(unittest.TestCase):
+
+    def setUp(self):
+        self.jd_text = "python developer machine learning data pipeline"
+        self.resumes = {
+            'alice': "python developer machine learning model",
+            'bob': "java developer spring backend",
+            'carol': "graphic designer illustrator",
+        }
+
+    def test_rank_resumes_orders_by_score(self):
+        """Test that the best matching resume is ranked first."""
+        ranking = rank_resumes(self.jd_text, self.resumes)
+        self.assertEqual([resume_id for resume_id, _ in ranking], ['alice', 'bob', 'carol'])
+        self.assertEqual(ranking[-1][1], 0.0)
+
+    def test_rank_resumes_top_n_and_list_input(self):
+        """Test that list input uses positions as IDs and top_n truncates."""
+        ranking = rank_resumes(self.jd_text, list(self.resumes.values()), top_n=1)
+        self.assertEqual(len(ranking), 1)
+        self.assertEqual(ranking[0][0], 0)
+
+    def test_matches_pairwise_similarity(self):
+        """Test that a vectorizer fitted on one pair reproduces calculate_similarity."""
+        resume_text = self.resumes['alice']
+        vectorizer = fit_vectorizer([resume_text, self.jd_text])
+        ranking = rank_resumes(self.jd_text, [resume_text], vectorizer=vectorizer)
+        self.assertAlmostEqual(ranking[0][1], calculate_similarity(resume_text, self.jd_text))
+
+    def test_score_matrix_shape(self):
+        """Test that many JDs are scored against many resumes in one product."""
+        jds = [self.jd_text, "graphic designer"]
+        scores = score_matrix(jds, list(self.resumes.values()))
+        self.assertEqual(scores.shape, (2, 3))
+        self.assertEqual(scores[1].argmax(), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+
+import unittest
+import io
+import os
+import sys
+import tempfile
+
+import docx
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.document_generation import generate_docx
+from src.rendering import render, render_batch
+from src.resume_template import generate_professional_template, template_blocks
+
+RESUME = (
+    "Jane Doe\n"
+    "jane.doe@example.com | (555) 123-4567\n"
+    "\n"
+    "Skills\n"
+    "Python, R&D <tooling>\n"
+    "\n"
+    "Experience\n"
+    "Engineer, Acme, 2020\n"
+    "Built pipelines.\n"
+)
+
+def docx_paragraphs(data):
+    return [p.text for p in docx.Document(io.BytesIO(data)).paragraphs if p.text]
+
+class TestRendering(unittest.TestCase):
+
+    def test_template_string_matches_blocks(self):
+        """Test that the HTML-like template is built from the same blocks as the documents."""
+        self.assertEqual(template_blocks(RESUME)[:2], [('h1', "Jane Doe"), ('p', "jane.doe@example.com | (555) 123-4567")])
+        self.assertIn("<ul>\n  <li>Python</li>\n  <li>R&D <tooling></li>\n</ul>\n", generate_professional_template(RESUME))
+
+    def test_render_both_formats_in_memory(self):
+        """Test that PDF and DOCX bytes are produced, with markup characters kept as text."""
+        files = render(RESUME)
+        self.assertTrue(files['pdf'].startswith(b'%PDF'))
+        self.assertEqual(docx_paragraphs(files['docx']), [
+            "Jane Doe", "jane.doe@example.com | (555) 123-4567", "Skills", "Python", "R&D <tooling>",
+            "Experience", "Engineer, Acme, 2020\nBuilt pipelines.",
+        ])
+        with self.assertRaises(ValueError):
+            render(RESUME, ('rtf',))
+
+    def test_generate_docx_writes_rendered_bytes(self):
+        """Test that the file-based API writes the same document as render."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "resume.docx")
+            generate_docx(RESUME, path)
+            with open(path, 'rb') as f:
+                self.assertEqual(docx_paragraphs(f.read()), docx_paragraphs(render(RESUME, ('docx',))['docx']))
+
+    def test_batch_in_workers_matches_serial(self):
+        """Test that rendering a batch in worker processes keeps input order and content."""
+        texts = [RESUME.replace("Acme", f"Company {i}") for i in range(5)]
+        serial = render_batch(texts, ('docx',), workers=1)
+        parallel = render_batch(texts, ('docx',), workers=2)
+        self.assertEqual([docx_paragraphs(r['docx']) for r in parallel], [docx_paragraphs(r['docx']) for r in serial])
+        self.assertIn("Engineer, Company 3, 2020\nBuilt pipelines.", docx_paragraphs(parallel[3]['docx']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+
+import unittest
+import os
+import sys
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.pipeline import run_stage
+from src.result_cache import ResultCache, content_hash, stage_key
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResultCache(max_bytes=10_000, ttl=60, clock=self.clock)
+
+    def test_get_or_compute_computes_once(self):
+        """Test that a stage is computed on the first call and served from the cache after."""
+        calls = []
+        compute = lambda: calls.append(1) or ["python", "sql"]
+        self.assertEqual(self.cache.get_or_compute("keywords:abc", compute), (["python", "sql"], False))
+        self.assertEqual(self.cache.get_or_compute("keywords:abc", compute), (["python", "sql"], True))
+        self.assertEqual(len(calls), 1)
+
+    def test_entries_expire_after_ttl(self):
+        """Test that entries older than the TTL are treated as missing."""
+        self.cache.put("ats:abc", {'score': 90})
+        self.clock.now = 59
+        self.assertEqual(self.cache.get("ats:abc"), {'score': 90})
+        self.clock.now = 61
+        self.assertIsNone(self.cache.get("ats:abc"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction_respects_budget(self):
+        """Test that least recently used entries are evicted over the memory budget."""
+        for i in range(3):
+            self.cache.put(f"preprocess:{i}", "x" * 3000)
+        self.cache.get("preprocess:0")
+        self.cache.put("preprocess:3", "x" * 3000)
+        self.assertIsNone(self.cache.get("preprocess:1"))
+        self.assertIsNotNone(self.cache.get("preprocess:0"))
+        self.assertLessEqual(self.cache.stats()['bytes'], 10_000)
+
+    def test_oversized_value_is_not_stored(self):
+        """Test that a value larger than the whole budget is skipped."""
+        self.cache.put("preprocess:big", "x" * 20_000)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_run_stage_records_timings(self):
+        """Test that stage records report whether each run was served from the cache."""
+        stages = []
+        key = stage_key('ats', content_hash("resume"))
+        run_stage(stages, self.cache, 'ats', key, lambda: {'score': 10})
+        run_stage(stages, self.cache, 'ats', key, lambda: {'score': 10})
+        self.assertEqual([stage['cached'] for stage in stages], [False, True])
+        self.assertTrue(all(stage['seconds'] >= 0 for stage in stages))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+
+import unittest
+import os
+import sys
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.resume_parser import parse_resume
+from src.resume_template import generate_professional_template
+from src.resume_updater import TextEdit, add_keywords_to_resume, apply_edits, keyword_edits
+
+RESUME = (
+    "Jane Doe\n"
+    "jane.doe@example.com | (555) 123-4567\n"
+    "\n"
+    "Summary\n"
+    "Engineer with experience in data platforms.\n"
+    "\n"
+    "Technical Skills:\n"
+    "- Python\n"
+    "- SQL, Spark\n"
+    "\n"
+    "Work Experience\n"
+    "Engineer, Acme, 2020\n"
+    "Built pipelines.\n"
+    "\n"
+    "Analyst, Initech, 2018\n"
+    "\n"
+    "Education\n"
+    "BSc Computer Science\n"
+)
+
+class TestResumeParser(unittest.TestCase):
+
+    def test_sections_and_offsets(self):
+        """Test that each section is found once, in order, with offsets into the text."""
+        resume = parse_resume(RESUME)
+        self.assertEqual([s.kind for s in resume.sections], ['summary', 'skills', 'experience', 'education'])
+        self.assertEqual(resume.name.text, "Jane Doe")
+        self.assertEqual(resume.email.text, "jane.doe@example.com")
+        self.assertEqual(resume.phone.text, "(555) 123-4567")
+        self.assertEqual(resume.header.text, "Jane Doe\njane.doe@example.com | (555) 123-4567")
+        self.assertEqual([skill.text for skill in resume.skills], ["Python", "SQL", "Spark"])
+        self.assertEqual([entry.text for entry in resume.experience],
+                         ["Engineer, Acme, 2020\nBuilt pipelines.", "Analyst, Initech, 2018"])
+        self.assertEqual(resume.education.text, "BSc Computer Science")
+        # 'experience' inside the summary is prose, not the start of the section
+        self.assertEqual(resume.summary.text, "Engineer with experience in data platforms.")
+        for span in (resume.name, resume.summary, resume.education) + resume.skills + resume.experience:
+            self.assertEqual(RESUME[span.start:span.end], span.text)
+
+    def test_unbroken_text_falls_back_to_first_occurrence(self):
+        """Test that extracted text without line breaks is still segmented."""
+        resume = parse_resume("Jane Doe Skills Python, SQL Experience Built pipelines Education BSc")
+        self.assertEqual([skill.text for skill in resume.skills], ["Python", "SQL"])
+        self.assertEqual([entry.text for entry in resume.experience], ["Built pipelines"])
+        self.assertFalse(resume.section('skills').line_start)
+
+    def test_consumers_share_the_parse(self):
+        """Test that the template and updater agree on the same sections."""
+        template = generate_professional_template(RESUME)
+        self.assertIn("<h1>Jane Doe</h1>", template)
+        self.assertIn("  <li>Spark</li>\n", template)
+        self.assertIn("<p>Analyst, Initech, 2018</p>", template)
+
+        updated = add_keywords_to_resume(RESUME, ["spark", "docker"])
+        self.assertIn("- SQL, Spark\n- docker\n\nWork Experience", updated)
+        self.assertEqual(parse_resume(updated).skills[-1].text, "docker")
+
+    def test_updater_ignores_skills_in_prose(self):
+        """Test that 'skills' inside a sentence does not receive the new keywords."""
+        text = "Summary\nStrong communication skills.\n"
+        self.assertEqual(add_keywords_to_resume(text, ["python"]), text + "\n\nSkills\n- python")
+
+    def test_keyword_edits(self):
+        """Test that the updater's edits rebuild its output and overlapping edits are rejected."""
+        inline = "Skills: SQL  Experience: Analyst"
+        for text in (RESUME, inline, "Summary\nAnalyst.\n"):
+            edits = keyword_edits(text, ["spark", "docker"])
+            self.assertEqual(apply_edits(text, edits), add_keywords_to_resume(text, ["spark", "docker"]))
+        self.assertEqual(keyword_edits(RESUME, ["sql"]), [])
+        with self.assertRaises(ValueError):
+            apply_edits(inline, [TextEdit(0, 5, "a"), TextEdit(3, 4, "b")])
+
+if __name__ == '__main__':
+    unittest.main()
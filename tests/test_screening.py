@@ -0,0 +1,126 @@
+
+import unittest
+import io
+import os
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import screening
+from src.extraction_cache import ExtractionCache
+from src.pipeline import DEFAULT_EXTRACTION_LIMITS
+from src.screening import (UnreadableDocument, count_upload_documents, error_row, iter_upload_documents,
+                           rank_rows, screen_resumes)
+from src.text_preprocessing import find_missing_resources
+from tests.create_dummy_pdf import create_dummy_pdf
+
+JOB_DESCRIPTION = "Python developer with Kubernetes and JavaScript experience"
+
+def zip_of(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+class StubClient:
+    """Answers like the analysis service, for screening through threads."""
+    def analyze(self, data, name, jd_text=None):
+        return {'similarity_score': 50.0, 'ats_score': 40, 'gaps': {}, 'resume_text': data.decode()}
+
+def fail_to_start():
+    raise RuntimeError("worker failed to start")
+
+class TestScreening(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.resumes = {}
+        for name, text in [("strong.pdf", "Python developer, Kubernetes and JS experience"), ("weak.pdf", "Pastry chef")]:
+            path = os.path.join(self.temp_dir.name, name)
+            create_dummy_pdf(path, text)
+            with open(path, 'rb') as f:
+                self.resumes[name] = f.read()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_zip_upload_expands_to_documents(self):
+        """Test that a zip yields its PDF and DOCX members, and unreadable ones are flagged."""
+        data = zip_of({"batch/a.pdf": b"a", "batch/b.docx": b"b", "batch/notes.txt": b"c", "__MACOSX/batch/._a.pdf": b"d"})
+        self.assertEqual(list(iter_upload_documents("cands.zip", data)),
+                         [("cands.zip/batch/a.pdf", b"a"), ("cands.zip/batch/b.docx", b"b")])
+        self.assertEqual(count_upload_documents("cands.zip", data), 2)
+        self.assertEqual(list(iter_upload_documents("one.pdf", b"x")), [("one.pdf", b"x")])
+        with mock.patch.object(screening, 'MAX_MEMBER_BYTES', 1):
+            [(name, member)] = iter_upload_documents("big.zip", zip_of({"big.pdf": b"xx"}))
+            self.assertEqual(name, "big.zip/big.pdf")
+            self.assertIsInstance(member, UnreadableDocument)
+        [(name, member)] = iter_upload_documents("broken.zip", b"not a zip")
+        self.assertEqual((name, member), ("broken.zip", UnreadableDocument("Not a valid zip file: broken.zip")))
+        self.assertEqual(count_upload_documents("broken.zip", b"not a zip"), 1)
+
+    def test_corrupt_zip_member_gets_an_error_row(self):
+        """Test that a member failing its CRC check is reported alone and the others are screened."""
+        data = zip_of({"a.pdf": b"first resume", "b.pdf": b"second resume"})
+        # Flip one byte of the stored (uncompressed) content of a.pdf
+        offset = data.index(b"first resume")
+        data = data[:offset] + b"F" + data[offset + 1:]
+        documents = iter_upload_documents("cands.zip", data)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            rows = rank_rows(screen_resumes(documents, JOB_DESCRIPTION, executor, client=StubClient()))
+        self.assertEqual([(row['name'], row['status']) for row in rows], [("cands.zip/b.pdf", 'ok'), ("cands.zip/a.pdf", 'error')])
+        self.assertIn("Bad CRC-32", rows[1]['error'])
+
+    def test_broken_executor_is_replaced(self):
+        """Test that documents pending on a broken pool fail alone and the rest run on its replacement."""
+        documents = [("a.pdf", b"a"), ("b.pdf", b"b"), ("c.pdf", b"c")]
+        replaced = []
+        with ThreadPoolExecutor(max_workers=1) as replacement:
+            def replace_executor(broken):
+                replaced.append(broken)
+                return replacement
+            with ThreadPoolExecutor(max_workers=1, initializer=fail_to_start) as broken:
+                rows = list(screen_resumes(documents, JOB_DESCRIPTION, broken, client=StubClient(), max_pending=1,
+                                           replace_executor=replace_executor))
+            self.assertEqual([(row['name'], row['status']) for row in rows], [("a.pdf", 'error'), ("b.pdf", 'ok'), ("c.pdf", 'ok')])
+            self.assertIn("stopped unexpectedly", rows[0]['error'])
+            self.assertEqual(replaced, [broken])
+
+            # A pool whose worker process died is refused at submit
+            with ProcessPoolExecutor(max_workers=1) as dead:
+                dead.submit(os._exit, 1).exception()
+                rows = list(screen_resumes(documents, JOB_DESCRIPTION, dead, client=StubClient(),
+                                           replace_executor=replace_executor))
+                self.assertEqual({row['status'] for row in rows}, {'ok'})
+                rows = list(screen_resumes(documents, JOB_DESCRIPTION, dead, client=StubClient()))
+                self.assertEqual({row['status'] for row in rows}, {'error'})
+
+    def test_rank_rows_puts_errors_last(self):
+        """Test that scored rows are ranked by similarity and failed ones follow."""
+        rows = [error_row("bad.pdf", "boom"), {'name': "a.pdf", 'status': 'ok', 'similarity_score': 10.0},
+                {'name': "b.pdf", 'status': 'ok', 'similarity_score': 30.0}]
+        self.assertEqual([row['name'] for row in rank_rows(rows)], ["b.pdf", "a.pdf", "bad.pdf"])
+
+    @unittest.skipIf(find_missing_resources(), "NLTK corpora are not installed")
+    def test_screen_resumes_in_worker_processes(self):
+        """Test that every document gets a row, failures included, and repeat runs hit the extraction cache."""
+        documents = list(self.resumes.items()) + [("broken.pdf", b"not a pdf"), ("cv.rtf", b"x")]
+        cache = ExtractionCache(':memory:', extract_options=DEFAULT_EXTRACTION_LIMITS)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            rows = rank_rows(screen_resumes(documents, JOB_DESCRIPTION, executor, cache))
+            self.assertEqual([row['name'] for row in rows], ["strong.pdf", "weak.pdf", "broken.pdf", "cv.rtf"])
+            self.assertEqual(rows[0]['matched_skills'], ["python", "kubernetes", "javascript"])
+            self.assertGreater(rows[0]['similarity_score'], rows[1]['similarity_score'])
+            self.assertIn("Unsupported file type", rows[3]['error'])
+
+            list(screen_resumes(documents, JOB_DESCRIPTION, executor, cache))
+        self.assertEqual(cache.stats()['hits'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+
+import unittest
+import importlib.util
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.semantic_similarity import (
+    MIN_TRAINED_SIZE, CachedEmbedder, EmbeddingIndex, HashingEmbedder, SentenceTransformerEmbedder,
+    blend_scores, load_embedding_index, semantic_similarity,
+)
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__()
+        self.embedded = []
+
+    def embed(self, texts):
+        texts = list(texts)
+        self.embedded.extend(texts)
+        return super().embed(texts)
+
+def random_unit_vectors(count, dimensions, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(count, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+class TestSemanticSimilarity(unittest.TestCase):
+
+    def test_hashing_embedder_matches_word_variants(self):
+        """Test that inflected forms score well above unrelated text, and identical text scores 100."""
+        embedder = HashingEmbedder()
+        resume = "Managed engineering teams and deployed services"
+        self.assertAlmostEqual(semantic_similarity(resume, resume, embedder), 100, places=3)
+        related = semantic_similarity(resume, "Engineering manager deploying a service", embedder)
+        unrelated = semantic_similarity(resume, "Pastry chef baking bread", embedder)
+        self.assertGreater(related, 2 * unrelated)
+        self.assertEqual(semantic_similarity("", resume, embedder), 0.0)
+
+    def test_cached_embedder_embeds_each_text_once(self):
+        """Test that cached and repeated texts are not embedded again."""
+        inner = CountingEmbedder()
+        embedder = CachedEmbedder(inner)
+        first = embedder.embed(["resume a", "job b", "resume a"])
+        second = embedder.embed(["job b", "job c"])
+        self.assertEqual(inner.embedded, ["resume a", "job b", "job c"])
+        np.testing.assert_array_equal(first[1], second[0])
+        np.testing.assert_array_equal(first[0], first[2])
+
+    def test_blend_scores(self):
+        """Test blending of lexical and semantic scores."""
+        self.assertAlmostEqual(blend_scores(40.0, 80.0, 0.25), 50.0)
+        np.testing.assert_allclose(blend_scores(np.array([0.0, 100.0]), np.array([100.0, 0.0])), [50.0, 50.0])
+        with self.assertRaises(ValueError):
+            blend_scores(1.0, 1.0, 1.5)
+
+    @unittest.skipIf(importlib.util.find_spec('sentence_transformers'), "sentence-transformers is installed")
+    def test_sentence_model_requires_optional_dependency(self):
+        """Test that the sentence model backend names its missing dependency."""
+        with self.assertRaises(ImportError) as context:
+            SentenceTransformerEmbedder("models/all-MiniLM-L6-v2")
+        self.assertIn("pip install sentence-transformers", str(context.exception))
+
+class TestEmbeddingIndex(unittest.TestCase):
+
+    def test_trained_search_with_all_lists_is_exact(self):
+        """Test that probing every cluster returns the exact top-k, and few probes still find near duplicates."""
+        dimensions = 16
+        vectors = random_unit_vectors(2 * MIN_TRAINED_SIZE, dimensions)
+        index = EmbeddingIndex(dimensions)
+        index.add(list(range(len(vectors))), vectors)
+        index.train(n_lists=16)
+        query = random_unit_vectors(1, dimensions, seed=1)[0]
+        exact = np.argsort(-(vectors @ query), kind='stable')[:5]
+        self.assertEqual([hit.doc_id for hit in index.search(query, top_k=5, n_probe=16)], exact.tolist())
+        self.assertEqual(index.search(vectors[7], top_k=1, n_probe=2)[0].doc_id, 7)
+
+    def test_add_delete_save_and_load(self):
+        """Test that replaced and deleted documents are dropped and the index survives a round trip."""
+        embedder = HashingEmbedder()
+        index = EmbeddingIndex(embedder.dimensions, embedder.fingerprint)
+        index.add_texts(["a", "b", "c"], ["python data pipelines", "react frontend", "baking bread"], embedder)
+        index.add_texts(["b"], ["kubernetes clusters"], embedder)
+        index.delete("c")
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search_text("kubernetes cluster operations", embedder, top_k=1)[0].doc_id, "b")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "embeddings.index")
+            index.save(path)
+            loaded = load_embedding_index(path)
+        self.assertEqual(loaded.search_text("data pipelines", embedder, top_k=5),
+                         index.search_text("data pipelines", embedder, top_k=5))
+        with self.assertRaises(ValueError):
+            loaded.search_text("data", HashingEmbedder(dimensions=64))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.skill_index import SkillIndex, load_skill_index
+
+class TestSkillIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SkillIndex()
+        self.index.add('alice', ['python', 'machine learning', 'sql'])
+        self.index.add('bob', ['java', 'sql'])
+        self.index.add('carol', ['python', 'sql', 'docker', 'machine learning'])
+        self.jd_keywords = ['python', 'machine learning', 'docker', 'kubernetes']
+
+    def test_boolean_queries(self):
+        """Test AND and OR queries over the postings."""
+        self.assertEqual(self.index.match_all(['python', 'sql']), ['alice', 'carol'])
+        self.assertEqual(self.index.match_any(['java', 'docker']), ['bob', 'carol'])
+        self.assertEqual(self.index.match_all(['python', 'rust']), [])
+
+    def test_search_ranks_by_coverage_with_gaps(self):
+        """Test that hits are ranked by coverage and carry their gap analysis."""
+        hits = self.index.search(self.jd_keywords, top_k=2)
+        self.assertEqual([hit.doc_id for hit in hits], ['carol', 'alice'])
+        self.assertEqual(hits[0].coverage, 0.75)
+        self.assertEqual(hits[0].gaps, {
+            'missing_keywords': ['kubernetes'],
+            'strong_matches': ['docker', 'machine learning', 'python'],
+        })
+
+    def test_delete_and_replace(self):
+        """Test that deleted documents disappear and re-adding replaces a document."""
+        self.index.delete('carol')
+        self.index.add('alice', ['kubernetes'])
+        hits = self.index.search(self.jd_keywords)
+        self.assertEqual([(hit.doc_id, hit.coverage) for hit in hits], [('alice', 0.25)])
+
+    def test_save_and_load_round_trip(self):
+        """Test that a saved index answers queries the same way after loading."""
+        self.index.delete('bob')
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, 'skills.idx')
+            self.index.save(path)
+            loaded = load_skill_index(path)
+            self.assertEqual(len(loaded), 2)
+            self.assertEqual(loaded.search(self.jd_keywords), self.index.search(self.jd_keywords))
+            loaded.add('dave', ['kubernetes'])
+            self.assertEqual(loaded.match_any(['kubernetes']), ['dave'])
+        finally:
+            shutil.rmtree(temp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add the 'src' directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.explainability import generate_explanations
+from src.gap_analysis import analyze_gaps
+from src.skill_taxonomy import compile_taxonomy, get_taxonomy, load_taxonomy
+
+TAXONOMY = {"version": 1, "skills": [
+    {"id": "javascript", "name": "JavaScript", "aliases": ["js", "java script", "ecmascript"]},
+    {"id": "java", "name": "Java", "aliases": []},
+    {"id": "c++", "name": "C++", "aliases": ["cpp"]},
+    {"id": "ci-cd", "name": "CI/CD", "aliases": ["continuous integration"]},
+    {"id": "go", "name": "Go", "aliases": ["golang"], "match_name": False},
+]}
+
+class TestSkillTaxonomy(unittest.TestCase):
+
+    def setUp(self):
+        self.taxonomy = compile_taxonomy(TAXONOMY)
+
+    def test_match_finds_aliases_leftmost_longest(self):
+        """Test that aliases are matched case-insensitively, preferring the longer overlapping alias."""
+        matches = self.taxonomy.match("Java Script, JS and Java; C++ via CI-CD. Go to golang.")
+        self.assertEqual([(m.skill_id, m.text) for m in matches], [
+            ("javascript", "Java Script"), ("javascript", "JS"), ("java", "Java"),
+            ("c++", "C++"), ("ci-cd", "CI-CD"), ("go", "golang"),
+        ])
+        text = "Senior JS developer"
+        match = self.taxonomy.match(text)[0]
+        self.assertEqual(text[match.start:match.end], "JS")
+        self.assertEqual(self.taxonomy.find_skills("js, ecmascript and cpp"), ["javascript", "c++"])
+
+    def test_canonicalize_whole_phrases_only(self):
+        """Test that only a phrase that is exactly one alias has a canonical ID."""
+        self.assertEqual(self.taxonomy.canonicalize("ECMAScript"), "javascript")
+        self.assertEqual(self.taxonomy.canonicalize("ci/cd"), "ci-cd")
+        self.assertIsNone(self.taxonomy.canonicalize("js developer"))
+        self.assertIsNone(self.taxonomy.canonicalize("java script engine"))
+
+    def test_rematch_equals_match_of_edited_text(self):
+        """Test that rematching around an edit gives the mentions of the whole edited text."""
+        text = "Java developer. " * 40 + "Skills: java, python" + " and more text." * 40
+        matches = self.taxonomy.match(text)
+        for start, end, replacement in [
+            (len(text) // 2, len(text) // 2, " script"),        # turns a Java mention into JavaScript
+            (0, 4, "JS"),                                        # at the start of the text
+            (len(text), len(text), " golang, cpp"),              # at the end
+            (100, 300, ""),                                      # a removal
+        ]:
+            new_text = text[:start] + replacement + text[end:]
+            self.assertEqual(self.taxonomy.rematch(matches, text, new_text, start, end, start + len(replacement)),
+                             self.taxonomy.match(new_text))
+
+    def test_conflicting_aliases_are_rejected(self):
+        """Test that an alias claimed by two skills is a config error."""
+        config = {"skills": TAXONOMY["skills"] + [{"id": "jscript", "name": "JScript", "aliases": ["js"]}]}
+        with self.assertRaises(ValueError):
+            compile_taxonomy(config)
+
+    def test_compiled_taxonomy_is_cached_by_content(self):
+        """Test that the compiled taxonomy is reused until the file changes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "taxonomy.json")
+            cache_dir = os.path.join(temp_dir, "cache")
+            with open(path, 'w') as f:
+                json.dump(TAXONOMY, f)
+            first = load_taxonomy(path, cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            self.assertEqual(load_taxonomy(path, cache_dir).fingerprint, first.fingerprint)
+
+            with open(path, 'w') as f:
+                json.dump({"skills": TAXONOMY["skills"] + [{"id": "rust", "name": "Rust"}]}, f)
+            changed = load_taxonomy(path, cache_dir)
+            self.assertIn("rust", changed)
+            self.assertNotEqual(changed.fingerprint, first.fingerprint)
+
+    def test_bundled_taxonomy(self):
+        """Test that the bundled taxonomy knows common abbreviations."""
+        taxonomy = get_taxonomy()
+        self.assertEqual(taxonomy.find_skills("Deployed Node.js services on k8s with Terraform"),
+                         ["nodejs", "kubernetes", "terraform"])
+
+class TestSkillGaps(unittest.TestCase):
+
+    def test_gaps_compare_canonical_skills(self):
+        """Test that a keyword the resume covers under an alias is not reported missing."""
+        taxonomy = compile_taxonomy(TAXONOMY)
+        resume_skills = taxonomy.find_skills("Built SPAs in JS")
+        jd_skills = taxonomy.find_skills("JavaScript and C++ developer, strong communication")
+        result = analyze_gaps(["spa", "js"], ["javascript", "c++ developer", "communication"],
+                              resume_skills, jd_skills, taxonomy=taxonomy)
+        self.assertEqual(result['strong_matches'], ["javascript"])
+        # The n-gram naming a missing skill is reported as that skill
+        self.assertEqual(result['missing_keywords'], ["communication"])
+        self.assertEqual(result['missing_skills'], ["c++"])
+        self.assertEqual(result['matched_skills'], ["javascript"])
+
+        explanations = generate_explanations(result)
+        self.assertEqual(len(explanations['missing']), 1)
+        self.assertIn("C++", explanations['missing_skills'][0])
+        self.assertIn("JavaScript", explanations['matched_skills'][0])
+
+    def test_gaps_without_skills_are_unchanged(self):
+        """Test that the keyword-only analysis has no skill fields."""
+        self.assertEqual(analyze_gaps(["python"], ["python", "sql"]),
+                         {'missing_keywords': ["sql"], 'strong_matches': ["python"]})
+
+if __name__ == '__main__':
+    unittest.main()
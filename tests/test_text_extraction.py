@@ -2,11 +2,19 @@
 import unittest
 import os
 import sys
+from unittest import mock
 
 # Add the 'src' directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.text_extraction import extract_text_from_pdf
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+
+from src.text_extraction import (
+    PDF_BACKENDS, PDFBackend, TextStreamBackend, check_page_text, extract_pdf, extract_text,
+    extract_text_from_pdf, iter_pdf_pages, register_pdf_backend, _page_ranges,
+)
+from src.ats_scoring import calculate_ats_score, calculate_ats_score_from_pages
 from tests.create_dummy_pdf import create_dummy_pdf
 
 class TestTextExtraction(unittest.TestCase):
@@ -30,5 +38,129 @@ class TestTextExtraction(unittest.TestCase):
         if os.path.exists(self.pdf_path):
             os.remove(self.pdf_path)
 
+class TestStreamingExtraction(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a five-page PDF with one line per page."""
+        test_dir = os.path.dirname(os.path.abspath(__file__))
+        self.pdf_path = os.path.join(test_dir, "multi_page.pdf")
+        self.page_texts = [
+            "Jane Doe jane@example.com",
+            "Experience Managed a team of 12.",
+            "Led the migration and reduced costs.",
+            "Education BSc Computer Science",
+            "Skills Python SQL",
+        ]
+        c = canvas.Canvas(self.pdf_path, pagesize=letter)
+        for text in self.page_texts:
+            c.drawString(72, letter[1] - 72, text)
+            c.showPage()
+        c.save()
+
+    def test_iter_pdf_pages_yields_each_page(self):
+        """Test that pages are yielded in order with normalized whitespace."""
+        self.assertEqual(list(iter_pdf_pages(self.pdf_path)), self.page_texts)
+
+    def test_page_and_character_limits(self):
+        """Test that extraction stops early at the page and character limits."""
+        self.assertEqual(list(iter_pdf_pages(self.pdf_path, max_pages=2)), self.page_texts[:2])
+        pages = list(iter_pdf_pages(self.pdf_path, max_chars=30))
+        self.assertEqual(sum(len(page) for page in pages), 30)
+        self.assertEqual(len(extract_text(self.pdf_path, max_pages=1)), len(self.page_texts[0]))
+
+    def test_parallel_extraction_matches_serial(self):
+        """Test that page ranges extracted in worker processes reassemble to the serial text."""
+        self.assertEqual(_page_ranges(5, 3), [(0, 2), (2, 4), (4, 5)])
+        with mock.patch.multiple('src.text_extraction', PARALLEL_MIN_PAGES=3, PARALLEL_MIN_SECONDS=0):
+            self.assertEqual(extract_text_from_pdf(self.pdf_path, workers=3), extract_text_from_pdf(self.pdf_path))
+            self.assertEqual(list(iter_pdf_pages(self.pdf_path, max_pages=4, max_chars=80, workers=2)),
+                             list(iter_pdf_pages(self.pdf_path, max_pages=4, max_chars=80)))
+
+    def test_short_documents_are_extracted_serially(self):
+        """Test that no worker processes are started for short or quick documents."""
+        with mock.patch('src.text_extraction.ProcessPoolExecutor') as executor:
+            self.assertEqual(list(iter_pdf_pages(self.pdf_path, workers=4)), self.page_texts)
+            with mock.patch('src.text_extraction.PARALLEL_MIN_PAGES', 3):
+                self.assertEqual(list(iter_pdf_pages(self.pdf_path, workers=4)), self.page_texts)
+            executor.assert_not_called()
+
+    def test_ats_score_from_pages_matches_full_text(self):
+        """Test that scoring the page stream matches scoring the joined text."""
+        pages = iter_pdf_pages(self.pdf_path)
+        self.assertEqual(calculate_ats_score_from_pages(pages), calculate_ats_score(" ".join(self.page_texts)))
+
+    def tearDown(self):
+        if os.path.exists(self.pdf_path):
+            os.remove(self.pdf_path)
+
+class GarbledBackend(TextStreamBackend):
+    """Returns unmapped glyphs for odd pages, as the text layer of a PDF with a broken font encoding would."""
+    name = 'garbled'
+
+    def open(self, pdf_path):
+        document = super().open(pdf_path)
+        page_text = document.page_text
+        document.page_text = lambda i: "(cid:12)(cid:7)(cid:31)(cid:4)" * 8 if i % 2 else page_text(i)
+        return document
+
+class TestPDFBackends(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a three-page PDF with several lines and font sizes per page."""
+        test_dir = os.path.dirname(os.path.abspath(__file__))
+        self.pdf_path = os.path.join(test_dir, "backends.pdf")
+        c = canvas.Canvas(self.pdf_path, pagesize=letter)
+        for page in range(3):
+            c.setFont("Helvetica-Bold", 16)
+            c.drawString(72, 720, f"Jane Doe - Page {page + 1}")
+            c.setFont("Helvetica", 10)
+            for line in range(14):
+                c.drawString(72, 690 - 14 * line, f"Built data pipeline {line} in Python and Spark, cutting costs by {line}%.")
+            c.drawString(320, 400, "Skills: SQL, Kubernetes")
+            c.showPage()
+        c.save()
+        register_pdf_backend(GarbledBackend())
+
+    def test_text_stream_matches_pdfplumber(self):
+        """Test that the fast default backend gives the layout-analysis text, without falling back."""
+        fast = extract_pdf(self.pdf_path)
+        self.assertEqual(fast.text, extract_pdf(self.pdf_path, backend='pdfplumber').text)
+        self.assertEqual(fast.backend, 'text_stream')
+        self.assertEqual(fast.pages, {'text_stream': 3})
+        self.assertEqual(fast.fallbacks, {})
+        self.assertEqual(list(iter_pdf_pages(self.pdf_path)), list(iter_pdf_pages(self.pdf_path, backend='pdfplumber')))
+
+    def test_failed_pages_fall_back_to_pdfplumber(self):
+        """Test that only the pages failing the quality checks are re-extracted with pdfplumber."""
+        extraction = extract_pdf(self.pdf_path, backend='garbled')
+        self.assertEqual(extraction.text, extract_text_from_pdf(self.pdf_path))
+        self.assertEqual(extraction.backend, 'garbled+pdfplumber')
+        self.assertEqual(extraction.pages, {'garbled': 2, 'pdfplumber': 1})
+        self.assertEqual(extraction.fallbacks, {'garbled': 1})
+        self.assertEqual(set(extraction.seconds), {'garbled', 'pdfplumber'})
+
+        with mock.patch.multiple('src.text_extraction', PARALLEL_MIN_PAGES=3, PARALLEL_MIN_SECONDS=0):
+            parallel = extract_pdf(self.pdf_path, workers=2, backend='pdfplumber')
+        self.assertEqual(parallel.text, extraction.text)
+        self.assertEqual(parallel.pages, {'pdfplumber': 3})
+
+    def test_check_page_text(self):
+        """Test the page quality heuristics."""
+        self.assertIsNone(check_page_text("Senior data engineer with eight years of Python experience."))
+        self.assertEqual(check_page_text("  Page 1 "), 'too_few_chars')
+        self.assertEqual(check_page_text("Senior data engineer \ufffd\ufffd\ufffd\ufffd with Python"), 'garbled')
+        self.assertEqual(check_page_text("Seniordataengineerwitheightyearsof Pythonexperienceinbanking"), 'missing_spaces')
+
+    def test_unknown_backend(self):
+        """Test that an unregistered backend name is rejected."""
+        self.assertTrue(issubclass(GarbledBackend, PDFBackend))
+        with self.assertRaises(ValueError):
+            extract_pdf(self.pdf_path, backend='missing')
+
+    def tearDown(self):
+        PDF_BACKENDS.pop('garbled', None)
+        if os.path.exists(self.pdf_path):
+            os.remove(self.pdf_path)
+
 if __name__ == '__main__':
     unittest.main()
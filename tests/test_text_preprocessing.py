@@ -6,7 +6,7 @@ import sys
 # Add the 'src' directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.text_preprocessing import preprocess_text
+from src.text_preprocessing import preprocess_text, Preprocessor
 
 class TestTextPreprocessing(unittest.TestCase):
 
@@ -28,5 +28,24 @@ class TestTextPreprocessing(unittest.TestCase):
         expected_output = "running run ran"
         self.assertEqual(preprocess_text(input_text), expected_output)
 
+class TestPreprocessor(unittest.TestCase):
+
+    def setUp(self):
+        self.preprocessor = Preprocessor()
+
+    def test_matches_preprocess_text(self):
+        """Test that the reusable preprocessor matches preprocess_text."""
+        input_text = "Managed 5 engineers; developed C++ & Python services. Running runs ran!"
+        self.assertEqual(self.preprocessor.preprocess(input_text), preprocess_text(input_text))
+
+    def test_tokenize_splits_treebank_contractions(self):
+        """Test that whole-word contractions are split like word_tokenize does."""
+        self.assertEqual(self.preprocessor.tokenize("I cannot, gonna WANNA"), ["i", "can", "not", "gon", "na", "wan", "na"])
+
+    def test_preprocess_many(self):
+        """Test that batches are preprocessed in input order."""
+        texts = ["This is a Test sentence with punctuation!", "running runs ran"]
+        self.assertEqual(self.preprocessor.preprocess_many(texts), ["test sentence punctuation", "running run ran"])
+
 if __name__ == '__main__':
     unittest.main()